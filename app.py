@@ -3,6 +3,7 @@
 import streamlit as st
 from ui import login_page, student_page, admin_page, admin_login_page
 from ui.api import get_election_settings, API_URL
+from ui.outbox import render_outbox_status
 
 # --- Page Configuration (MUST BE THE FIRST AND ONLY CALL) ---
 st.set_page_config(
@@ -44,6 +45,8 @@ if 'admin_password' in st.session_state and st.session_state.admin_password:
     admin_page.render()
 else:
     # For all other pages (login, student voting), the sidebar will be auto-collapsed.
+    # In kiosk mode it also shows how many ballots are still waiting to be sent.
+    render_outbox_status()
     if st.session_state.page == "student_vote":
         student_page.render(settings)
     elif st.session_state.page == "admin_login":
@@ -0,0 +1,134 @@
+# backend/core/config.py (New File)
+
+import os
+
+from dotenv import load_dotenv
+
+# Every module reads its settings from here, so the .env file is loaded before any
+# of them is evaluated. ENV_FILE points at another file; by default the nearest .env
+# above this directory (normally backend/.env) is used. Variables that are already
+# set in the environment win over the file.
+load_dotenv(os.getenv("ENV_FILE") or None)
+
+# --- Runtime Tuning ---
+# All performance-related knobs live here so they can be adjusted per deployment
+# through environment variables without touching the code.
+
+# How many seconds a worker trusts its compiled settings snapshot before checking
+# the stored version number again. Changes saved through the same worker are
+# picked up immediately; this only bounds staleness when running several workers.
+SETTINGS_VERSION_CHECK_INTERVAL = float(os.getenv("SETTINGS_VERSION_CHECK_INTERVAL", "5"))
+
+# How many seconds a worker keeps its in-memory candidate eligibility index before
+# rebuilding it. Candidate changes made through the same worker invalidate it at once.
+CANDIDATE_INDEX_TTL = float(os.getenv("CANDIDATE_INDEX_TTL", "10"))
+
+# How a ballot is committed:
+#   "atomic" - the vote document is keyed by the student identifier, so a single
+#              insert records the ballot and rejects duplicates (default).
+#   "legacy" - insert the voted_students marker (unique per student), then the vote.
+VOTE_COMMIT_MODE = os.getenv("VOTE_COMMIT_MODE", "atomic")
+
+# Where the admin results come from:
+#   "tally"     - the incrementally maintained counters in tallies_v2 (default).
+#   "aggregate" - one server-side aggregation over the raw votes on every request.
+RESULTS_SOURCE = os.getenv("RESULTS_SOURCE", "tally")
+
+# --- Audit Log Writer ---
+# Audit entries are queued in memory and written in batches by a background task.
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+# What happens when the queue is full:
+#   "block"             - the request waits for room in the queue (default, nothing is lost).
+#   "drop_low_priority" - low-priority entries (e.g. "Vote Cast") are dropped, others wait.
+#   "spill"             - entries are appended to AUDIT_SPILL_PATH and replayed on next startup.
+AUDIT_OVERFLOW_POLICY = os.getenv("AUDIT_OVERFLOW_POLICY", "block")
+AUDIT_SPILL_PATH = os.getenv("AUDIT_SPILL_PATH", "audit_spill.jsonl")
+
+# --- Indexes ---
+# When enabled, every hot query shape is explained at startup and a warning is
+# logged for any that would fall back to a full collection scan.
+VERIFY_INDEXES_ON_STARTUP = os.getenv("VERIFY_INDEXES_ON_STARTUP", "false").lower() == "true"
+
+# --- Roster Import ---
+# Rows are duplicate-checked and inserted in chunks of this size.
+ROSTER_IMPORT_CHUNK_SIZE = int(os.getenv("ROSTER_IMPORT_CHUNK_SIZE", "5000"))
+# At most this many per-row error messages are returned for one file.
+ROSTER_IMPORT_MAX_ERRORS = int(os.getenv("ROSTER_IMPORT_MAX_ERRORS", "500"))
+# Uploaded roster files are spooled here while a background job processes them.
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", "upload_spool")
+# Worker processes used to parse roster files off the event loop.
+ROSTER_PARSE_WORKERS = int(os.getenv("ROSTER_PARSE_WORKERS", "2"))
+
+# --- Roster Listing ---
+ROSTER_PAGE_MAX_LIMIT = int(os.getenv("ROSTER_PAGE_MAX_LIMIT", "1000"))
+# Documents per NDJSON chunk when streaming the roster.
+ROSTER_STREAM_BATCH_SIZE = int(os.getenv("ROSTER_STREAM_BATCH_SIZE", "500"))
+
+# --- Live Results Push ---
+# Vote deltas are coalesced and pushed to dashboard subscribers at most once per interval.
+LIVE_RESULTS_MIN_INTERVAL = float(os.getenv("LIVE_RESULTS_MIN_INTERVAL", "0.5"))
+# A comment line is sent this often so proxies keep idle event streams open.
+LIVE_RESULTS_KEEPALIVE = float(os.getenv("LIVE_RESULTS_KEEPALIVE", "15"))
+
+# --- Candidate Photos ---
+# Uploaded photos are re-encoded into fixed-size variants in this format ("webp" or "jpeg").
+CANDIDATE_PHOTO_FORMAT = os.getenv("CANDIDATE_PHOTO_FORMAT", "webp").lower()
+CANDIDATE_PHOTO_QUALITY = int(os.getenv("CANDIDATE_PHOTO_QUALITY", "80"))
+# Content-hashed files under /static never change, so browsers may keep them this long.
+STATIC_IMMUTABLE_MAX_AGE = int(os.getenv("STATIC_IMMUTABLE_MAX_AGE", "31536000"))
+# Uploads larger than this are rejected with 413 while they are being streamed.
+CANDIDATE_PHOTO_MAX_BYTES = int(os.getenv("CANDIDATE_PHOTO_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# --- File Storage ---
+# Where uploaded files are kept:
+#   "local"  - files on disk; public files under static/ (served at /static),
+#              original uploads under UPLOAD_STORAGE_DIR (not served) (default).
+#   "memory" - a per-process dict; useful for tests, nothing survives a restart.
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+UPLOAD_STORAGE_DIR = os.getenv("UPLOAD_STORAGE_DIR", "uploads")
+
+# --- Ballot Bundle ---
+# Thumbnails up to this size are inlined as data URIs when a kiosk asks for them.
+BALLOT_INLINE_IMAGE_MAX_BYTES = int(os.getenv("BALLOT_INLINE_IMAGE_MAX_BYTES", "32768"))
+
+# --- Database Engine ---
+# Which store backs the repositories:
+#   "mongo"  - MongoDB via Motor, at MONGO_URI (default).
+#   "sqlite" - an embedded SQLite file at SQLITE_PATH in WAL mode; needs no server.
+#              ":memory:" keeps everything in the process (benchmarks, quick trials).
+DATABASE_ENGINE = os.getenv("DATABASE_ENGINE", "mongo").lower()
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "voting_system")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "voting.sqlite3")
+# "FULL" syncs the WAL on every commit, so no acknowledged ballot is lost on power failure;
+# "NORMAL" is faster and only risks the last commits before an OS crash or power loss.
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "FULL").upper()
+
+# --- Metrics ---
+# Prometheus-text metrics are served on GET /metrics. When METRICS_TOKEN is set,
+# scrapers must send "Authorization: Bearer <token>".
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# How often (seconds) the event-loop lag probe wakes up; 0 disables it.
+METRICS_LOOP_LAG_INTERVAL = float(os.getenv("METRICS_LOOP_LAG_INTERVAL", "0.5"))
+
+# --- Request Profiling ---
+# Opt-in. With PROFILE_REQUESTS=true a PROFILE_SAMPLE_RATE fraction of requests whose
+# path starts with one of PROFILE_PATHS (comma-separated; empty = every path) is
+# profiled. An admin can also profile one request by sending "X-Profile: <admin password>".
+PROFILE_REQUESTS = os.getenv("PROFILE_REQUESTS", "false").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0.05"))
+PROFILE_PATHS = [p.strip() for p in os.getenv("PROFILE_PATHS", "").split(",") if p.strip()]
+# "cprofile" - the standard library's deterministic profiler; writes .prof files for
+#              snakeviz / pstats (default). It sees everything the worker does while the
+#              request runs, including other requests interleaved on the event loop.
+# "pyinstrument" - a sampling profiler (optional package) that follows only the profiled
+#              request's task and writes an HTML flame graph plus a speedscope file.
+PROFILER = os.getenv("PROFILER", "cprofile").lower()
+# Profiles and their JSON summaries go here; only the newest PROFILE_KEEP are kept.
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "100"))
+
+# --- Admin ---
+ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "teacher123")
@@ -0,0 +1,33 @@
+# backend/core/http_cache.py (New File)
+
+import json
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def encode_json(content: Any) -> bytes:
+    """Serializes a response body once so it can be reused until its data changes."""
+    return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode("utf-8")
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match.
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def conditional_json_response(request: Request, etag: str, body: bytes) -> Response:
+    """
+    Returns the pre-encoded JSON body with its ETag, or an empty 304 when the
+    client already holds this version. "no-cache" makes clients revalidate on
+    every use, which is what keeps the data fresh.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
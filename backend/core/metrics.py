@@ -0,0 +1,305 @@
+# backend/core/metrics.py (New File)
+#
+# In-process metrics, rendered in the Prometheus text format on GET /metrics:
+#   - request latency per route, method and status,
+#   - database operations (count and time) overall and per request,
+#   - time requests spent waiting on the audit queue,
+#   - event-loop lag.
+# Per-request figures are collected through a context variable, which Motor
+# carries into its executor threads, so the CommandListener below can attribute
+# every MongoDB command to the request that issued it.
+# Values are per worker process; Prometheus sums them across workers.
+
+import asyncio
+import bisect
+import contextvars
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+from core.config import METRICS_LOOP_LAG_INTERVAL
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return ",".join(pairs)
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name, self.help_text, self.labels = name, help_text, tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{{{_label_text(self.labels, label_values)}}} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help_text, self.labels = name, help_text, tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [count per bucket (the last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for label_values, (counts, total) in snapshot:
+            labels = _label_text(self.labels, label_values)
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {_number(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """A value read from a callback at scrape time."""
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float]):
+        self.name, self.help_text, self.read = name, help_text, read
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {_number(self.read())}"]
+
+
+# --- Metric Definitions ---
+request_latency = Histogram(
+    "evoting_request_duration_seconds", "Time from request start to the end of the response body.",
+    ("method", "route", "status")
+)
+request_db_operations = Histogram(
+    "evoting_request_db_operations", "Database operations issued while serving one request.",
+    ("route",), buckets=COUNT_BUCKETS
+)
+request_db_seconds = Histogram(
+    "evoting_request_db_seconds", "Time one request spent in database operations.", ("route",)
+)
+request_audit_wait_seconds = Histogram(
+    "evoting_request_audit_wait_seconds", "Time one request waited to hand audit entries to the writer.", ("route",)
+)
+db_operations = Counter(
+    "evoting_db_operations_total", "Database operations by engine, operation, target and outcome.",
+    ("engine", "operation", "target", "outcome")
+)
+db_operation_seconds = Histogram(
+    "evoting_db_operation_seconds", "Duration of single database operations.", ("engine", "operation", "target")
+)
+audit_write_seconds = Histogram("evoting_audit_batch_write_seconds", "Time to write one batch of audit entries.")
+loop_lag_seconds = Histogram(
+    "evoting_event_loop_lag_seconds", "How late a periodic timer fired, i.e. how long the event loop was blocked."
+)
+
+_metrics: list = [
+    request_latency, request_db_operations, request_db_seconds, request_audit_wait_seconds,
+    db_operations, db_operation_seconds, audit_write_seconds, loop_lag_seconds,
+]
+
+
+def register_gauge(name: str, help_text: str, read: Callable[[], float]):
+    _metrics.append(Gauge(name, help_text, read))
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _metrics:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+# --- Per-Request Accounting ---
+class RequestStats:
+    __slots__ = ("db_operations", "db_seconds", "audit_wait_seconds")
+
+    def __init__(self):
+        self.db_operations = 0
+        self.db_seconds = 0.0
+        self.audit_wait_seconds = 0.0
+
+
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+
+class DbCallLog:
+    """An itemized list of one request's database calls, kept while the request is profiled."""
+    __slots__ = ("started", "calls")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls: List[dict] = []
+
+
+db_call_log: contextvars.ContextVar[Optional[DbCallLog]] = contextvars.ContextVar("db_call_log", default=None)
+
+
+def record_db_operation(engine: str, operation: str, target: str, seconds: float, failed: bool = False):
+    """Counts one database round trip, and charges it to the current request if there is one."""
+    db_operations.inc(engine, operation, target, "error" if failed else "ok")
+    db_operation_seconds.observe(seconds, engine, operation, target)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_operations += 1
+        stats.db_seconds += seconds
+    log = db_call_log.get()
+    if log is not None:
+        log.calls.append({
+            "engine": engine, "operation": operation, "target": target,
+            "start_ms": round((time.perf_counter() - seconds - log.started) * 1000, 3),
+            "duration_ms": round(seconds * 1000, 3),
+            "ok": not failed,
+        })
+
+
+def record_audit_wait(seconds: float):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.audit_wait_seconds += seconds
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    Feeds every MongoDB command into the database metrics. Only the started event
+    carries the command document, so the collection name is remembered from it
+    until the matching succeeded/failed event arrives.
+    """
+
+    def __init__(self):
+        self._targets: Dict[int, str] = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        self._targets[event.request_id] = target if isinstance(target, str) else ""
+
+    def succeeded(self, event):
+        target = self._targets.pop(event.request_id, "")
+        record_db_operation("mongo", event.command_name, target, event.duration_micros / 1e6)
+
+    def failed(self, event):
+        target = self._targets.pop(event.request_id, "")
+        record_db_operation("mongo", event.command_name, target, event.duration_micros / 1e6, failed=True)
+
+
+mongo_command_listener = MongoCommandListener()
+
+
+# --- ASGI Middleware ---
+def _route_label(scope: dict) -> str:
+    """The route template ("/api/admin/students/page"), never the raw path, to keep label counts bounded."""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", "unmatched")
+    # Mounted apps (/static) set root_path to the mount point instead of a route.
+    return scope.get("root_path") or "unmatched"
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and records what it spent on the database and the audit queue."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = _route_label(scope)
+            request_latency.observe(elapsed, scope["method"], route, str(status))
+            request_db_operations.observe(stats.db_operations, route)
+            request_db_seconds.observe(stats.db_seconds, route)
+            request_audit_wait_seconds.observe(stats.audit_wait_seconds, route)
+            _request_stats.reset(token)
+
+
+# --- Event-Loop Lag ---
+class LoopLagMonitor:
+    """
+    Sleeps for a fixed interval and records how much later than requested it
+    woke up. Anything that blocks the loop (CPU-heavy work, sync I/O) shows up
+    as lag for every request served by this worker.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, loop.time() - scheduled)
+            self.max_lag = max(self.max_lag, self.last_lag)
+            loop_lag_seconds.observe(self.last_lag)
+
+
+loop_lag_monitor = LoopLagMonitor(METRICS_LOOP_LAG_INTERVAL)
+register_gauge("evoting_event_loop_lag_last_seconds", "Lag measured by the most recent timer tick.", lambda: loop_lag_monitor.last_lag)
+register_gauge("evoting_event_loop_lag_max_seconds", "Largest lag seen since the worker started.", lambda: loop_lag_monitor.max_lag)
@@ -0,0 +1,246 @@
+# backend/core/profiling.py (New File)
+#
+# Opt-in request profiling. Selected requests run under a profiler; afterwards the
+# profile, an itemized log of every database call the request made, and a short
+# JSON summary are written to PROFILE_DIR, which only keeps the newest PROFILE_KEEP
+# profiles. A request is selected when
+#   - PROFILE_REQUESTS is on, its path matches PROFILE_PATHS and it wins the
+#     PROFILE_SAMPLE_RATE draw, or
+#   - it carries "X-Profile: <admin password>".
+# At most one request per worker is profiled at a time; others run unprofiled.
+
+import asyncio
+import cProfile
+import datetime
+import hmac
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from core.config import (
+    ADMIN_PASSWORD,
+    PROFILE_REQUESTS,
+    PROFILE_SAMPLE_RATE,
+    PROFILE_PATHS,
+    PROFILER,
+    PROFILE_DIR,
+    PROFILE_KEEP
+)
+from core.metrics import DbCallLog, db_call_log
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{12}_[0-9a-f]{8}$")
+TOP_FUNCTIONS = 25
+SUMMARY_SUFFIX = ".json"
+
+
+# --- Profilers ---
+class CProfileSession:
+    """The standard library's deterministic profiler; output is a pstats .prof file."""
+    name = "cprofile"
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def write(self, base_path: str) -> Tuple[List[str], dict]:
+        path = base_path + ".prof"
+        self._profile.dump_stats(path)
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, function), (calls, primitive_calls, own, cumulative, _callers) in stats.stats.items():
+            rows.append({
+                "function": f"{function} ({os.path.basename(filename)}:{line})",
+                "calls": calls,
+                "own_ms": round(own * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            })
+        rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+        return [os.path.basename(path)], {"top_functions": rows[:TOP_FUNCTIONS]}
+
+
+class PyinstrumentSession:
+    """A sampling profiler that follows only the profiled request's task; writes HTML and speedscope files."""
+    name = "pyinstrument"
+
+    def __init__(self):
+        from pyinstrument import Profiler
+        self._profiler = Profiler(async_mode="enabled")
+
+    def start(self):
+        self._profiler.start()
+
+    def stop(self):
+        self._profiler.stop()
+
+    def write(self, base_path: str) -> Tuple[List[str], dict]:
+        from pyinstrument.renderers import SpeedscopeRenderer
+        html_path, speedscope_path = base_path + ".html", base_path + ".speedscope.json"
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(self._profiler.output_html())
+        with open(speedscope_path, "w", encoding="utf-8") as f:
+            f.write(self._profiler.output(SpeedscopeRenderer()))
+        call_tree = self._profiler.output_text(unicode=False, color=False, show_all=False)
+        return [os.path.basename(html_path), os.path.basename(speedscope_path)], {"call_tree": call_tree}
+
+
+def _new_session():
+    if PROFILER == "pyinstrument":
+        try:
+            return PyinstrumentSession()
+        except ImportError:
+            logger.warning("PROFILER=pyinstrument but the 'pyinstrument' package is not installed; using cProfile.")
+    return CProfileSession()
+
+
+# --- Selection ---
+def _admin_header(scope: dict) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            return hmac.compare_digest(value, ADMIN_PASSWORD.encode())
+    return False
+
+
+def _sampled(scope: dict) -> bool:
+    if not PROFILE_REQUESTS:
+        return False
+    if PROFILE_PATHS and not any(scope["path"].startswith(prefix) for prefix in PROFILE_PATHS):
+        return False
+    return random.random() < PROFILE_SAMPLE_RATE
+
+
+# --- Output ---
+def _write_profile(profile_id: str, session, summary: dict):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    files, details = session.write(os.path.join(PROFILE_DIR, profile_id))
+    summary.update(files=files, **details)
+    with open(os.path.join(PROFILE_DIR, profile_id + SUMMARY_SUFFIX), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=1)
+    _rotate()
+
+
+def _rotate():
+    """Deletes the oldest profiles (summary plus profile files) beyond PROFILE_KEEP."""
+    ids = sorted(_profile_ids(), reverse=True)
+    for stale_id in ids[PROFILE_KEEP:]:
+        for name in os.listdir(PROFILE_DIR):
+            if name.startswith(stale_id):
+                try:
+                    os.remove(os.path.join(PROFILE_DIR, name))
+                except FileNotFoundError:
+                    pass
+
+
+def _profile_ids() -> List[str]:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    return [
+        name[:-len(SUMMARY_SUFFIX)] for name in os.listdir(PROFILE_DIR)
+        if name.endswith(SUMMARY_SUFFIX) and PROFILE_ID_PATTERN.match(name[:-len(SUMMARY_SUFFIX)])
+    ]
+
+
+def list_profiles(limit: int) -> List[dict]:
+    """Summaries of the newest profiles, without their per-call details."""
+    summaries = []
+    for profile_id in sorted(_profile_ids(), reverse=True)[:limit]:
+        summary = get_profile(profile_id)
+        if summary:
+            summaries.append({k: v for k, v in summary.items() if k not in ("db_calls", "top_functions", "call_tree")})
+    return summaries
+
+
+def get_profile(profile_id: str) -> Optional[dict]:
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    try:
+        with open(os.path.join(PROFILE_DIR, profile_id + SUMMARY_SUFFIX), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def profile_file_path(profile_id: str, file_name: str) -> Optional[str]:
+    """The path of one of a profile's files, if the summary lists it."""
+    summary = get_profile(profile_id)
+    if not summary or file_name not in summary.get("files", []):
+        return None
+    return os.path.join(PROFILE_DIR, file_name)
+
+
+# --- ASGI Middleware ---
+class ProfilingMiddleware:
+    """Runs selected requests under a profiler and records their database calls."""
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._busy:
+            await self.app(scope, receive, send)
+            return
+        forced = _admin_header(scope)
+        if not forced and not _sampled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        now = datetime.datetime.utcnow()
+        profile_id = f"{now:%Y%m%dT%H%M%S%f}_{uuid.uuid4().hex[:8]}"
+        status = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        calls = DbCallLog()
+        token = db_call_log.set(calls)
+        session = _new_session()
+        started = time.perf_counter()
+        session.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session.stop()
+            elapsed = time.perf_counter() - started
+            db_call_log.reset(token)
+            route = scope.get("route")
+            summary = {
+                "id": profile_id,
+                "timestamp": now.isoformat(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status,
+                "trigger": "header" if forced else "sampled",
+                "profiler": session.name,
+                "duration_ms": round(elapsed * 1000, 3),
+                "db_call_count": len(calls.calls),
+                "db_total_ms": round(sum(call["duration_ms"] for call in calls.calls), 3),
+                "db_calls": calls.calls,
+            }
+            try:
+                # The response has been sent; writing the files only delays this worker's next profile.
+                await asyncio.to_thread(_write_profile, profile_id, session, summary)
+            except Exception as e:
+                logger.error("Could not write profile %s: %s", profile_id, e)
+            finally:
+                self._busy = False
@@ -0,0 +1,32 @@
+# backend/core/static_files.py (New File)
+
+import re
+from pathlib import PurePath
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from core.config import STATIC_IMMUTABLE_MAX_AGE
+
+# Derived candidate photos are named "<sha256 prefix>_<variant>.<ext>", so a
+# given URL always refers to the same bytes.
+CONTENT_HASHED_NAME = re.compile(r"^[0-9a-f]{16,64}_[a-z]+\.(webp|jpg)$")
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that marks content-hashed files as immutable. Everything else is
+    served with "no-cache", so browsers revalidate it using the ETag that
+    Starlette already sends and receive a 304 when nothing has changed.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        if CONTENT_HASHED_NAME.match(PurePath(full_path).name):
+            response.headers["Cache-Control"] = f"public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -2,28 +2,40 @@
 
 import motor.motor_asyncio
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from the .env file in the backend directory
-load_dotenv()
+# core.config loads the .env file in the backend directory before any setting is read.
+from core.config import DATABASE_ENGINE, MONGO_DB_NAME
+from core.metrics import mongo_command_listener
 
 # --- MongoDB Connection Setup ---
+# Only the "mongo" engine needs a server; with DATABASE_ENGINE=sqlite no client is
+# created and the collections below are None.
 MONGO_DETAILS = os.getenv("MONGO_URI")
-if not MONGO_DETAILS:
-    raise ValueError("FATAL ERROR: MONGO_URI environment variable is not set. Please check your .env file.")
+client = None
+database = None
+if DATABASE_ENGINE == "mongo":
+    if not MONGO_DETAILS:
+        raise ValueError("FATAL ERROR: MONGO_URI environment variable is not set. Please check your .env file.")
+    # Create a single, reusable client instance. Every command it runs is reported to
+    # the metrics (and to the DB call log of a profiled request).
+    client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_DETAILS, event_listeners=[mongo_command_listener])
+    database = client[MONGO_DB_NAME]
+
+
+def _collection(name: str):
+    return database.get_collection(name) if database is not None else None
 
-# Create a single, reusable client instance
-client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_DETAILS)
-database = client.voting_system
 
 # --- Database Collections ---
 # We define all our collections here so they can be imported easily elsewhere.
-candidate_collection = database.get_collection("candidates_v2")
-vote_collection = database.get_collection("votes_v2")
-settings_collection = database.get_collection("settings_v2")
-student_collection = database.get_collection("students_v2")
-voted_student_collection = database.get_collection("voted_students_v2")
-audit_log_collection = database.get_collection("audit_logs")
+candidate_collection = _collection("candidates_v2")
+vote_collection = _collection("votes_v2")
+settings_collection = _collection("settings_v2")
+student_collection = _collection("students_v2")
+voted_student_collection = _collection("voted_students_v2")
+audit_log_collection = _collection("audit_logs")
+tally_collection = _collection("tallies_v2")
+upload_job_collection = _collection("upload_jobs_v2")
 
 # Note: We use '_v2' to avoid conflicts with your old data.
-# You can safely delete the old collections later.
\ No newline at end of file
+# You can safely delete the old collections later.
@@ -0,0 +1,39 @@
+# backend/database/engine.py (New File)
+#
+# Picks the storage engine named by DATABASE_ENGINE and exposes its repositories.
+# Everything else imports `repositories` from here and never touches a driver.
+
+import logging
+
+from core.config import DATABASE_ENGINE, SQLITE_PATH, VERIFY_INDEXES_ON_STARTUP
+from database.repository import Repositories
+
+logger = logging.getLogger(__name__)
+
+if DATABASE_ENGINE == "mongo":
+    from database import mongo_engine
+    repositories: Repositories = mongo_engine.create_repositories()
+elif DATABASE_ENGINE == "sqlite":
+    from database import sqlite_engine
+    sqlite_database = sqlite_engine.SQLiteDatabase(SQLITE_PATH)
+    repositories: Repositories = sqlite_engine.create_repositories(sqlite_database)
+else:
+    raise ValueError(f"FATAL ERROR: Unknown DATABASE_ENGINE '{DATABASE_ENGINE}'. Use 'mongo' or 'sqlite'.")
+
+
+async def init_database():
+    """Prepares the store before the first request: indexes for MongoDB, the schema for SQLite."""
+    if DATABASE_ENGINE == "mongo":
+        from database.indexes import ensure_indexes, verify_indexes, backfill_search_fields
+        await ensure_indexes()
+        await backfill_search_fields()
+        if VERIFY_INDEXES_ON_STARTUP:
+            await verify_indexes()
+    else:
+        await sqlite_database.open()
+        logger.info("Using the embedded SQLite database at %s.", SQLITE_PATH)
+
+
+async def close_database():
+    if DATABASE_ENGINE == "sqlite":
+        await sqlite_database.close()
@@ -0,0 +1,144 @@
+# backend/database/indexes.py (New File)
+#
+# Declares every index the hot query paths rely on and creates them at startup.
+# It can also be run by hand against any database to check that no hot query
+# falls back to a collection scan:
+#
+#     cd backend && python -m database.indexes --verify
+
+import asyncio
+import datetime
+import logging
+import sys
+from typing import List, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+from database.connection import (
+    student_collection,
+    vote_collection,
+    voted_student_collection,
+    candidate_collection,
+    audit_log_collection
+)
+
+logger = logging.getLogger(__name__)
+
+# --- Index Declarations ---
+INDEXES = [
+    # identify_student: roll_number + stream + division (+ name); the (stream, roll_number)
+    # prefix also serves the bulk upload duplicate check.
+    (student_collection, [
+        IndexModel([("stream", ASCENDING), ("roll_number", ASCENDING), ("division", ASCENDING), ("name", ASCENDING)], name="identify_lookup"),
+        # Keyset-paginated roster listing filtered by stream/division.
+        IndexModel([("stream", ASCENDING), ("division", ASCENDING), ("_id", ASCENDING)], name="roster_page"),
+        # Roster search: anchored prefix on the lowercased name, whole-word text search,
+        # and exact roll number lookup.
+        IndexModel([("name_lower", ASCENDING)], name="name_prefix"),
+        IndexModel([("name", TEXT)], name="name_text"),
+        IndexModel([("roll_number", ASCENDING)], name="roll_number"),
+    ]),
+    # Legacy commit mode keeps one marker per student; atomic mode keys votes by _id,
+    # and the unique identifier index protects the legacy documents as well.
+    (voted_student_collection, [
+        IndexModel([("student_identifier", ASCENDING)], name="student_identifier_unique", unique=True),
+    ]),
+    (vote_collection, [
+        IndexModel([("student_identifier", ASCENDING)], name="student_identifier_unique", unique=True),
+    ]),
+    # Candidate lookups by (name, position_id) and listing per position.
+    (candidate_collection, [
+        IndexModel([("position_id", ASCENDING), ("name", ASCENDING)], name="position_name_unique", unique=True),
+    ]),
+    # Keyset-paginated audit log: (timestamp, _id) ordering, optionally filtered by action.
+    (audit_log_collection, [
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp_id"),
+        IndexModel([("action", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="action_timestamp_id"),
+    ]),
+]
+
+# --- Hot Query Shapes ---
+# (label, collection, filter, sort) for every query that runs per request.
+HOT_QUERIES = [
+    ("identify_student", student_collection,
+     {"roll_number": 1, "stream": "Science", "division": "A", "name": "Student"}, None),
+    ("bulk_upload_duplicate_check", student_collection,
+     {"roll_number": 1, "stream": "Science"}, None),
+    ("roster_page", student_collection,
+     {"stream": "Science", "division": "A", "_id": {"$gt": ObjectId("000000000000000000000000")}}, [("_id", ASCENDING)]),
+    ("roster_search_prefix", student_collection, {"name_lower": {"$regex": "^sur"}}, [("name_lower", ASCENDING)]),
+    ("roster_search_roll_number", student_collection, {"roll_number": 101}, None),
+    ("has_voted (atomic)", vote_collection, {"_id": "Science-A-1"}, None),
+    ("has_voted (legacy)", voted_student_collection, {"student_identifier": "Science-A-1"}, None),
+    ("candidate_lookup", candidate_collection, {"name": "Candidate", "position_id": "cr_boy"}, None),
+    ("audit_log_listing", audit_log_collection, {}, [("timestamp", DESCENDING)]),
+    ("audit_log_page_by_action", audit_log_collection,
+     {"action": "Vote Cast", "timestamp": {"$lt": datetime.datetime(2100, 1, 1)}}, [("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ("audit_log_since", audit_log_collection,
+     {"_id": {"$gt": ObjectId("000000000000000000000000")}}, [("_id", ASCENDING)]),
+]
+
+
+async def ensure_indexes():
+    """Creates all declared indexes. Existing indexes are left untouched."""
+    for collection, models in INDEXES:
+        try:
+            await collection.create_indexes(models)
+        except OperationFailure as e:
+            # Most likely existing data violates a unique index; keep serving and report it.
+            logger.error("Could not create indexes on '%s': %s", collection.name, e)
+
+
+async def backfill_search_fields():
+    """Adds the lowercased name used by roster search to students stored before it existed."""
+    await student_collection.update_many(
+        {"name_lower": {"$exists": False}},
+        [{"$set": {"name_lower": {"$toLower": "$name"}}}]
+    )
+
+
+def _plan_stages(plan: dict) -> List[str]:
+    """Collects every stage name in an explain() plan tree."""
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += _plan_stages(child)
+    return stages
+
+
+async def find_collection_scans() -> List[Tuple[str, List[str]]]:
+    """Explains every hot query shape and returns those whose winning plan contains a COLLSCAN."""
+    offenders = []
+    for label, collection, query, sort in HOT_QUERIES:
+        cursor = collection.find(query).limit(200)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        stages = _plan_stages(explain["queryPlanner"]["winningPlan"])
+        if "COLLSCAN" in stages:
+            offenders.append((label, stages))
+    return offenders
+
+
+async def verify_indexes() -> bool:
+    offenders = await find_collection_scans()
+    for label, stages in offenders:
+        logger.warning("Hot query '%s' falls back to a collection scan (plan: %s).", label, " <- ".join(stages))
+    return not offenders
+
+
+async def _main(verify: bool) -> int:
+    await ensure_indexes()
+    await backfill_search_fields()
+    if verify and not await verify_indexes():
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(_main(verify="--verify" in sys.argv)))
@@ -0,0 +1,475 @@
+# backend/database/mongo_engine.py (New File)
+#
+# The MongoDB (Motor) implementation of the repositories. The queries are the
+# ones the routers and services used to issue directly; indexes.py declares the
+# indexes they rely on.
+
+import re
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from database import connection
+from database.repository import (
+    AuditLogRepository, AuditPosition, CandidateRepository, ClassKey, Counts, DuplicateRecordError,
+    Repositories, SettingsRepository, StudentRepository, UploadJobRepository, VoteRepository
+)
+from core.config import VOTE_COMMIT_MODE
+
+SETTINGS_ID = "global_settings"
+ROSTER_PROJECTION = {"name": 1, "roll_number": 1, "stream": 1, "division": 1}
+# Pairs per $or query in existing_keys; each clause is its own index lookup.
+EXISTING_KEYS_QUERY_SIZE = 500
+
+
+def _roster_filter(stream: Optional[str], division: Optional[str]) -> dict:
+    query = {}
+    if stream:
+        query["stream"] = stream
+    if division:
+        query["division"] = division
+    return query
+
+
+def _object_id(value: str) -> ObjectId:
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise ValueError(f"Invalid record id: {value!r}")
+
+
+# --- Settings ---
+class MongoSettingsRepository(SettingsRepository):
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def get(self) -> Optional[dict]:
+        return await self.collection.find_one({"_id": SETTINGS_ID})
+
+    async def get_version(self) -> Optional[int]:
+        stored = await self.collection.find_one({"_id": SETTINGS_ID}, {"version": 1})
+        return stored.get("version", 0) if stored else None
+
+    async def create_default(self, settings: dict) -> bool:
+        result = await self.collection.update_one(
+            {"_id": SETTINGS_ID},
+            {"$setOnInsert": {**settings, "version": 1}},
+            upsert=True
+        )
+        return result.upserted_id is not None
+
+    async def save(self, settings: dict) -> None:
+        await self.collection.update_one(
+            {"_id": SETTINGS_ID},
+            {"$set": settings, "$inc": {"version": 1}},
+            upsert=True
+        )
+
+
+# --- Candidates ---
+class MongoCandidateRepository(CandidateRepository):
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def list_all(self) -> List[dict]:
+        return await self.collection.find({}, {"_id": 0}).to_list(None)
+
+    async def find(self, name: str, position_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"name": name, "position_id": position_id}, {"_id": 0})
+
+    async def insert(self, candidate: dict) -> None:
+        try:
+            await self.collection.insert_one(dict(candidate))
+        except DuplicateKeyError:
+            raise DuplicateRecordError(f"Candidate '{candidate['name']}' already exists for '{candidate['position_id']}'.")
+
+    async def update(self, name: str, position_id: str, fields: dict) -> bool:
+        result = await self.collection.update_one({"name": name, "position_id": position_id}, {"$set": fields})
+        return result.matched_count > 0
+
+    async def delete(self, name: str, position_id: str) -> bool:
+        result = await self.collection.delete_one({"name": name, "position_id": position_id})
+        return result.deleted_count > 0
+
+    async def delete_all(self) -> int:
+        return (await self.collection.delete_many({})).deleted_count
+
+
+# --- Students ---
+class MongoStudentRepository(StudentRepository):
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_one(self, roll_number: int, stream: str, division: Optional[str], name: Optional[str] = None) -> Optional[dict]:
+        query = {"roll_number": roll_number, "stream": stream, "division": division}
+        if name is not None:
+            query["name"] = name
+        return await self.collection.find_one(query)
+
+    async def existing_keys(self, records: List[dict]) -> Set[Tuple[str, int]]:
+        # Exact (stream, roll_number) pairs: two independent $in lists would also match every
+        # cross combination, and fetch far more documents than the chunk actually repeats.
+        keys = list({(r["stream"], r["roll_number"]) for r in records})
+        existing = set()
+        for start in range(0, len(keys), EXISTING_KEYS_QUERY_SIZE):
+            pairs = keys[start:start + EXISTING_KEYS_QUERY_SIZE]
+            cursor = self.collection.find(
+                {"$or": [{"stream": stream, "roll_number": roll_number} for stream, roll_number in pairs]},
+                {"_id": 0, "roll_number": 1, "stream": 1}
+            )
+            existing.update([(doc["stream"], doc["roll_number"]) async for doc in cursor])
+        return existing
+
+    async def insert_many(self, records: List[dict]) -> Tuple[int, int]:
+        try:
+            # insert_many adds an _id to each document it is given, so hand it copies.
+            result = await self.collection.insert_many([dict(r) for r in records], ordered=False)
+            return len(result.inserted_ids), 0
+        except BulkWriteError as e:
+            return e.details.get("nInserted", 0), len(e.details.get("writeErrors", []))
+
+    async def list_all(self, limit: int) -> List[dict]:
+        return await self.collection.find({}, {"_id": 0}).to_list(limit)
+
+    async def page(self, limit: int, cursor: Optional[str] = None, stream: Optional[str] = None,
+                   division: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        query = _roster_filter(stream, division)
+        if cursor:
+            query["_id"] = {"$gt": _object_id(cursor)}
+        docs = await self.collection.find(query, ROSTER_PROJECTION).sort("_id", 1).limit(limit).to_list(limit)
+        next_cursor = str(docs[-1]["_id"]) if len(docs) == limit else None
+        return docs, next_cursor
+
+    async def search(self, term: str, limit: int, stream: Optional[str] = None, division: Optional[str] = None) -> List[dict]:
+        base_query = _roster_filter(stream, division)
+        matches: Dict[ObjectId, dict] = {}
+
+        async def collect(query: dict, sort=None, projection=ROSTER_PROJECTION):
+            remaining = limit - len(matches)
+            if remaining <= 0:
+                return
+            cursor = self.collection.find({**base_query, **query}, projection)
+            if sort:
+                cursor = cursor.sort(sort)
+            async for doc in cursor.limit(remaining + len(matches)):
+                if len(matches) >= limit:
+                    break
+                matches.setdefault(doc["_id"], doc)
+
+        if term.isdigit():
+            await collect({"roll_number": int(term)})
+        await collect({"name_lower": {"$regex": f"^{re.escape(term.lower())}"}}, sort=[("name_lower", 1)])
+        await collect(
+            {"$text": {"$search": term}},
+            sort=[("score", {"$meta": "textScore"})],
+            projection={**ROSTER_PROJECTION, "score": {"$meta": "textScore"}}
+        )
+        return list(matches.values())
+
+    async def iter_batches(self, batch_size: int, stream: Optional[str] = None,
+                           division: Optional[str] = None) -> AsyncIterator[List[dict]]:
+        cursor = self.collection.find(
+            _roster_filter(stream, division), {**ROSTER_PROJECTION, "_id": 0}
+        ).sort("_id", 1).batch_size(batch_size)
+        batch = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def count(self) -> int:
+        return await self.collection.count_documents({})
+
+    async def class_sizes(self) -> Dict[ClassKey, int]:
+        return {
+            (row["_id"].get("stream"), row["_id"].get("division")): row["students"]
+            async for row in self.collection.aggregate([
+                {"$group": {"_id": {"stream": "$stream", "division": "$division"}, "students": {"$sum": 1}}}
+            ])
+        }
+
+    async def delete_all(self) -> int:
+        return (await self.collection.delete_many({})).deleted_count
+
+
+# --- Votes and Tallies ---
+# Student identifiers are built as "<stream>-<division or NA>-<roll_number>" by
+# get_unique_student_identifier, so the class of a ballot can be recovered on the
+# server: the last part is the roll number, the one before it the division, and
+# everything in front of that (streams may contain hyphens) is the stream.
+_CLASS_OF_BALLOT_STAGES = [
+    {"$addFields": {"_parts": {"$split": ["$student_identifier", "-"]}}},
+    {"$addFields": {"_division": {"$arrayElemAt": ["$_parts", -2]}, "_roll": {"$arrayElemAt": ["$_parts", -1]}}},
+    {"$addFields": {
+        "stream": {"$substrCP": [
+            "$student_identifier", 0,
+            {"$subtract": [
+                {"$strLenCP": "$student_identifier"},
+                {"$add": [{"$strLenCP": "$_division"}, {"$strLenCP": "$_roll"}, 2]},
+            ]},
+        ]},
+        "division": {"$cond": [{"$eq": ["$_division", "NA"]}, None, "$_division"]},
+    }},
+]
+
+_SELECTIONS_AS_ROWS = [
+    {"$project": {"student_identifier": 1, "selection": {"$objectToArray": "$selections"}}},
+]
+
+
+def _count_selections(group_key: dict) -> list:
+    return [
+        {"$unwind": "$selection"},
+        {"$group": {"_id": {**group_key, "position_id": "$selection.k", "candidate": "$selection.v"}, "count": {"$sum": 1}}},
+    ]
+
+
+# Each tally document looks like:
+#   {"_id": {"position_id": "cr_boy", "candidate": "Rohan"}, "position_id": "cr_boy", "candidate": "Rohan", "count": 42}
+def _tally_id(position_id: str, candidate: str) -> dict:
+    return {"position_id": position_id, "candidate": candidate}
+
+
+class MongoVoteRepository(VoteRepository):
+    """
+    In "atomic" commit mode the vote document is keyed by the student identifier,
+    so the unique _id index makes the insert itself the duplicate check. "legacy"
+    mode inserts the voted_students marker first (its unique index is the
+    duplicate check), then the vote.
+
+    A standalone server has no multi-document transactions, so a ballot is stored
+    with "tally_pending": True and the flag is cleared when its counters are
+    bumped. If the commit fails in between, the kiosk's retry of the same ballot
+    finds the flag and finishes the count (finish_tally).
+    """
+
+    def __init__(self, votes, voted_students, tallies, commit_mode: str = VOTE_COMMIT_MODE):
+        self.votes = votes
+        self.voted_students = voted_students
+        self.tallies = tallies
+        self.commit_mode = commit_mode
+
+    def _by_student(self, student_identifier: str) -> dict:
+        if self.commit_mode == "atomic":
+            return {"_id": student_identifier}
+        return {"student_identifier": student_identifier}
+
+    async def has_voted(self, student_identifier: str) -> bool:
+        if self.commit_mode == "atomic":
+            return await self.votes.find_one({"_id": student_identifier}, {"_id": 1}) is not None
+        return await self.voted_students.find_one({"student_identifier": student_identifier}) is not None
+
+    async def insert(self, vote: dict) -> None:
+        ballot = {**vote, "tally_pending": True}
+        if self.commit_mode == "atomic":
+            try:
+                await self.votes.insert_one({"_id": vote["student_identifier"], **ballot})
+            except DuplicateKeyError:
+                raise DuplicateRecordError(f"A ballot for '{vote['student_identifier']}' is already stored.")
+        else:
+            # The marker goes first: its unique index lets only one of two racing submits through.
+            marker = {"student_identifier": vote["student_identifier"]}
+            try:
+                await self.voted_students.insert_one(marker)
+            except DuplicateKeyError:
+                raise DuplicateRecordError(f"A ballot for '{vote['student_identifier']}' is already stored.")
+            try:
+                await self.votes.insert_one(ballot)
+            except DuplicateKeyError:
+                raise DuplicateRecordError(f"A ballot for '{vote['student_identifier']}' is already stored.")
+            except BaseException:
+                # Without its ballot the marker would lock the student out for good.
+                await self.voted_students.delete_one(marker)
+                raise
+        await self.finish_tally(vote["student_identifier"])
+
+    async def finish_tally(self, student_identifier: str) -> Optional[Dict[str, str]]:
+        # Clearing the flag claims the ballot, so concurrent retries count it only once.
+        ballot = await self.votes.find_one_and_update(
+            {**self._by_student(student_identifier), "tally_pending": True},
+            {"$unset": {"tally_pending": ""}},
+            projection={"_id": 0, "selections": 1}
+        )
+        if ballot is None:
+            return None
+        try:
+            await self._increment_tallies(ballot["selections"])
+        except BaseException:
+            # Hand the ballot back to the next retry (or rebuild_tallies).
+            await self.votes.update_one(self._by_student(student_identifier), {"$set": {"tally_pending": True}})
+            raise
+        return ballot["selections"]
+
+    async def insert_many(self, votes: List[dict]) -> int:
+        atomic = self.commit_mode == "atomic"
+        docs = [{"_id": v["student_identifier"], **v} if atomic else dict(v) for v in votes]
+        try:
+            inserted = len((await self.votes.insert_many(docs, ordered=False)).inserted_ids)
+        except BulkWriteError as e:
+            inserted = e.details.get("nInserted", 0)
+        if not atomic:
+            try:
+                await self.voted_students.insert_many([{"student_identifier": v["student_identifier"]} for v in votes], ordered=False)
+            except BulkWriteError:
+                pass  # markers of students who had already voted
+        return inserted
+
+    async def has_ballot_with_key(self, student_identifier: str, idempotency_key: str) -> bool:
+        query = {**self._by_student(student_identifier), "idempotency_key": idempotency_key}
+        return await self.votes.find_one(query, {"_id": 1}) is not None
+
+    async def count(self) -> int:
+        return await self.votes.count_documents({})
+
+    async def iter_batches(self, batch_size: int) -> AsyncIterator[List[dict]]:
+        cursor = self.votes.find({}, {"_id": 0, "student_identifier": 1, "selections": 1}).batch_size(batch_size)
+        batch = []
+        async for vote in cursor:
+            batch.append(vote)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def aggregate(self, by_class: bool = False) -> Tuple[Counts, int, Optional[dict]]:
+        # One $facet pass over the votes collection yields every count at once.
+        facets = {
+            "counts": _count_selections({}),
+            "total": [{"$count": "ballots"}],
+        }
+        if by_class:
+            class_key = {"stream": "$stream", "division": "$division"}
+            facets["class_ballots"] = _CLASS_OF_BALLOT_STAGES + [{"$group": {"_id": class_key, "ballots": {"$sum": 1}}}]
+            facets["class_counts"] = _CLASS_OF_BALLOT_STAGES + _count_selections(class_key)
+
+        rows = await self.votes.aggregate(_SELECTIONS_AS_ROWS + [{"$facet": facets}]).to_list(1)
+        facet = rows[0] if rows else {}
+
+        counts: Counts = {}
+        for row in facet.get("counts", []):
+            counts.setdefault(row["_id"]["position_id"], {})[row["_id"]["candidate"]] = row["count"]
+        total = facet["total"][0]["ballots"] if facet.get("total") else 0
+        class_rows = None
+        if by_class:
+            class_rows = {"ballots": {}, "counts": {}}
+            for row in facet.get("class_ballots", []):
+                class_rows["ballots"][(row["_id"].get("stream"), row["_id"].get("division"))] = row["ballots"]
+            for row in facet.get("class_counts", []):
+                key = row["_id"]
+                class_counts = class_rows["counts"].setdefault((key.get("stream"), key.get("division")), {})
+                class_counts.setdefault(key["position_id"], {})[key["candidate"]] = row["count"]
+        return counts, total, class_rows
+
+    async def delete_all(self) -> int:
+        deleted = (await self.votes.delete_many({})).deleted_count
+        await self.voted_students.delete_many({})
+        return deleted
+
+    async def _increment_tallies(self, selections: Dict[str, str]) -> None:
+        # A single bulk write bumps every counter the ballot touches.
+        if not selections:
+            return
+        await self.tallies.bulk_write([
+            UpdateOne(
+                {"_id": _tally_id(position_id, candidate)},
+                {"$inc": {"count": 1}, "$setOnInsert": {"position_id": position_id, "candidate": candidate}},
+                upsert=True
+            )
+            for position_id, candidate in selections.items()
+        ], ordered=False)
+
+    async def read_tallies(self) -> Counts:
+        tallies: Counts = {}
+        async for doc in self.tallies.find({}, {"_id": 0}):
+            tallies.setdefault(doc["position_id"], {})[doc["candidate"]] = doc["count"]
+        return tallies
+
+    async def rebuild_tallies(self) -> int:
+        # Every stored ballot is counted below, including any whose commit failed halfway.
+        await self.votes.update_many({"tally_pending": True}, {"$unset": {"tally_pending": ""}})
+        pipeline = [
+            {"$project": {"selection": {"$objectToArray": "$selections"}}},
+            {"$unwind": "$selection"},
+            {"$group": {"_id": {"position_id": "$selection.k", "candidate": "$selection.v"}, "count": {"$sum": 1}}},
+        ]
+        tallies = [
+            {"_id": _tally_id(row["_id"]["position_id"], row["_id"]["candidate"]), **row["_id"], "count": row["count"]}
+            async for row in self.votes.aggregate(pipeline)
+        ]
+        await self.tallies.delete_many({})
+        if tallies:
+            await self.tallies.insert_many(tallies)
+        return len(tallies)
+
+    async def clear_tallies(self) -> None:
+        await self.tallies.delete_many({})
+
+
+# --- Audit Logs ---
+class MongoAuditLogRepository(AuditLogRepository):
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def insert_many(self, entries: List[dict]) -> None:
+        # insert_many adds an _id to each document; copies keep the caller's entries reusable.
+        await self.collection.insert_many([dict(e) for e in entries], ordered=False)
+
+    async def latest(self, limit: int) -> List[dict]:
+        return await self.collection.find({}, {"_id": 0}).sort("timestamp", -1).limit(limit).to_list(limit)
+
+    async def page(self, limit, actor=None, action=None, start=None, end=None,
+                   before: Optional[AuditPosition] = None, after_id: Optional[str] = None) -> List[dict]:
+        query: dict = {}
+        if actor:
+            query["actor"] = actor
+        if action:
+            query["action"] = action
+        if start or end:
+            query["timestamp"] = {**({"$gte": start} if start else {}), **({"$lt": end} if end else {})}
+
+        if after_id:
+            # ObjectIds are generated when an entry is written; see latest_id for their limits.
+            query["_id"] = {"$gt": _object_id(after_id)}
+            return await self.collection.find(query).sort("_id", 1).limit(limit).to_list(limit)
+        if before:
+            timestamp, log_id = before[0], _object_id(before[1])
+            query["$or"] = [{"timestamp": {"$lt": timestamp}}, {"timestamp": timestamp, "_id": {"$lt": log_id}}]
+        return await self.collection.find(query).sort([("timestamp", -1), ("_id", -1)]).limit(limit).to_list(limit)
+
+    async def latest_id(self) -> Optional[str]:
+        # ObjectIds only order entries to the second across processes, and a batch
+        # being written can be overtaken by another worker's; with several workers a
+        # poll can therefore miss an entry written in the same instant (the admin UI
+        # reloads the log from the top now and then to pick those up).
+        doc = await self.collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        return str(doc["_id"]) if doc else None
+
+
+# --- Upload Jobs ---
+class MongoUploadJobRepository(UploadJobRepository):
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def save(self, job: dict) -> None:
+        await self.collection.replace_one({"_id": job["job_id"]}, job, upsert=True)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"_id": job_id}, {"_id": 0})
+
+
+def create_repositories() -> Repositories:
+    return Repositories(
+        settings=MongoSettingsRepository(connection.settings_collection),
+        candidates=MongoCandidateRepository(connection.candidate_collection),
+        students=MongoStudentRepository(connection.student_collection),
+        votes=MongoVoteRepository(connection.vote_collection, connection.voted_student_collection, connection.tally_collection),
+        audit_logs=MongoAuditLogRepository(connection.audit_log_collection),
+        upload_jobs=MongoUploadJobRepository(connection.upload_job_collection),
+    )
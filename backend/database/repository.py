@@ -0,0 +1,215 @@
+# backend/database/repository.py (New File)
+#
+# Storage-neutral interfaces for everything the app persists. Services and routers
+# only talk to these; database/engine.py decides which implementation backs them
+# (MongoDB through Motor, or an embedded SQLite file).
+
+import datetime
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+Counts = Dict[str, Dict[str, int]]
+ClassKey = Tuple[str, Optional[str]]
+# (timestamp, id) position in the audit log; the id is the engine's record id as a string,
+# which also gives the order in which entries were written.
+AuditPosition = Tuple[datetime.datetime, str]
+
+
+class DuplicateRecordError(Exception):
+    """Raised when an insert collides with an existing record's unique key."""
+
+
+def class_of_identifier(student_identifier: str) -> ClassKey:
+    """
+    Recovers (stream, division) from a "<stream>-<division or NA>-<roll_number>"
+    identifier. Streams may contain hyphens, so only the last two parts are split off.
+    Raises ValueError for an identifier that is not in this format.
+    """
+    parts = student_identifier.rsplit("-", 2)
+    if len(parts) != 3 or not parts[0] or not parts[1] or not parts[2].isdigit():
+        raise ValueError(f"'{student_identifier}' is not a valid student identifier.")
+    stream, division, _roll = parts
+    return stream, None if division == "NA" else division
+
+
+class SettingsRepository(ABC):
+    @abstractmethod
+    async def get(self) -> Optional[dict]:
+        """The stored settings document (ElectionSettings fields plus "version"), if any."""
+
+    @abstractmethod
+    async def get_version(self) -> Optional[int]:
+        """Only the version number; a cheap staleness check."""
+
+    @abstractmethod
+    async def create_default(self, settings: dict) -> bool:
+        """Stores settings at version 1 unless some already exist. Returns True if it did."""
+
+    @abstractmethod
+    async def save(self, settings: dict) -> None:
+        """Replaces the settings and increments the version."""
+
+
+class CandidateRepository(ABC):
+    @abstractmethod
+    async def list_all(self) -> List[dict]: ...
+
+    @abstractmethod
+    async def find(self, name: str, position_id: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def insert(self, candidate: dict) -> None:
+        """Raises DuplicateRecordError if the position already has a candidate with this name."""
+
+    @abstractmethod
+    async def update(self, name: str, position_id: str, fields: dict) -> bool: ...
+
+    @abstractmethod
+    async def delete(self, name: str, position_id: str) -> bool: ...
+
+    @abstractmethod
+    async def delete_all(self) -> int: ...
+
+
+class StudentRepository(ABC):
+    @abstractmethod
+    async def find_one(self, roll_number: int, stream: str, division: Optional[str], name: Optional[str] = None) -> Optional[dict]:
+        """The identify lookup. division=None matches students without a division."""
+
+    @abstractmethod
+    async def existing_keys(self, records: List[dict]) -> Set[Tuple[str, int]]:
+        """(stream, roll_number) pairs among the records that are already on the roster."""
+
+    @abstractmethod
+    async def insert_many(self, records: List[dict]) -> Tuple[int, int]:
+        """Inserts new students. Returns (inserted, rejected as duplicates)."""
+
+    @abstractmethod
+    async def list_all(self, limit: int) -> List[dict]: ...
+
+    @abstractmethod
+    async def page(self, limit: int, cursor: Optional[str] = None, stream: Optional[str] = None,
+                   division: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """One page in insertion order and the cursor of the next page. Raises ValueError for a bad cursor."""
+
+    @abstractmethod
+    async def search(self, term: str, limit: int, stream: Optional[str] = None, division: Optional[str] = None) -> List[dict]:
+        """Exact roll number matches for numeric terms, then name prefix matches, then other name matches."""
+
+    @abstractmethod
+    def iter_batches(self, batch_size: int, stream: Optional[str] = None,
+                     division: Optional[str] = None) -> AsyncIterator[List[dict]]:
+        """The whole (optionally filtered) roster in insertion order, batch_size students at a time."""
+
+    @abstractmethod
+    async def count(self) -> int: ...
+
+    @abstractmethod
+    async def class_sizes(self) -> Dict[ClassKey, int]: ...
+
+    @abstractmethod
+    async def delete_all(self) -> int: ...
+
+
+class VoteRepository(ABC):
+    """Ballots and the per-candidate counters that are kept in step with them."""
+
+    @abstractmethod
+    async def has_voted(self, student_identifier: str) -> bool: ...
+
+    @abstractmethod
+    async def insert(self, vote: dict) -> None:
+        """
+        Stores a ballot and counts its selections in the tallies. Raises
+        DuplicateRecordError if the student already has one.
+        """
+
+    @abstractmethod
+    async def finish_tally(self, student_identifier: str) -> Optional[Dict[str, str]]:
+        """
+        Counts a stored ballot whose insert failed after the ballot was written but
+        before its selections were counted. Returns the selections it counted, or
+        None if the ballot was already counted.
+        """
+
+    @abstractmethod
+    async def insert_many(self, votes: List[dict]) -> int:
+        """
+        Stores many ballots, skipping students who already have one, without counting
+        them (run rebuild_tallies afterwards). Returns how many were stored.
+        """
+
+    @abstractmethod
+    async def has_ballot_with_key(self, student_identifier: str, idempotency_key: str) -> bool: ...
+
+    @abstractmethod
+    async def count(self) -> int: ...
+
+    @abstractmethod
+    def iter_batches(self, batch_size: int) -> AsyncIterator[List[dict]]:
+        """Every ballot as {"student_identifier", "selections"}, batch_size at a time."""
+
+    @abstractmethod
+    async def aggregate(self, by_class: bool = False) -> Tuple[Counts, int, Optional[dict]]:
+        """
+        Counts straight from the ballots: ({position_id: {candidate: votes}}, total
+        ballots, class rows). With by_class=True the class rows are
+        {"ballots": {(stream, division): n}, "counts": {(stream, division): Counts}}.
+        """
+
+    @abstractmethod
+    async def delete_all(self) -> int: ...
+
+    @abstractmethod
+    async def read_tallies(self) -> Counts: ...
+
+    @abstractmethod
+    async def rebuild_tallies(self) -> int:
+        """Recomputes every counter from the ballots. Returns the number of counters written."""
+
+    @abstractmethod
+    async def clear_tallies(self) -> None: ...
+
+
+class AuditLogRepository(ABC):
+    @abstractmethod
+    async def insert_many(self, entries: List[dict]) -> None: ...
+
+    @abstractmethod
+    async def latest(self, limit: int) -> List[dict]: ...
+
+    @abstractmethod
+    async def page(self, limit: int, actor: Optional[str] = None, action: Optional[str] = None,
+                   start: Optional[datetime.datetime] = None, end: Optional[datetime.datetime] = None,
+                   before: Optional[AuditPosition] = None, after_id: Optional[str] = None) -> List[dict]:
+        """
+        Entries ordered by (timestamp, id), each with its "_id". Newest first, and
+        older than `before` if given. With `after_id`, the entries written after that
+        one, in the order they were written: entries can carry older timestamps than
+        ones already stored (spilled entries replayed at startup, other workers'
+        batches), so only the write order finds every new entry.
+        Raises ValueError for an id this engine could not have issued.
+        """
+
+    @abstractmethod
+    async def latest_id(self) -> Optional[str]:
+        """The id of the most recently written entry, if any."""
+
+
+class UploadJobRepository(ABC):
+    @abstractmethod
+    async def save(self, job: dict) -> None: ...
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[dict]: ...
+
+
+@dataclass
+class Repositories:
+    settings: SettingsRepository
+    candidates: CandidateRepository
+    students: StudentRepository
+    votes: VoteRepository
+    audit_logs: AuditLogRepository
+    upload_jobs: UploadJobRepository
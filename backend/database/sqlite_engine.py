@@ -0,0 +1,583 @@
+# backend/database/sqlite_engine.py (New File)
+#
+# An embedded SQLite implementation of the repositories, for single-machine
+# deployments (one polling station, a laptop demo) that should not need a MongoDB
+# server. The file is opened in WAL mode and every statement runs on one
+# dedicated thread, so the event loop never blocks on disk I/O and writes are
+# serialized without any locking in Python.
+
+import asyncio
+import datetime
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from database.repository import (
+    AuditLogRepository, AuditPosition, CandidateRepository, ClassKey, Counts, DuplicateRecordError,
+    Repositories, SettingsRepository, StudentRepository, UploadJobRepository, VoteRepository,
+    class_of_identifier
+)
+from core.config import SQLITE_SYNCHRONOUS
+from core.metrics import record_db_operation
+
+SETTINGS_ID = "global_settings"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS candidates (
+    position_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (position_id, name)
+);
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    roll_number INTEGER NOT NULL,
+    stream TEXT NOT NULL,
+    division TEXT
+);
+CREATE INDEX IF NOT EXISTS students_identify_lookup ON students (stream, roll_number, division, name);
+CREATE INDEX IF NOT EXISTS students_roster_page ON students (stream, division, id);
+CREATE INDEX IF NOT EXISTS students_name_prefix ON students (name_lower);
+CREATE INDEX IF NOT EXISTS students_roll_number ON students (roll_number);
+CREATE TABLE IF NOT EXISTS votes (
+    student_identifier TEXT PRIMARY KEY,
+    selections TEXT NOT NULL,
+    idempotency_key TEXT,
+    stream TEXT,
+    division TEXT
+);
+CREATE TABLE IF NOT EXISTS tallies (
+    position_id TEXT NOT NULL,
+    candidate TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (position_id, candidate)
+);
+CREATE TABLE IF NOT EXISTS audit_logs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    actor TEXT NOT NULL,
+    action TEXT NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS audit_logs_timestamp_id ON audit_logs (timestamp, id);
+CREATE INDEX IF NOT EXISTS audit_logs_action_timestamp_id ON audit_logs (action, timestamp, id);
+CREATE TABLE IF NOT EXISTS upload_jobs (
+    job_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+_SELECTION_ROWS = "FROM votes, json_each(votes.selections) AS selection"
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=_json_default)
+
+
+def _timestamp(value: datetime.datetime) -> str:
+    """Fixed-width naive UTC text, so that string order is time order."""
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def _like_pattern(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _roster_filter(stream: Optional[str], division: Optional[str]) -> Tuple[List[str], list]:
+    clauses, params = [], []
+    if stream:
+        clauses.append("stream = ?")
+        params.append(stream)
+    if division:
+        clauses.append("division = ?")
+        params.append(division)
+    return clauses, params
+
+
+def _where(clauses: List[str]) -> str:
+    return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+def _student(row: sqlite3.Row) -> dict:
+    return {"name": row["name"], "roll_number": row["roll_number"], "stream": row["stream"], "division": row["division"]}
+
+
+def _operation_labels(fn: Callable) -> Tuple[str, str]:
+    """("vote", "insert") for a function defined in SQLiteVoteRepository.insert."""
+    owner, _, method = fn.__qualname__.split(".<locals>")[0].rpartition(".")
+    return owner.replace("SQLite", "").replace("Repository", "").lower(), method
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class SQLiteDatabase:
+    """One connection, used only from its own single-thread executor."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Autocommit mode; multi-statement writes use _transaction explicitly.
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def run(self, fn: Callable, *args):
+        """Runs fn(connection, *args) on the database thread and records it in the metrics."""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await loop.run_in_executor(self._executor, lambda: fn(self._connection(), *args))
+            failed = False
+            return result
+        finally:
+            target, operation = _operation_labels(fn)
+            record_db_operation("sqlite", operation, target, time.perf_counter() - started, failed=failed)
+
+    async def open(self):
+        await self.run(lambda conn: None)
+
+    async def close(self):
+        def _close(conn):
+            conn.close()
+            self._conn = None
+        if self._conn is not None:
+            await self.run(_close)
+
+
+class _Repository:
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+
+# --- Settings ---
+class SQLiteSettingsRepository(_Repository, SettingsRepository):
+    async def get(self) -> Optional[dict]:
+        def _get(conn):
+            row = conn.execute("SELECT version, data FROM settings WHERE id = ?", (SETTINGS_ID,)).fetchone()
+            return {**json.loads(row["data"]), "version": row["version"]} if row else None
+        return await self.db.run(_get)
+
+    async def get_version(self) -> Optional[int]:
+        def _get_version(conn):
+            row = conn.execute("SELECT version FROM settings WHERE id = ?", (SETTINGS_ID,)).fetchone()
+            return row["version"] if row else None
+        return await self.db.run(_get_version)
+
+    async def create_default(self, settings: dict) -> bool:
+        def _create(conn):
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO settings (id, version, data) VALUES (?, 1, ?)", (SETTINGS_ID, _dumps(settings))
+            )
+            return cursor.rowcount == 1
+        return await self.db.run(_create)
+
+    async def save(self, settings: dict) -> None:
+        await self.db.run(lambda conn: conn.execute(
+            "INSERT INTO settings (id, version, data) VALUES (?, 1, ?) "
+            "ON CONFLICT (id) DO UPDATE SET data = excluded.data, version = settings.version + 1",
+            (SETTINGS_ID, _dumps(settings))
+        ))
+
+
+# --- Candidates ---
+class SQLiteCandidateRepository(_Repository, CandidateRepository):
+    async def list_all(self) -> List[dict]:
+        def _list(conn):
+            return [json.loads(row["data"]) for row in conn.execute("SELECT data FROM candidates ORDER BY rowid")]
+        return await self.db.run(_list)
+
+    async def find(self, name: str, position_id: str) -> Optional[dict]:
+        def _find(conn):
+            row = conn.execute("SELECT data FROM candidates WHERE position_id = ? AND name = ?", (position_id, name)).fetchone()
+            return json.loads(row["data"]) if row else None
+        return await self.db.run(_find)
+
+    async def insert(self, candidate: dict) -> None:
+        def _insert(conn):
+            try:
+                conn.execute(
+                    "INSERT INTO candidates (position_id, name, data) VALUES (?, ?, ?)",
+                    (candidate["position_id"], candidate["name"], _dumps(candidate))
+                )
+            except sqlite3.IntegrityError:
+                raise DuplicateRecordError(f"Candidate '{candidate['name']}' already exists for '{candidate['position_id']}'.")
+        await self.db.run(_insert)
+
+    async def update(self, name: str, position_id: str, fields: dict) -> bool:
+        def _update(conn):
+            with _transaction(conn):
+                row = conn.execute("SELECT data FROM candidates WHERE position_id = ? AND name = ?", (position_id, name)).fetchone()
+                if not row:
+                    return False
+                conn.execute(
+                    "UPDATE candidates SET data = ? WHERE position_id = ? AND name = ?",
+                    (_dumps({**json.loads(row["data"]), **fields}), position_id, name)
+                )
+                return True
+        return await self.db.run(_update)
+
+    async def delete(self, name: str, position_id: str) -> bool:
+        def _delete(conn):
+            return conn.execute("DELETE FROM candidates WHERE position_id = ? AND name = ?", (position_id, name)).rowcount > 0
+        return await self.db.run(_delete)
+
+    async def delete_all(self) -> int:
+        return await self.db.run(lambda conn: conn.execute("DELETE FROM candidates").rowcount)
+
+
+# --- Students ---
+class SQLiteStudentRepository(_Repository, StudentRepository):
+    async def find_one(self, roll_number: int, stream: str, division: Optional[str], name: Optional[str] = None) -> Optional[dict]:
+        def _find(conn):
+            sql = "SELECT * FROM students WHERE stream = ? AND roll_number = ? AND division IS ?"
+            params = [stream, roll_number, division]
+            if name is not None:
+                sql += " AND name = ?"
+                params.append(name)
+            row = conn.execute(sql + " LIMIT 1", params).fetchone()
+            return _student(row) if row else None
+        return await self.db.run(_find)
+
+    async def existing_keys(self, records: List[dict]) -> Set[Tuple[str, int]]:
+        def _existing(conn):
+            # One indexed point lookup per key; cheap, and free of bound-parameter limits.
+            keys = {(r["stream"], r["roll_number"]) for r in records}
+            return {key for key in keys if conn.execute(
+                "SELECT 1 FROM students WHERE stream = ? AND roll_number = ? LIMIT 1", key
+            ).fetchone()}
+        return await self.db.run(_existing)
+
+    async def insert_many(self, records: List[dict]) -> Tuple[int, int]:
+        def _insert(conn):
+            with _transaction(conn):
+                conn.executemany(
+                    "INSERT INTO students (name, name_lower, roll_number, stream, division) VALUES (?, ?, ?, ?, ?)",
+                    [(r["name"], r.get("name_lower") or r["name"].lower(), r["roll_number"], r["stream"], r.get("division"))
+                     for r in records]
+                )
+            return len(records), 0
+        return await self.db.run(_insert)
+
+    async def list_all(self, limit: int) -> List[dict]:
+        def _list(conn):
+            return [_student(row) for row in conn.execute("SELECT * FROM students ORDER BY id LIMIT ?", (limit,))]
+        return await self.db.run(_list)
+
+    async def page(self, limit: int, cursor: Optional[str] = None, stream: Optional[str] = None,
+                   division: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        clauses, params = _roster_filter(stream, division)
+        if cursor:
+            clauses.append("id > ?")
+            params.append(int(cursor))
+
+        def _page(conn):
+            rows = conn.execute(f"SELECT * FROM students {_where(clauses)} ORDER BY id LIMIT ?", params + [limit]).fetchall()
+            next_cursor = str(rows[-1]["id"]) if len(rows) == limit else None
+            return [_student(row) for row in rows], next_cursor
+        return await self.db.run(_page)
+
+    async def search(self, term: str, limit: int, stream: Optional[str] = None, division: Optional[str] = None) -> List[dict]:
+        base_clauses, base_params = _roster_filter(stream, division)
+        lowered = term.lower()
+        words = [_like_pattern(word) for word in lowered.split()]
+
+        def _search(conn):
+            matches: Dict[int, dict] = {}
+
+            def collect(clause: str, params: list, order: str = "id"):
+                remaining = limit - len(matches)
+                if remaining <= 0:
+                    return
+                sql = f"SELECT * FROM students {_where(base_clauses + [clause])} ORDER BY {order} LIMIT ?"
+                for row in conn.execute(sql, base_params + params + [remaining + len(matches)]):
+                    if len(matches) >= limit:
+                        break
+                    matches.setdefault(row["id"], _student(row))
+
+            if term.isdigit():
+                collect("roll_number = ?", [int(term)])
+            # A range over the lowercased name uses the name_prefix index, unlike LIKE.
+            collect("name_lower >= ? AND name_lower < ?", [lowered, lowered + "\uffff"], order="name_lower")
+            # Whole-word matches anywhere in the name, the nearest thing to Mongo's $text search.
+            if words:
+                collect(
+                    "(" + " OR ".join(["' ' || name_lower || ' ' LIKE ? ESCAPE '\\'"] * len(words)) + ")",
+                    [f"% {word} %" for word in words]
+                )
+            return list(matches.values())
+        return await self.db.run(_search)
+
+    async def iter_batches(self, batch_size: int, stream: Optional[str] = None,
+                           division: Optional[str] = None) -> AsyncIterator[List[dict]]:
+        clauses, params = _roster_filter(stream, division)
+
+        def _batch(conn, after: int):
+            sql = f"SELECT * FROM students {_where(clauses + ['id > ?'])} ORDER BY id LIMIT ?"
+            return conn.execute(sql, params + [after, batch_size]).fetchall()
+
+        after = 0
+        while rows := await self.db.run(_batch, after):
+            after = rows[-1]["id"]
+            yield [_student(row) for row in rows]
+
+    async def count(self) -> int:
+        return await self.db.run(lambda conn: conn.execute("SELECT COUNT(*) FROM students").fetchone()[0])
+
+    async def class_sizes(self) -> Dict[ClassKey, int]:
+        def _sizes(conn):
+            rows = conn.execute("SELECT stream, division, COUNT(*) AS students FROM students GROUP BY stream, division")
+            return {(row["stream"], row["division"]): row["students"] for row in rows}
+        return await self.db.run(_sizes)
+
+    async def delete_all(self) -> int:
+        return await self.db.run(lambda conn: conn.execute("DELETE FROM students").rowcount)
+
+
+# --- Votes and Tallies ---
+_INCREMENT_TALLY = (
+    "INSERT INTO tallies (position_id, candidate, count) VALUES (?, ?, 1) "
+    "ON CONFLICT (position_id, candidate) DO UPDATE SET count = count + 1"
+)
+
+
+class SQLiteVoteRepository(_Repository, VoteRepository):
+    """
+    The student identifier is the primary key of the votes table, so the insert
+    itself is the duplicate check. The ballot's class is stored alongside it so
+    the per-class breakdown is a plain GROUP BY.
+    """
+
+    async def has_voted(self, student_identifier: str) -> bool:
+        def _has_voted(conn):
+            return conn.execute("SELECT 1 FROM votes WHERE student_identifier = ?", (student_identifier,)).fetchone() is not None
+        return await self.db.run(_has_voted)
+
+    async def insert(self, vote: dict) -> None:
+        stream, division = class_of_identifier(vote["student_identifier"])
+
+        def _insert(conn):
+            # The ballot and its counters are committed together, or not at all.
+            with _transaction(conn):
+                try:
+                    conn.execute(
+                        "INSERT INTO votes (student_identifier, selections, idempotency_key, stream, division) VALUES (?, ?, ?, ?, ?)",
+                        (vote["student_identifier"], _dumps(vote["selections"]), vote.get("idempotency_key"), stream, division)
+                    )
+                except sqlite3.IntegrityError:
+                    raise DuplicateRecordError(f"A ballot for '{vote['student_identifier']}' is already stored.")
+                conn.executemany(_INCREMENT_TALLY, list(vote["selections"].items()))
+        await self.db.run(_insert)
+
+    async def finish_tally(self, student_identifier: str) -> Optional[Dict[str, str]]:
+        # insert() counts a ballot in the same transaction that stores it.
+        return None
+
+    async def insert_many(self, votes: List[dict]) -> int:
+        rows = [
+            (v["student_identifier"], _dumps(v["selections"]), v.get("idempotency_key"), *class_of_identifier(v["student_identifier"]))
+            for v in votes
+        ]
+
+        def _insert(conn):
+            with _transaction(conn):
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO votes (student_identifier, selections, idempotency_key, stream, division) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                return conn.total_changes - before
+        return await self.db.run(_insert)
+
+    async def has_ballot_with_key(self, student_identifier: str, idempotency_key: str) -> bool:
+        def _has_key(conn):
+            return conn.execute(
+                "SELECT 1 FROM votes WHERE student_identifier = ? AND idempotency_key = ?", (student_identifier, idempotency_key)
+            ).fetchone() is not None
+        return await self.db.run(_has_key)
+
+    async def count(self) -> int:
+        return await self.db.run(lambda conn: conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0])
+
+    async def iter_batches(self, batch_size: int) -> AsyncIterator[List[dict]]:
+        def _batch(conn, after: int):
+            return conn.execute(
+                "SELECT rowid, student_identifier, selections FROM votes WHERE rowid > ? ORDER BY rowid LIMIT ?", (after, batch_size)
+            ).fetchall()
+
+        after = 0
+        while rows := await self.db.run(_batch, after):
+            after = rows[-1]["rowid"]
+            yield [{"student_identifier": row["student_identifier"], "selections": json.loads(row["selections"])} for row in rows]
+
+    async def aggregate(self, by_class: bool = False) -> Tuple[Counts, int, Optional[dict]]:
+        def _aggregate(conn):
+            # One read transaction, so every count comes from the same snapshot.
+            conn.execute("BEGIN")
+            try:
+                counts: Counts = {}
+                for row in conn.execute(f"SELECT selection.key, selection.value, COUNT(*) {_SELECTION_ROWS} GROUP BY 1, 2"):
+                    counts.setdefault(row[0], {})[row[1]] = row[2]
+                total = conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0]
+                class_rows = None
+                if by_class:
+                    class_rows = {"ballots": {}, "counts": {}}
+                    for row in conn.execute("SELECT stream, division, COUNT(*) FROM votes GROUP BY 1, 2"):
+                        class_rows["ballots"][(row[0], row[1])] = row[2]
+                    for row in conn.execute(
+                        f"SELECT stream, division, selection.key, selection.value, COUNT(*) {_SELECTION_ROWS} GROUP BY 1, 2, 3, 4"
+                    ):
+                        class_rows["counts"].setdefault((row[0], row[1]), {}).setdefault(row[2], {})[row[3]] = row[4]
+            finally:
+                conn.execute("COMMIT")
+            return counts, total, class_rows
+        return await self.db.run(_aggregate)
+
+    async def delete_all(self) -> int:
+        return await self.db.run(lambda conn: conn.execute("DELETE FROM votes").rowcount)
+
+    async def read_tallies(self) -> Counts:
+        def _read(conn):
+            tallies: Counts = {}
+            for row in conn.execute("SELECT position_id, candidate, count FROM tallies"):
+                tallies.setdefault(row["position_id"], {})[row["candidate"]] = row["count"]
+            return tallies
+        return await self.db.run(_read)
+
+    async def rebuild_tallies(self) -> int:
+        def _rebuild(conn):
+            with _transaction(conn):
+                conn.execute("DELETE FROM tallies")
+                return conn.execute(
+                    f"INSERT INTO tallies (position_id, candidate, count) "
+                    f"SELECT selection.key, selection.value, COUNT(*) {_SELECTION_ROWS} GROUP BY 1, 2"
+                ).rowcount
+        return await self.db.run(_rebuild)
+
+    async def clear_tallies(self) -> None:
+        await self.db.run(lambda conn: conn.execute("DELETE FROM tallies"))
+
+
+# --- Audit Logs ---
+def _audit_entry(row: sqlite3.Row) -> dict:
+    return {
+        "_id": row["id"],
+        "timestamp": datetime.datetime.fromisoformat(row["timestamp"]),
+        "actor": row["actor"],
+        "action": row["action"],
+        "details": row["details"],
+    }
+
+
+class SQLiteAuditLogRepository(_Repository, AuditLogRepository):
+    async def insert_many(self, entries: List[dict]) -> None:
+        def _insert(conn):
+            with _transaction(conn):
+                conn.executemany(
+                    "INSERT INTO audit_logs (timestamp, actor, action, details) VALUES (?, ?, ?, ?)",
+                    [(_timestamp(e["timestamp"]), e["actor"], e["action"], e.get("details", "")) for e in entries]
+                )
+        await self.db.run(_insert)
+
+    async def latest(self, limit: int) -> List[dict]:
+        def _latest(conn):
+            rows = conn.execute("SELECT * FROM audit_logs ORDER BY timestamp DESC, id DESC LIMIT ?", (limit,))
+            return [{k: v for k, v in _audit_entry(row).items() if k != "_id"} for row in rows]
+        return await self.db.run(_latest)
+
+    async def page(self, limit, actor=None, action=None, start=None, end=None,
+                   before: Optional[AuditPosition] = None, after_id: Optional[str] = None) -> List[dict]:
+        clauses, params = [], []
+        for column, value in (("actor", actor), ("action", action)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start:
+            clauses.append("timestamp >= ?")
+            params.append(_timestamp(start))
+        if end:
+            clauses.append("timestamp < ?")
+            params.append(_timestamp(end))
+
+        # Writes are serialized, so ids are handed out in commit order.
+        order_by = "timestamp DESC, id DESC"
+        if after_id:
+            clauses.append("id > ?")
+            params.append(int(after_id))
+            order_by = "id ASC"
+        elif before:
+            clauses.append("(timestamp, id) < (?, ?)")
+            params += [_timestamp(before[0]), int(before[1])]
+
+        def _page(conn):
+            sql = f"SELECT * FROM audit_logs {_where(clauses)} ORDER BY {order_by} LIMIT ?"
+            return [_audit_entry(row) for row in conn.execute(sql, params + [limit])]
+        return await self.db.run(_page)
+
+    async def latest_id(self) -> Optional[str]:
+        def _latest_id(conn):
+            row = conn.execute("SELECT MAX(id) FROM audit_logs").fetchone()
+            return str(row[0]) if row[0] is not None else None
+        return await self.db.run(_latest_id)
+
+
+# --- Upload Jobs ---
+class SQLiteUploadJobRepository(_Repository, UploadJobRepository):
+    async def save(self, job: dict) -> None:
+        await self.db.run(lambda conn: conn.execute(
+            "INSERT INTO upload_jobs (job_id, data) VALUES (?, ?) ON CONFLICT (job_id) DO UPDATE SET data = excluded.data",
+            (job["job_id"], _dumps(job))
+        ))
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        def _get(conn):
+            row = conn.execute("SELECT data FROM upload_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return json.loads(row["data"]) if row else None
+        return await self.db.run(_get)
+
+
+def create_repositories(db: SQLiteDatabase) -> Repositories:
+    return Repositories(
+        settings=SQLiteSettingsRepository(db),
+        candidates=SQLiteCandidateRepository(db),
+        students=SQLiteStudentRepository(db),
+        votes=SQLiteVoteRepository(db),
+        audit_logs=SQLiteAuditLogRepository(db),
+        upload_jobs=SQLiteUploadJobRepository(db),
+    )
@@ -1,17 +1,45 @@
 # backend/main.py (Fully Updated and Refactored)
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 import os
 
 # Import the routers we created
-from routers import student, admin
+from routers import student, admin, metrics
+from services.audit_logger import audit_writer
+from services.upload_jobs import shutdown_parse_workers
+from services.live_results import live_results_hub
+from database.engine import init_database, close_database
+from core.static_files import CachedStaticFiles
+from core.config import METRICS_ENABLED
+from core.metrics import MetricsMiddleware, loop_lag_monitor, register_gauge
+from core.profiling import ProfilingMiddleware
+
+
+# --- Application Lifespan ---
+# Background workers are started before the first request is served and
+# flushed/stopped cleanly when the server shuts down.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_database()
+    await audit_writer.start()
+    await live_results_hub.start()
+    if METRICS_ENABLED:
+        await loop_lag_monitor.start()
+    yield
+    await loop_lag_monitor.stop()
+    await live_results_hub.stop()
+    shutdown_parse_workers()
+    await audit_writer.stop()
+    await close_database()
+
 
 # Create the main FastAPI application instance
 app = FastAPI(
     title="E-Voting API",
     description="A flexible and dynamic API for managing school and college elections.",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # --- Include Routers ---
@@ -20,16 +48,31 @@ app.include_router(student.router)
 app.include_router(admin.router)
 
 
+# --- Request Profiling ---
+# Opt-in (PROFILE_REQUESTS, or an admin's X-Profile header); see core/profiling.py.
+app.add_middleware(ProfilingMiddleware)
+
+
+# --- Metrics ---
+# Every request is timed and its database and audit-queue time recorded; the
+# results are served in the Prometheus text format on GET /metrics.
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+    register_gauge("evoting_audit_queue_depth", "Audit entries waiting for the background writer.", lambda: audit_writer.queue_depth)
+
+
 # --- Mount Static Files Directory ---
 # This is crucial. It tells FastAPI that any request starting with "/static"
 # should be served from the "static" directory. This is how candidate photos
-# will be accessible to the browser.
+# will be accessible to the browser. Content-hashed photo variants are served
+# with immutable cache headers; everything else is revalidated via ETag.
 # We create the directory if it doesn't exist to prevent errors on startup.
 static_dir = "static"
 if not os.path.exists(static_dir):
     os.makedirs(static_dir)
 
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+app.mount("/static", CachedStaticFiles(directory=static_dir), name="static")
 
 
 # --- Root Endpoint ---
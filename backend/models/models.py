@@ -39,6 +39,31 @@ class Candidate(BaseModel):
     position_id: str
     gender: Literal["boy", "girl"]
     photo_url: Optional[str] = None
+    # Small variant for lists and the ballot; photo_url holds the larger display variant.
+    thumbnail_url: Optional[str] = None
+
+
+# --- Ballot Bundle Models ---
+# Everything a kiosk needs to draw the voting screen, returned as one payload.
+class BallotCandidate(BaseModel):
+    name: str
+    gender: Literal["boy", "girl"]
+    thumbnail_url: Optional[str] = None
+    # Only filled when inlined images are requested and the thumbnail is small enough.
+    thumbnail_data_uri: Optional[str] = None
+
+class BallotPosition(BaseModel):
+    id: str
+    title: str
+    gender_requirement: Optional[Literal["boy", "girl"]] = None
+    candidates: List[BallotCandidate]
+
+class BallotBundle(BaseModel):
+    # Changes whenever the settings or the candidate list change.
+    version: str
+    college_info: CollegeInfo
+    voting_status: Literal["OPEN", "CLOSED"]
+    positions: List[BallotPosition]
 
 
 # --- Student and Voting Models ---
@@ -48,6 +73,10 @@ class Student(BaseModel):
     stream: str
     division: Optional[str] = None
 
+class StudentPage(BaseModel):
+    students: List[Student]
+    next_cursor: Optional[str] = None
+
 class StudentIdentifierForm(BaseModel):
     name: Optional[str] = None
     roll_number: int
@@ -57,6 +86,9 @@ class StudentIdentifierForm(BaseModel):
 class Vote(BaseModel):
     selections: Dict[str, str]
     student_identifier: str
+    # Set by kiosks that queue ballots locally. Re-sending a ballot with the same
+    # key is acknowledged as a success instead of being rejected as a second vote.
+    idempotency_key: Optional[str] = Field(default=None, max_length=64)
 
 
 # --- General API Models ---
@@ -68,12 +100,33 @@ class BulkUploadResponse(BaseModel):
     duplicates_found: int
     errors: List[str]
 
+class UploadJobStatus(BaseModel):
+    job_id: str
+    filename: str
+    status: Literal["queued", "parsing", "ingesting", "completed", "failed"] = "queued"
+    rows_parsed: int = 0
+    rows_processed: int = 0
+    students_added: int = 0
+    duplicates_found: int = 0
+    errors: List[str] = Field(default_factory=list)
+    created_at: datetime.datetime
+    finished_at: Optional[datetime.datetime] = None
+
 class AuditLog(BaseModel):
     timestamp: datetime.datetime
     actor: str
     action: str
     details: str
 
+class AuditLogPage(BaseModel):
+    logs: List[AuditLog]
+    # Pass as `before` to fetch the next (older) page; None when there is nothing older.
+    next_cursor: Optional[str] = None
+    # Pass as `since` to fetch only entries written after everything seen so far.
+    latest_cursor: Optional[str] = None
+    # True when a `since` request hit the limit and more new entries are waiting.
+    has_more: bool = False
+
 # --- NEW: Specific Request Body Models (THIS WAS MISSING) ---
 # This model is specifically for the update settings endpoint to avoid ambiguity.
 class SettingsUpdateRequest(BaseModel):
@@ -0,0 +1,210 @@
+# backend/perf/benchmarks.py (New File)
+#
+# Micro-benchmarks for the code paths that grow with the size of the college:
+# roster upload (parse + ingest), identify, reading the full roster (page walk and
+# NDJSON stream) and results.
+# Each runs against generated data (perf.datasets) at several scale points and
+# reports wall time and the Python heap peak seen by tracemalloc.
+#
+# Usage (from the backend/ directory):
+#   python -m perf.benchmarks --scales 10000,100000
+#   python -m perf.benchmarks --scales 1000000 --no-memory --save perf/bench_1m.json
+#
+# Data goes to a throwaway copy of the configured store (a "<database>_bench"
+# database on MONGO_URI, or "<SQLITE_PATH>.bench" for SQLite), which is cleared at
+# the start of every scale point and removed at the end; --in-memory uses an
+# in-memory SQLite database instead.
+# tracemalloc slows allocation-heavy code down, so compare timings from runs with
+# the same --no-memory setting only.
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable, List, Optional
+
+from dotenv import load_dotenv
+
+from perf.datasets import DEFAULT_SETTINGS, generate_roster, generate_candidates, generate_ballots, roster_csv_bytes
+
+IDENTIFY_SAMPLES = 1000
+BALLOT_INSERT_BATCH = 10_000
+
+
+def use_benchmark_database(in_memory: bool):
+    """Points the app at a throwaway database. Must run before any app module is imported."""
+    load_dotenv()
+    if in_memory:
+        os.environ["DATABASE_ENGINE"] = "sqlite"
+        os.environ["SQLITE_PATH"] = ":memory:"
+    elif os.getenv("DATABASE_ENGINE", "mongo").lower() == "sqlite":
+        os.environ["SQLITE_PATH"] = os.getenv("SQLITE_PATH", "voting.sqlite3") + ".bench"
+    else:
+        os.environ["MONGO_DB_NAME"] = os.getenv("MONGO_DB_NAME", "voting_system") + "_bench"
+
+
+async def reset_benchmark_database():
+    """Empties every table the benchmarks fill and restores the default settings."""
+    from database.engine import repositories, init_database
+    await init_database()
+    await repositories.students.delete_all()
+    await repositories.candidates.delete_all()
+    await repositories.votes.delete_all()
+    await repositories.votes.clear_tallies()
+    await repositories.settings.save(DEFAULT_SETTINGS.dict())
+
+
+async def drop_benchmark_database():
+    from core.config import DATABASE_ENGINE, SQLITE_PATH
+    from database.engine import close_database
+    if DATABASE_ENGINE == "mongo":
+        from database.connection import client, database
+        await client.drop_database(database.name)
+    await close_database()
+    if DATABASE_ENGINE == "sqlite" and SQLITE_PATH != ":memory:":
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(SQLITE_PATH + suffix):
+                os.remove(SQLITE_PATH + suffix)
+
+
+class Bench:
+    def __init__(self, measure_memory: bool):
+        self.measure_memory = measure_memory
+        self.rows: List[dict] = []
+
+    async def run(self, scale: int, name: str, func: Callable[[], Awaitable], calls: int = 1, **extra) -> Optional[object]:
+        """Times one awaited call (or `calls` calls for per-call latency) and records the heap peak."""
+        if self.measure_memory:
+            tracemalloc.start()
+        durations = []
+        result = error = None
+        try:
+            for _ in range(calls):
+                started = time.perf_counter()
+                result = await func()
+                durations.append(time.perf_counter() - started)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        peak = tracemalloc.get_traced_memory()[1] if self.measure_memory else None
+        if self.measure_memory:
+            tracemalloc.stop()
+
+        row = {"scale": scale, "benchmark": name, "calls": len(durations), "total_s": round(sum(durations), 4), **extra}
+        if calls > 1 and durations:
+            durations.sort()
+            row["p50_ms"] = round(statistics.median(durations) * 1000, 3)
+            row["p95_ms"] = round(durations[int(0.95 * (len(durations) - 1))] * 1000, 3)
+        row["peak_mb"] = round(peak / 2**20, 2) if peak is not None else None
+        if error:
+            row["error"] = error
+        self.rows.append(row)
+        print(format_row(row), flush=True)
+        return result
+
+
+def format_row(row: dict) -> str:
+    latency = f"p50 {row['p50_ms']} ms, p95 {row['p95_ms']} ms" if "p50_ms" in row else ""
+    memory = f"{row['peak_mb']} MB" if row["peak_mb"] is not None else "-"
+    line = f"{row['scale']:>9} {row['benchmark']:<28} {row['total_s']:>10.3f} s {memory:>10}  {latency}"
+    return line + (f"  FAILED {row['error']}" if "error" in row else "")
+
+
+def _expect_rows(name: str, rows: int, scale: int) -> int:
+    # A capped or truncated read would otherwise look like a fast one.
+    if rows != scale:
+        raise RuntimeError(f"{name} returned {rows} students, expected {scale}")
+    return rows
+
+
+async def run_scale(bench: Bench, scale: int, seed: int):
+    # Imported here so the engine is created after use_benchmark_database().
+    from database.engine import repositories
+    from models.models import StudentIdentifierForm
+    from core.config import ROSTER_PAGE_MAX_LIMIT
+    from routers.admin import get_results, get_students_page, stream_students
+    from routers.student import identify_student
+    from services.roster_import import parse_roster, ingest_students
+    from services.settings_cache import SettingsSnapshot, invalidate_settings_snapshot
+    from services.candidate_index import invalidate_candidate_index
+    from services.tally import rebuild_tallies
+
+    await reset_benchmark_database()
+    invalidate_settings_snapshot()
+    invalidate_candidate_index()
+
+    roster = generate_roster(scale, DEFAULT_SETTINGS, seed)
+    candidates = generate_candidates(4, DEFAULT_SETTINGS, seed)
+    csv_bytes = roster_csv_bytes(roster)
+    divisions_by_stream = SettingsSnapshot(1, DEFAULT_SETTINGS).divisions_by_stream
+
+    # bulk_upload_students = parse (in a worker process in production) + ingest.
+    async def parse():
+        return parse_roster(csv_bytes, "roster.csv", divisions_by_stream)
+    parsed = await bench.run(scale, "roster_parse", parse, file_mb=round(len(csv_bytes) / 2**20, 2))
+    records = parsed[0] if parsed else []
+    await bench.run(scale, "roster_ingest", lambda: ingest_students(records))
+
+    sample = roster[:: max(1, scale // IDENTIFY_SAMPLES)][:IDENTIFY_SAMPLES]
+    forms = iter([StudentIdentifierForm(**s) for s in sample])
+    await bench.run(scale, "identify_student", lambda: identify_student(next(forms)), calls=len(sample))
+
+    # The full roster is read the two ways the admin UI can: the keyset page walk and the NDJSON stream.
+    async def walk_roster_pages():
+        rows, cursor = 0, None
+        while True:
+            page = await get_students_page(limit=ROSTER_PAGE_MAX_LIMIT, cursor=cursor, stream=None, division=None)
+            rows += len(page.students)
+            cursor = page.next_cursor
+            if cursor is None:
+                return _expect_rows("roster_page_walk", rows, scale)
+    await bench.run(scale, "roster_page_walk", walk_roster_pages, page_size=ROSTER_PAGE_MAX_LIMIT)
+
+    async def stream_roster():
+        response = await stream_students(stream=None, division=None)
+        rows = 0
+        async for chunk in response.body_iterator:
+            rows += chunk.count("\n")
+        return _expect_rows("roster_stream", rows, scale)
+    await bench.run(scale, "roster_stream", stream_roster)
+
+    for candidate in candidates:
+        await repositories.candidates.insert(candidate)
+    invalidate_candidate_index()
+    ballots = list(generate_ballots(roster, candidates, 0.8, DEFAULT_SETTINGS, seed))
+    for start in range(0, len(ballots), BALLOT_INSERT_BATCH):
+        await repositories.votes.insert_many(ballots[start:start + BALLOT_INSERT_BATCH])
+    await bench.run(scale, "rebuild_tallies", rebuild_tallies, ballots=len(ballots))
+    await bench.run(scale, "get_results", lambda: get_results(breakdown=False), calls=20)
+    await bench.run(scale, "get_results (breakdown)", lambda: get_results(breakdown=True), calls=5)
+
+
+async def _main(args) -> List[dict]:
+    use_benchmark_database(args.in_memory)
+    bench = Bench(measure_memory=not args.no_memory)
+    print(f"{'scale':>9} {'benchmark':<28} {'time':>12} {'peak':>10}")
+    for scale in args.scales:
+        await run_scale(bench, scale, args.seed)
+    await drop_benchmark_database()
+    return bench.rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the roster, identify and results code paths at scale.")
+    parser.add_argument("--scales", type=lambda v: [int(x) for x in v.split(",")], default=[10_000, 100_000],
+                        help="Comma-separated roster sizes, e.g. 10000,100000,1000000.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc for undistorted timings.")
+    parser.add_argument("--in-memory", action="store_true", help="Use an in-memory SQLite database.")
+    parser.add_argument("--save", help="Write all results to this JSON file.")
+    args = parser.parse_args()
+
+    rows = asyncio.run(_main(args))
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"scales": args.scales, "memory": not args.no_memory, "results": rows}, f, indent=2)
+        print(f"Results saved to {args.save}")
+    sys.exit(1 if any("error" in row for row in rows) else 0)
@@ -0,0 +1,142 @@
+# backend/perf/datasets.py (New File)
+#
+# Deterministic synthetic election data shaped like models.models: rosters spread
+# over the streams/divisions of an ElectionSettings, candidate slates that respect
+# each position's gender requirement, and ballot sets. The same seed always gives
+# the same data, so benchmark runs are comparable.
+#
+# Usage (from the backend/ directory):
+#   python -m perf.datasets --students 100000 --out /tmp/election_100k
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+from typing import Dict, Iterator, List, Optional
+
+from models.models import ElectionSettings
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Akash", "Ananya", "Arjun", "Diya", "Farhan", "Isha", "Kabir", "Kavya",
+    "Meera", "Mohit", "Neha", "Nikhil", "Pooja", "Rahul", "Riya", "Rohan", "Sana", "Tanvi",
+    "Vikram", "Zoya", "Yash", "Sneha", "Imran", "Priya", "Aman", "Nisha", "Karan", "Simran",
+]
+LAST_NAMES = [
+    "Ansari", "Bhat", "Chopra", "Desai", "Gupta", "Iyer", "Jain", "Joshi", "Kapoor", "Khan",
+    "Kulkarni", "Mehta", "Nair", "Patel", "Qureshi", "Rao", "Reddy", "Shaikh", "Sharma", "Singh",
+]
+
+# The default settings of a fresh install; benchmarks use these unless told otherwise.
+DEFAULT_SETTINGS = ElectionSettings()
+
+
+def student_identifier(student: dict) -> str:
+    """Same format as routers.student.get_unique_student_identifier."""
+    return f"{student['stream']}-{student['division'] or 'NA'}-{student['roll_number']}"
+
+
+def generate_roster(size: int, settings: ElectionSettings = DEFAULT_SETTINGS, seed: int = 0, roll_offset: int = 0) -> List[dict]:
+    """
+    Builds `size` students spread round-robin over every stream/division of the
+    settings. Roll numbers are sequential within a stream, matching the
+    (stream, roll_number) uniqueness the roster import enforces. Names repeat,
+    as in a real college.
+    """
+    rng = random.Random(seed)
+    classes = [
+        (stream.stream_name, division)
+        for stream in settings.academic_structure
+        for division in (stream.divisions or [None])
+    ]
+    next_roll: Dict[str, int] = {stream.stream_name: roll_offset + 1 for stream in settings.academic_structure}
+    roster = []
+    for i in range(size):
+        cls = classes[i % len(classes)]
+        roster.append({
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "roll_number": next_roll[cls[0]],
+            "stream": cls[0],
+            "division": cls[1],
+        })
+        next_roll[cls[0]] += 1
+    return roster
+
+
+def generate_candidates(per_position: int, settings: ElectionSettings = DEFAULT_SETTINGS, seed: int = 0) -> List[dict]:
+    """Builds `per_position` candidates for every position, honouring gender requirements."""
+    rng = random.Random(seed)
+    candidates = []
+    for position in settings.positions:
+        for i in range(per_position):
+            gender = position.gender_requirement or rng.choice(["boy", "girl"])
+            candidates.append({
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i + 1}",
+                "position_id": position.id,
+                "gender": gender,
+                "photo_url": None,
+                "thumbnail_url": None,
+            })
+    return candidates
+
+
+def generate_ballots(
+    roster: List[dict], candidates: List[dict], turnout: float = 0.8,
+    settings: ElectionSettings = DEFAULT_SETTINGS, seed: int = 0
+) -> Iterator[dict]:
+    """
+    Yields Vote-shaped documents for a `turnout` share of the roster. Choices are
+    skewed so that results have clear leaders instead of near-uniform counts.
+    """
+    rng = random.Random(seed)
+    by_position: Dict[str, List[str]] = {}
+    for cand in candidates:
+        by_position.setdefault(cand["position_id"], []).append(cand["name"])
+    weights = {pos: [1 / (rank + 1) for rank in range(len(names))] for pos, names in by_position.items()}
+    for student in roster:
+        if rng.random() >= turnout:
+            continue
+        yield {
+            "student_identifier": student_identifier(student),
+            "selections": {
+                position.id: rng.choices(by_position[position.id], weights[position.id])[0]
+                for position in settings.positions if position.id in by_position
+            },
+        }
+
+
+def roster_csv_bytes(roster: List[dict]) -> bytes:
+    """The roster as an upload-ready CSV file (the bulk upload's required columns)."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=["name", "roll_number", "stream", "division"])
+    writer.writeheader()
+    writer.writerows({**s, "division": s["division"] or ""} for s in roster)
+    return buffer.getvalue().encode("utf-8")
+
+
+def write_dataset(out_dir: str, students: int, candidates_per_position: int, turnout: float, seed: int,
+                  settings: Optional[ElectionSettings] = None):
+    settings = settings or DEFAULT_SETTINGS
+    os.makedirs(out_dir, exist_ok=True)
+    roster = generate_roster(students, settings, seed)
+    candidates = generate_candidates(candidates_per_position, settings, seed)
+    with open(os.path.join(out_dir, "roster.csv"), "wb") as f:
+        f.write(roster_csv_bytes(roster))
+    with open(os.path.join(out_dir, "candidates.json"), "w", encoding="utf-8") as f:
+        json.dump(candidates, f, indent=2)
+    with open(os.path.join(out_dir, "ballots.jsonl"), "w", encoding="utf-8") as f:
+        for ballot in generate_ballots(roster, candidates, turnout, settings, seed):
+            f.write(json.dumps(ballot) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic election dataset.")
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--candidates", type=int, default=4, help="Candidates per position.")
+    parser.add_argument("--turnout", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="Output directory.")
+    args = parser.parse_args()
+    write_dataset(args.out, args.students, args.candidates, args.turnout, args.seed)
+    print(f"Wrote {args.students} students to {args.out}")
@@ -0,0 +1,330 @@
+# backend/perf/loadtest.py (New File)
+#
+# HTTP load test: virtual kiosks run the real identify -> vote flow while
+# admins keep refreshing the results, then latency percentiles are reported.
+#
+# Usage (from the backend/ directory):
+#   # Against a running server (e.g. uvicorn main:app with a local mongod):
+#   python -m perf.loadtest --url http://127.0.0.1:8000 --kiosks 40 --students 2000 --reset
+#   # Boot the app in-process (uses the configured engine, or in-memory SQLite with --in-memory):
+#   python -m perf.loadtest --boot --in-memory --kiosks 20 --students 500
+#   # Save a baseline, then fail a later run that regresses against it:
+#   python -m perf.loadtest --url ... --reset --save perf/baseline.json
+#   python -m perf.loadtest --url ... --reset --compare perf/baseline.json
+#
+# --reset clears all votes on the target before seeding. Never point it at a live election.
+#
+# The admin password defaults to ADMIN_PASSWORD from the backend configuration
+# (environment or .env); pass --password when the target is configured differently.
+#
+# Single runs on one machine vary by a third or more, so by default a discarded
+# warm-up run is followed by three measured runs (each re-seeded, hence --reset)
+# and the report holds the median of every metric.
+#
+# --in-memory is only good for relative comparisons on one machine. Numbers meant
+# to reflect production should come from the engine and hardware used in production.
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from models.models import ElectionSettings
+from perf.datasets import generate_roster, roster_csv_bytes
+
+# Roll numbers of generated students start here so they do not collide with a real roster.
+ROLL_NUMBER_OFFSET = 1_000_000
+
+
+# --- Measurement ---
+class LatencyRecorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, label: str, request) -> Optional[httpx.Response]:
+        """Awaits one request, recording its latency under label. Returns None on failure."""
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[label] += 1
+            return None
+        self.samples[label].append(time.perf_counter() - started)
+        if response.is_error:
+            self.errors[label] += 1
+            return None
+        return response
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def _median(values: list):
+    # Counts stay whole numbers: with an even number of runs the lower middle run is taken.
+    if all(isinstance(v, int) for v in values):
+        return statistics.median_low(values)
+    return round(statistics.median(values), 2)
+
+
+def median_report(reports: List[dict]) -> dict:
+    """Combines repeated runs into one report holding the median of every metric."""
+    endpoints = {}
+    for label in sorted({label for report in reports for label in report["endpoints"]}):
+        runs = [report["endpoints"][label] for report in reports if label in report["endpoints"]]
+        endpoints[label] = {metric: _median([run[metric] for run in runs]) for metric in runs[0]}
+    meta = dict(reports[-1]["meta"], runs=len(reports), elapsed_s=_median([r["meta"]["elapsed_s"] for r in reports]))
+    return {
+        "meta": meta,
+        "votes_per_second": _median([report["votes_per_second"] for report in reports]),
+        "run_votes_per_second": [report["votes_per_second"] for report in reports],
+        "endpoints": endpoints,
+    }
+
+
+def summarize(recorder: LatencyRecorder, elapsed: float) -> Dict[str, dict]:
+    summary = {}
+    for label in sorted(set(recorder.samples) | set(recorder.errors)):
+        values = sorted(recorder.samples[label])
+        summary[label] = {
+            "count": len(values),
+            "errors": recorder.errors[label],
+            "rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+        }
+    return summary
+
+
+# --- Seeding ---
+async def seed(client: httpx.AsyncClient, password: str, students: int, candidates_per_position: int, reset: bool) -> List[dict]:
+    """Opens voting, makes sure every position has candidates and uploads a generated roster."""
+    auth = {"password": password}
+    if reset:
+        (await client.post("/api/admin/reset-election", json={"request": auth})).raise_for_status()
+
+    settings = (await client.get("/api/settings")).json()
+    settings["voting_status"] = "OPEN"
+    (await client.post("/api/admin/settings", json={"settings": settings, "request": auth})).raise_for_status()
+
+    for position in settings["positions"]:
+        gender = position.get("gender_requirement") or "boy"
+        for i in range(candidates_per_position):
+            candidate = {"name": f"Load Candidate {i + 1}", "position_id": position["id"], "gender": gender}
+            # 400 means the candidate already exists from an earlier run.
+            response = await client.post("/api/admin/candidate", json={"candidate": candidate, "request": auth})
+            if response.status_code not in (200, 400):
+                response.raise_for_status()
+
+    roster = generate_roster(students, ElectionSettings(**settings), roll_offset=ROLL_NUMBER_OFFSET)
+    response = await client.post(
+        "/api/admin/student/bulk-upload",
+        data=auth,
+        files={"file": ("loadtest_roster.csv", roster_csv_bytes(roster), "text/csv")},
+        timeout=300,
+    )
+    response.raise_for_status()
+    return roster
+
+
+# --- Virtual Users ---
+async def kiosk(client, recorder, queue: asyncio.Queue, rng: random.Random, think_time: float, deadline: float):
+    """One voting terminal: loads the ballot, identifies the next student and votes."""
+    while time.monotonic() < deadline:
+        try:
+            student = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        ballot = await recorder.call("GET /api/ballot", client.get("/api/ballot"))
+        identified = await recorder.call("POST /api/student/identify", client.post("/api/student/identify", json=student))
+        if ballot is None or identified is None:
+            continue
+        selections = {
+            position["id"]: rng.choice(position["candidates"])["name"]
+            for position in ballot.json()["positions"] if position["candidates"]
+        }
+        if think_time:
+            await asyncio.sleep(rng.uniform(0, 2 * think_time))
+        vote = {"selections": selections, "student_identifier": identified.json()["student_identifier"]}
+        await recorder.call("POST /api/vote", client.post("/api/vote", json=vote))
+
+
+async def admin(client, recorder, password: str, interval: float, stop: asyncio.Event):
+    """An admin dashboard polling the results."""
+    while not stop.is_set():
+        await recorder.call("POST /api/admin/results", client.post("/api/admin/results", json={"request": {"password": password}}))
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load(args) -> dict:
+    limits = httpx.Limits(max_connections=args.kiosks + args.admins, max_keepalive_connections=args.kiosks + args.admins)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        roster = await seed(client, args.password, args.students, args.candidates, args.reset)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for student in roster:
+            queue.put_nowait(student)
+
+        recorder = LatencyRecorder()
+        stop = asyncio.Event()
+        deadline = time.monotonic() + args.duration
+        started = time.perf_counter()
+        admins = [asyncio.create_task(admin(client, recorder, args.password, args.admin_interval, stop)) for _ in range(args.admins)]
+        await asyncio.gather(*(
+            kiosk(client, recorder, queue, random.Random(args.seed + i), args.think_time, deadline)
+            for i in range(args.kiosks)
+        ))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*admins)
+
+    endpoints = summarize(recorder, elapsed)
+    votes = endpoints.get("POST /api/vote", {}).get("count", 0)
+    return {
+        "meta": {
+            "started_at": datetime.datetime.utcnow().isoformat(),
+            "url": args.url,
+            "kiosks": args.kiosks,
+            "admins": args.admins,
+            "students": args.students,
+            "think_time": args.think_time,
+            "elapsed_s": round(elapsed, 2),
+        },
+        "votes_per_second": round(votes / elapsed, 2) if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+# --- Reporting ---
+def print_report(report: dict):
+    meta = report["meta"]
+    print(f"\n{meta['kiosks']} kiosks, {meta['admins']} admins, {meta['students']} students, {meta['elapsed_s']} s"
+          f" (median of {meta['runs']} runs)")
+    print(f"{'endpoint':<28}{'count':>8}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, s in report["endpoints"].items():
+        print(f"{label:<28}{s['count']:>8}{s['errors']:>8}{s['rps']:>9}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}")
+    print(f"Votes per second: {report['votes_per_second']} (runs: {report['run_votes_per_second']})")
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Returns a description of every metric that is worse than the baseline by more than tolerance."""
+    regressions = []
+    for label, base in baseline["endpoints"].items():
+        current = report["endpoints"].get(label)
+        if current is None:
+            regressions.append(f"{label}: no requests in this run")
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if base[metric] and current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{label}: {metric} {current[metric]} > baseline {base[metric]}")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{label}: {current['errors']} errors (baseline {base['errors']})")
+    base_vps = baseline.get("votes_per_second", 0)
+    if base_vps and report["votes_per_second"] < base_vps * (1 - tolerance):
+        regressions.append(f"votes_per_second {report['votes_per_second']} < baseline {base_vps}")
+    return regressions
+
+
+# --- In-Process Server ---
+def boot_server(port: int, in_memory: bool) -> str:
+    """Starts the app with uvicorn in a background thread and returns its base URL."""
+    if in_memory:
+        # The engine is chosen when the app is imported, so this must happen first.
+        os.environ["DATABASE_ENGINE"] = "sqlite"
+        os.environ["SQLITE_PATH"] = ":memory:"
+
+    import uvicorn
+    from main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the voting API with simulated kiosks and admins.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of a running server.")
+    parser.add_argument("--boot", action="store_true", help="Start the app in this process instead of using --url.")
+    parser.add_argument("--in-memory", action="store_true", help="With --boot, use an in-memory SQLite database.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--kiosks", type=int, default=20)
+    parser.add_argument("--admins", type=int, default=2)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--candidates", type=int, default=3, help="Candidates per position.")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean seconds a student spends on the ballot.")
+    parser.add_argument("--admin-interval", type=float, default=2.0, help="Seconds between results refreshes.")
+    parser.add_argument("--duration", type=float, default=2400, help="Stop after this many seconds.")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reset", action="store_true", help="Reset the election on the target before seeding.")
+    parser.add_argument("--save", help="Write the report to this JSON file.")
+    parser.add_argument("--compare", help="Fail if this run regresses against a saved JSON report.")
+    parser.add_argument("--password", help="Admin password of the target (default: ADMIN_PASSWORD from the backend config).")
+    parser.add_argument("--runs", type=int, default=3, help="Measured runs; the report holds the median of each metric.")
+    parser.add_argument("--warmup", type=int, default=1, help="Runs made first and discarded (cold caches, JIT, connection setup).")
+    parser.add_argument("--tolerance", type=float, default=0.4, help="Allowed relative regression of the medians (0.4 = 40%%).")
+    args = parser.parse_args()
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+    if args.runs + args.warmup > 1 and not args.reset:
+        # Every run votes with the whole roster, so later runs need the earlier votes cleared.
+        parser.error("repeated runs need --reset (or use --runs 1 --warmup 0)")
+
+    if args.boot:
+        args.url = boot_server(args.port, args.in_memory)
+    if args.password is None:
+        # Imported only now: with --boot --in-memory the engine settings must be in place first.
+        from core.config import ADMIN_PASSWORD
+        args.password = ADMIN_PASSWORD
+
+    for run in range(args.warmup):
+        print(f"Warm-up run {run + 1}/{args.warmup}...")
+        asyncio.run(run_load(args))
+    reports = []
+    for run in range(args.runs):
+        print(f"Measured run {run + 1}/{args.runs}...")
+        reports.append(asyncio.run(run_load(args)))
+    report = median_report(reports)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
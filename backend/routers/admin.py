@@ -1,31 +1,33 @@
 # backend/routers/admin.py (Fully Updated, Complete, and Corrected)
 
-from fastapi import APIRouter, HTTPException, Body, Depends, UploadFile, File
-from fastapi.responses import FileResponse
-from typing import List, Dict
-import pandas as pd
-import os
-import csv
-import io
+from fastapi import APIRouter, HTTPException, Body, Depends, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, FileResponse
+from typing import List, Literal, Optional
+import json
+import datetime
 
 # Import models, db collections, and helper functions
 from models.models import (
     ElectionSettings, Candidate, Student, AdminRequest, BulkUploadResponse, 
-    AuditLog, SettingsUpdateRequest
+    AuditLog, AuditLogPage, SettingsUpdateRequest, UploadJobStatus, StudentPage
 )
-from database.connection import (
-    settings_collection,
-    candidate_collection,
-    student_collection,
-    vote_collection,
-    voted_student_collection,
-    audit_log_collection
-)
-from services.image_uploader import save_upload_file, get_file_url
+from database.engine import repositories
+from database.repository import DuplicateRecordError
+from services.image_uploader import store_candidate_photo
 from services.audit_logger import log_activity
+from services.settings_cache import get_settings_snapshot, invalidate_settings_snapshot
+from services.candidate_index import invalidate_candidate_index
+from services.tally import rebuild_tallies, clear_tallies
+from services.results_engine import compute_results
+from services.live_results import live_results_hub
+from services.results_export import EXPORT_FORMATS, results_as_csv, results_as_xlsx, results_as_parquet, raw_ballots_as_csv
+from services.roster_import import RosterFileError, ingest_students, cap_errors
+from services.upload_jobs import parse_roster_off_loop, start_upload_job, get_upload_job
+from core.config import ROSTER_PAGE_MAX_LIMIT, ROSTER_STREAM_BATCH_SIZE, ADMIN_PASSWORD
+from core.profiling import list_profiles, get_profile, profile_file_path
 
 router = APIRouter()
-ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "teacher123")
 
 # --- Standardized Dependency for Password Checking ---
 async def verify_admin_password(request: AdminRequest = Body(...)):
@@ -41,11 +43,9 @@ async def update_election_settings(payload: SettingsUpdateRequest):
         raise HTTPException(status_code=401, detail="Incorrect admin password.")
     
     settings_data = payload.settings
-    await settings_collection.update_one(
-        {"_id": "global_settings"},
-        {"$set": settings_data.dict()},
-        upsert=True
-    )
+    # Bumping the version tells every worker's settings snapshot to recompile.
+    await repositories.settings.save(settings_data.dict())
+    invalidate_settings_snapshot()
     await log_activity("Admin", "Updated Election Settings")
     return {"message": "Settings updated successfully."}
 
@@ -54,9 +54,12 @@ async def update_election_settings(payload: SettingsUpdateRequest):
 async def add_candidate(candidate: Candidate, request: AdminRequest = Body(...)):
     if request.password != ADMIN_PASSWORD:
         raise HTTPException(status_code=401, detail="Incorrect admin password.")
-    if await candidate_collection.find_one({"name": candidate.name, "position_id": candidate.position_id}):
+    try:
+        # The unique (position_id, name) key makes the insert itself the duplicate check.
+        await repositories.candidates.insert(candidate.dict())
+    except DuplicateRecordError:
         raise HTTPException(status_code=400, detail="A candidate with this name already exists for this position.")
-    await candidate_collection.insert_one(candidate.dict())
+    invalidate_candidate_index()
     await log_activity("Admin", "Added Candidate", f"Name: {candidate.name}, Position ID: {candidate.position_id}")
     return candidate
 
@@ -69,20 +72,20 @@ async def upload_candidate_photo(
 ):
     if password != ADMIN_PASSWORD:
         raise HTTPException(status_code=401, detail="Incorrect admin password.")
-    candidate = await candidate_collection.find_one({"name": name, "position_id": position_id})
-    if not candidate:
+    if not await repositories.candidates.find(name, position_id):
         raise HTTPException(status_code=404, detail="Candidate not found.")
-    file_path = save_upload_file(file, "candidate_photos")
-    photo_url = get_file_url(file_path)
-    await candidate_collection.update_one({"_id": candidate["_id"]}, {"$set": {"photo_url": photo_url}})
+    urls = await store_candidate_photo(file)
+    photo_urls = {"photo_url": urls["display"], "thumbnail_url": urls["thumb"]}
+    await repositories.candidates.update(name, position_id, photo_urls)
+    invalidate_candidate_index()
     await log_activity("Admin", "Uploaded Photo", f"For candidate: {name}")
-    return {"message": "Photo uploaded successfully.", "photo_url": photo_url}
+    return {"message": "Photo uploaded successfully.", **photo_urls}
 
 @router.post("/api/admin/candidate/delete", dependencies=[Depends(verify_admin_password)])
 async def delete_candidate(candidate: Candidate):
-    result = await candidate_collection.delete_one({"name": candidate.name, "position_id": candidate.position_id})
-    if result.deleted_count == 0:
+    if not await repositories.candidates.delete(candidate.name, candidate.position_id):
         raise HTTPException(status_code=404, detail="Candidate not found.")
+    invalidate_candidate_index()
     await log_activity("Admin", "Deleted Candidate", f"Name: {candidate.name}")
     return {"message": "Candidate deleted successfully."}
 
@@ -94,95 +97,232 @@ async def bulk_upload_students(
 ):
     if password != ADMIN_PASSWORD:
         raise HTTPException(status_code=401, detail="Incorrect admin password.")
-    students_to_add = []
-    duplicates_found = 0
-    errors = []
+    snapshot = await get_settings_snapshot()
     try:
         content = await file.read()
-        df = pd.read_csv(io.StringIO(content.decode('utf-8'))) if file.filename.endswith('.csv') else pd.read_excel(io.BytesIO(content))
-        df.columns = [col.strip().lower() for col in df.columns]
-        required_columns = ["name", "roll_number", "stream", "division"]
-        if not all(col in df.columns for col in required_columns):
-            raise HTTPException(status_code=400, detail=f"File must contain columns: {', '.join(required_columns)}")
-        for index, row in df.iterrows():
-            student_data = {"name": str(row["name"]).strip(), "roll_number": int(row["roll_number"]), "stream": str(row["stream"]).strip(), "division": str(row["division"]).strip() if pd.notna(row["division"]) and str(row["division"]).strip() else None}
-            if not await student_collection.find_one({"roll_number": student_data["roll_number"], "stream": student_data["stream"]}):
-                students_to_add.append(Student(**student_data).dict())
-            else:
-                duplicates_found += 1
-    except Exception as e:
-        errors.append(f"Error processing file: {e}")
-        return BulkUploadResponse(students_added=0, duplicates_found=0, errors=errors)
-    if students_to_add:
-        await student_collection.insert_many(students_to_add)
-        await log_activity("Admin", "Bulk Upload", f"Added {len(students_to_add)} new students.")
-    return BulkUploadResponse(students_added=len(students_to_add), duplicates_found=duplicates_found, errors=[])
-
-@router.post("/api/admin/students", response_model=List[Student], dependencies=[Depends(verify_admin_password)])
+        records, errors, duplicates_in_file = await parse_roster_off_loop(content, file.filename, snapshot.divisions_by_stream)
+    except RosterFileError as e:
+        return BulkUploadResponse(students_added=0, duplicates_found=0, errors=[str(e)])
+    students_added, duplicates_found = await ingest_students(records)
+    if students_added:
+        await log_activity("Admin", "Bulk Upload", f"Added {students_added} new students.")
+    return BulkUploadResponse(
+        students_added=students_added,
+        duplicates_found=duplicates_found + duplicates_in_file,
+        errors=cap_errors(errors)
+    )
+
+@router.post("/api/admin/student/bulk-upload/jobs", response_model=UploadJobStatus)
+async def create_bulk_upload_job(
+    password: str = Body(...),
+    file: UploadFile = File(...)
+):
+    """Starts a background roster import and returns immediately with the job to poll."""
+    if password != ADMIN_PASSWORD:
+        raise HTTPException(status_code=401, detail="Incorrect admin password.")
+    snapshot = await get_settings_snapshot()
+    return await start_upload_job(file, snapshot.divisions_by_stream)
+
+@router.post("/api/admin/student/bulk-upload/jobs/{job_id}", response_model=UploadJobStatus, dependencies=[Depends(verify_admin_password)])
+async def get_bulk_upload_job(job_id: str):
+    """Reports the progress of a background roster import."""
+    job = await get_upload_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Upload job not found.")
+    return job
+
+@router.post("/api/admin/students", response_model=List[Student], dependencies=[Depends(verify_admin_password)], deprecated=True)
 async def get_all_students():
-    """Fetches the complete student roster."""
-    students_cursor = student_collection.find({}, {"_id": 0})
-    return [Student(**doc) for doc in await students_cursor.to_list(10000)]
+    """Fetches the complete student roster (capped at 10,000; use /api/admin/students/page or /stream instead)."""
+    return [Student(**doc) for doc in await repositories.students.list_all(10000)]
+
+@router.post("/api/admin/students/page", response_model=StudentPage, dependencies=[Depends(verify_admin_password)])
+async def get_students_page(
+    limit: int = Query(100, ge=1, le=ROSTER_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    stream: Optional[str] = None,
+    division: Optional[str] = None
+):
+    """Returns one page of the roster in insertion order; pass next_cursor back to get the next page."""
+    try:
+        docs, next_cursor = await repositories.students.page(limit, cursor, stream, division)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return StudentPage(students=[Student(**doc) for doc in docs], next_cursor=next_cursor)
+
+@router.post("/api/admin/students/search", response_model=List[Student], dependencies=[Depends(verify_admin_password)])
+async def search_students(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    stream: Optional[str] = None,
+    division: Optional[str] = None
+):
+    """
+    Returns the top matches for a search term: an exact roll number match for
+    numeric terms, then names starting with the term, then whole-word text matches.
+    """
+    matches = await repositories.students.search(q.strip(), limit, stream, division)
+    return [Student(**doc) for doc in matches]
+
+@router.post("/api/admin/students/stream", dependencies=[Depends(verify_admin_password)])
+async def stream_students(stream: Optional[str] = None, division: Optional[str] = None):
+    """Streams the whole (optionally filtered) roster as NDJSON, one student per line."""
+    async def generate_lines():
+        async for batch in repositories.students.iter_batches(ROSTER_STREAM_BATCH_SIZE, stream, division):
+            yield "\n".join(json.dumps(doc) for doc in batch) + "\n"
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
     
 # === Results, Stats, and Danger Zone Endpoints ===
 @router.post("/api/admin/results", dependencies=[Depends(verify_admin_password)])
-async def get_results():
-    """Fetches comprehensive election results and stats."""
-    settings = await settings_collection.find_one({"_id": "global_settings"}) or {}
-    positions = settings.get("positions", [])
-    total_students = await student_collection.count_documents({})
-    total_votes_cast = await vote_collection.count_documents({})
-    results = {}
-    for pos in positions:
-        pos_id, pos_title = pos["id"], pos["title"]
-        candidates = await candidate_collection.find({"position_id": pos_id}).to_list(100)
-        vote_counts = {cand["name"]: 0 for cand in candidates}
-        async for vote in vote_collection.find({f"selections.{pos_id}": {"$exists": True}}):
-            selection = vote["selections"].get(pos_id)
-            if selection in vote_counts: vote_counts[selection] += 1
-        winner = "N/A"
-        if any(vote_counts.values()) and (max_votes := max(vote_counts.values())) > 0:
-            tied_winners = [name for name, count in vote_counts.items() if count == max_votes]
-            winner = " & ".join(tied_winners) + (" (TIE!)" if len(tied_winners) > 1 else "")
-        results[pos_id] = {"position_title": pos_title, "vote_counts": vote_counts, "winner": winner}
-    return {"voter_turnout": {"total_students": total_students, "total_votes_cast": total_votes_cast}, "results": results}
+async def get_results(breakdown: bool = False):
+    """Fetches comprehensive election results and stats, optionally with per-class turnout."""
+    return await compute_results(breakdown=breakdown)
+
+@router.post("/api/admin/results/live", dependencies=[Depends(verify_admin_password)])
+async def stream_live_results():
+    """
+    Server-Sent Events stream for dashboards: a full "snapshot" event first, then
+    coalesced "delta" events (votes cast and per-candidate increments) as ballots
+    are committed, and a "resync" event when results must be reloaded.
+    """
+    queue = live_results_hub.subscribe()
+    try:
+        snapshot, version = await live_results_hub.read_snapshot(compute_results)
+    except BaseException:
+        live_results_hub.unsubscribe(queue)
+        raise
+    return StreamingResponse(
+        live_results_hub.events(queue, snapshot, version),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/api/admin/results/rebuild-tallies", dependencies=[Depends(verify_admin_password)])
+async def rebuild_result_tallies():
+    """Recomputes the result counters from the raw votes (recovery after manual data edits)."""
+    snapshot = await get_settings_snapshot()
+    if snapshot.settings.voting_status == "OPEN":
+        raise HTTPException(status_code=409, detail="Close voting before rebuilding the result counters.")
+    counters = await rebuild_tallies()
+    live_results_hub.request_resync()
+    await log_activity("Admin", "Rebuilt Result Counters", f"Rebuilt {counters} counters from raw votes.")
+    return {"message": "Result counters rebuilt successfully.", "counters": counters}
 
 @router.post("/api/admin/results/export", dependencies=[Depends(verify_admin_password)])
-async def export_results_as_csv():
-    """Exports the final results to a CSV file."""
+async def export_results(file_format: Literal["csv", "xlsx", "parquet"] = Query("csv", alias="format")):
+    """Exports the final results as CSV, XLSX or Parquet, built in memory and streamed back."""
     data = await get_results()
-    filepath = "election_results.csv"
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Election Results Export"]); writer.writerow([])
-        writer.writerow(["Voter Turnout"]); writer.writerow(["Total Students", data["voter_turnout"]["total_students"]]); writer.writerow(["Votes Cast", data["voter_turnout"]["total_votes_cast"]]); writer.writerow([])
-        for _, pos_data in data["results"].items():
-            writer.writerow([f"Position: {pos_data['position_title']}"]); writer.writerow(["Candidate", "Votes"])
-            for name, count in pos_data["vote_counts"].items(): writer.writerow([name, count])
-            writer.writerow(["Winner(s)", pos_data["winner"]]); writer.writerow([])
-    return FileResponse(path=filepath, media_type='text/csv', filename=filepath)
+    media_type, extension = EXPORT_FORMATS[file_format]
+    headers = {"Content-Disposition": f'attachment; filename="election_results.{extension}"'}
+    if file_format == "csv":
+        return StreamingResponse(results_as_csv(data), media_type=media_type, headers=headers)
+    build = results_as_xlsx if file_format == "xlsx" else results_as_parquet
+    content = await run_in_threadpool(build, data)
+    return StreamingResponse(iter([content]), media_type=media_type, headers=headers)
+
+@router.post("/api/admin/votes/export", dependencies=[Depends(verify_admin_password)])
+async def export_raw_ballots():
+    """Streams every stored ballot as CSV for auditing, reading the votes in batches."""
+    snapshot = await get_settings_snapshot()
+    position_ids = [pos.id for pos in snapshot.settings.positions]
+    await log_activity("Admin", "Exported Raw Ballots")
+    headers = {"Content-Disposition": 'attachment; filename="raw_ballots.csv"'}
+    return StreamingResponse(raw_ballots_as_csv(position_ids), media_type="text/csv", headers=headers)
 
 @router.post("/api/admin/reset-election", dependencies=[Depends(verify_admin_password)])
 async def reset_election():
-    await vote_collection.delete_many({})
-    await voted_student_collection.delete_many({})
+    await repositories.votes.delete_all()
+    await clear_tallies()
+    live_results_hub.request_resync()
     await log_activity("Admin", "Election Reset", "All votes have been cleared.")
     return {"message": "Election has been reset successfully."}
 
 @router.post("/api/admin/clear-students", dependencies=[Depends(verify_admin_password)])
 async def clear_students():
-    result = await student_collection.delete_many({})
-    await log_activity("Admin", "Cleared Student Roster", f"Deleted {result.deleted_count} students.")
+    deleted = await repositories.students.delete_all()
+    await log_activity("Admin", "Cleared Student Roster", f"Deleted {deleted} students.")
     return {"message": "The entire student roster has been cleared."}
 
 @router.post("/api/admin/clear-candidates", dependencies=[Depends(verify_admin_password)])
 async def clear_candidates():
-    result = await candidate_collection.delete_many({})
-    await log_activity("Admin", "Cleared Candidate List", f"Deleted {result.deleted_count} candidates.")
+    deleted = await repositories.candidates.delete_all()
+    invalidate_candidate_index()
+    await log_activity("Admin", "Cleared Candidate List", f"Deleted {deleted} candidates.")
     return {"message": "The entire candidate list has been cleared."}
 
 @router.post("/api/admin/audit-logs", response_model=List[AuditLog], dependencies=[Depends(verify_admin_password)])
 async def get_audit_logs():
     """Fetches all activity logs from the database, newest first."""
-    logs_cursor = audit_log_collection.find({}, {"_id": 0}).sort("timestamp", -1).limit(200)
-    return [AuditLog(**log) for log in await logs_cursor.to_list(200)]
\ No newline at end of file
+    return [AuditLog(**log) for log in await repositories.audit_logs.latest(200)]
+
+def _audit_cursor(log: dict) -> str:
+    return f"{log['timestamp'].isoformat()}_{log['_id']}"
+
+def _parse_audit_cursor(cursor: str):
+    timestamp, _, log_id = cursor.rpartition("_")
+    try:
+        return datetime.datetime.fromisoformat(timestamp), log_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+@router.post("/api/admin/audit-logs/page", response_model=AuditLogPage, dependencies=[Depends(verify_admin_password)])
+async def get_audit_log_page(
+    limit: int = Query(100, ge=1, le=1000),
+    before: Optional[str] = None,
+    since: Optional[str] = None,
+    actor: Optional[str] = None,
+    action: Optional[str] = None,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None
+):
+    """
+    Keyset-paginated audit log, newest first, ordered by (timestamp, _id).
+    Use `before` to page back through older entries, or `since` to fetch only
+    the entries written after the last one the caller has seen. `since` follows
+    the order entries were written in, not their timestamps, so entries stored
+    late with an earlier timestamp are still delivered.
+    """
+    filters = {"actor": actor, "action": action, "start": start, "end": end}
+    try:
+        if since:
+            # In write order so that a limited batch never skips entries; flipped before returning.
+            # Cursors issued before `since` followed the write order were "<timestamp>_<id>".
+            since = since.rpartition("_")[2]
+            logs = await repositories.audit_logs.page(limit + 1, after_id=since, **filters)
+            has_more = len(logs) > limit
+            logs = logs[:limit]
+            latest_cursor = str(logs[-1]["_id"]) if logs else since
+            return AuditLogPage(logs=[AuditLog(**log) for log in logs[::-1]], latest_cursor=latest_cursor, has_more=has_more)
+
+        # Read before the page, so an entry written meanwhile is returned again rather than missed.
+        latest_id = None if before else await repositories.audit_logs.latest_id()
+        logs = await repositories.audit_logs.page(limit, before=_parse_audit_cursor(before) if before else None, **filters)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return AuditLogPage(
+        logs=[AuditLog(**log) for log in logs],
+        next_cursor=_audit_cursor(logs[-1]) if len(logs) == limit else None,
+        latest_cursor=latest_id
+    )
+
+# === Request Profiling Endpoints ===
+@router.post("/api/admin/profiles", dependencies=[Depends(verify_admin_password)])
+async def get_request_profiles(limit: int = Query(50, ge=1, le=500)):
+    """Lists the newest request profiles (duration, DB time, files), newest first."""
+    return await run_in_threadpool(list_profiles, limit)
+
+@router.post("/api/admin/profiles/{profile_id}", dependencies=[Depends(verify_admin_password)])
+async def get_request_profile(profile_id: str):
+    """Returns one profile's summary: top functions or call tree, and every DB call the request made."""
+    summary = await run_in_threadpool(get_profile, profile_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return summary
+
+@router.post("/api/admin/profiles/{profile_id}/files/{file_name}", dependencies=[Depends(verify_admin_password)])
+async def download_request_profile(profile_id: str, file_name: str):
+    """Downloads a profile file (.prof for snakeviz/pstats, or pyinstrument's HTML and speedscope output)."""
+    path = await run_in_threadpool(profile_file_path, profile_id, file_name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile file not found.")
+    return FileResponse(path, filename=file_name)
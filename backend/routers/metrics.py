@@ -0,0 +1,21 @@
+# backend/routers/metrics.py (New File)
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+
+from core.config import METRICS_TOKEN
+from core.metrics import render_metrics
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# === Metrics Endpoint ===
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    """Request, database and event-loop metrics of this worker in the Prometheus text format."""
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token.")
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
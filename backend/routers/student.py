@@ -1,22 +1,23 @@
 # backend/routers/student.py (Fully Updated with Logging)
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 
 # Import our models and database collections
-from models.models import StudentIdentifierForm, Vote, ElectionSettings, Candidate
-from database.connection import (
-    settings_collection, 
-    student_collection, 
-    voted_student_collection, 
-    candidate_collection,
-    vote_collection
-)
+from models.models import StudentIdentifierForm, Vote, ElectionSettings, Candidate, BallotBundle
+from database.engine import repositories
 # NEW: Import the logger service
 from services.audit_logger import log_activity
+from services.settings_cache import get_settings_snapshot
+from services.candidate_index import get_candidate_index
+from services.vote_recorder import has_voted, commit_vote, is_replay
+from services.ballot_bundle import get_ballot_bundle
+from core.http_cache import conditional_json_response
 
 router = APIRouter()
 
+VOTE_RECORDED_MESSAGE = "✅ Your vote has been successfully recorded."
+
 # --- Helper Function ---
 def get_unique_student_identifier(student: StudentIdentifierForm) -> str:
     division_str = student.division if student.division else "NA"
@@ -25,43 +26,38 @@ def get_unique_student_identifier(student: StudentIdentifierForm) -> str:
 # --- Student-Facing API Endpoints ---
 
 @router.get("/api/settings", response_model=ElectionSettings)
-async def get_public_election_settings():
-    settings = await settings_collection.find_one({"_id": "global_settings"})
-    if not settings:
-        default_settings = ElectionSettings()
-        await settings_collection.insert_one({"_id": "global_settings", **default_settings.dict()})
-        await log_activity("System", "Initialized Default Settings", "First run detected.")
-        return default_settings
-    return ElectionSettings(**settings)
+async def get_public_election_settings(request: Request):
+    snapshot = await get_settings_snapshot()
+    return conditional_json_response(request, snapshot.etag, snapshot.body)
 
 
 @router.post("/api/student/identify")
 async def identify_student(student_form: StudentIdentifierForm):
-    settings = await get_public_election_settings()
+    snapshot = await get_settings_snapshot()
+    settings = snapshot.settings
     
-    query = {"roll_number": student_form.roll_number, "stream": student_form.stream}
-    stream_structure = next((s for s in settings.academic_structure if s.stream_name == student_form.stream), None)
-    if not stream_structure:
+    division = None
+    name = None
+    divisions = snapshot.divisions_by_stream.get(student_form.stream)
+    if divisions is None:
         raise HTTPException(status_code=400, detail="Invalid stream selected.")
     
-    if stream_structure.divisions:
-        if not student_form.division or student_form.division not in stream_structure.divisions:
+    if divisions:
+        if not student_form.division or student_form.division not in divisions:
             raise HTTPException(status_code=400, detail=f"Invalid division for {student_form.stream} stream.")
-        query["division"] = student_form.division
-    else:
-        query["division"] = None
+        division = student_form.division
 
     if settings.identification_mode == "name_and_id":
         if not student_form.name:
             raise HTTPException(status_code=400, detail="Name is required for identification.")
-        query["name"] = student_form.name
+        name = student_form.name
 
-    db_student = await student_collection.find_one(query)
+    db_student = await repositories.students.find_one(student_form.roll_number, student_form.stream, division, name)
     if not db_student:
         raise HTTPException(status_code=404, detail="Student not found. Please check all details.")
 
     unique_id = get_unique_student_identifier(student_form)
-    if await voted_student_collection.find_one({"student_identifier": unique_id}):
+    if await has_voted(unique_id):
         raise HTTPException(status_code=403, detail="This student has already voted.")
 
     return {
@@ -72,37 +68,49 @@ async def identify_student(student_form: StudentIdentifierForm):
 
 
 @router.get("/api/candidates", response_model=List[Candidate])
-async def get_candidates():
-    candidates_cursor = candidate_collection.find({}, {"_id": 0})
-    return [Candidate(**doc) for doc in await candidates_cursor.to_list(1000)]
+async def get_candidates(request: Request):
+    # Served from the in-memory candidate index instead of querying on every call.
+    candidate_index = await get_candidate_index()
+    return conditional_json_response(request, candidate_index.etag, candidate_index.body)
+
+
+@router.get("/api/ballot", response_model=BallotBundle)
+async def get_ballot(request: Request, inline_images: bool = False):
+    """
+    Everything the voting screen needs in one cacheable payload: positions in
+    order with their candidates and thumbnails, college info and voting status.
+    With inline_images=true, small thumbnails are embedded as data URIs so the
+    kiosk needs no further requests to draw the ballot.
+    """
+    snapshot = await get_settings_snapshot()
+    candidate_index = await get_candidate_index()
+    etag, body = await get_ballot_bundle(snapshot, candidate_index, inline_images)
+    return conditional_json_response(request, etag, body)
 
 
 @router.post("/api/vote")
 async def submit_vote(vote: Vote):
-    settings = await get_public_election_settings()
-    if settings.voting_status == "CLOSED":
+    snapshot = await get_settings_snapshot()
+    if snapshot.settings.voting_status == "CLOSED":
+        # A kiosk may be retrying a ballot that was stored before voting closed.
+        if await is_replay(vote):
+            return {"message": VOTE_RECORDED_MESSAGE}
         raise HTTPException(status_code=403, detail="Voting is currently closed.")
     
-    if await voted_student_collection.find_one({"student_identifier": vote.student_identifier}):
-        raise HTTPException(status_code=403, detail="Your vote has already been submitted.")
-
-    for position_id, candidate_name in vote.selections.items():
-        position = next((p for p in settings.positions if p.id == position_id), None)
-        if not position:
-            raise HTTPException(status_code=400, detail=f"Invalid position ID '{position_id}' in vote.")
-        
-        candidate_query = {"name": candidate_name, "position_id": position_id}
-        if not await candidate_collection.find_one(candidate_query):
-            raise HTTPException(status_code=400, detail=f"Candidate '{candidate_name}' is not valid for position '{position.title}'.")
-
-    await vote_collection.insert_one(vote.dict())
-    await voted_student_collection.insert_one({"student_identifier": vote.student_identifier})
+    candidate_index = await get_candidate_index()
+    candidate_index.validate_ballot(vote.selections, snapshot.positions_by_id)
+
+    if not await commit_vote(vote):
+        # Retry of a ballot that is already recorded: acknowledge it without logging it twice.
+        return {"message": VOTE_RECORDED_MESSAGE}
     
     # --- NEW: Log the successful vote ---
+    # Low priority: the ballot itself is already the durable record of this event.
     await log_activity(
         actor="Student", 
         action="Vote Cast", 
-        details=f"Identifier: {vote.student_identifier}"
+        details=f"Identifier: {vote.student_identifier}",
+        priority="low"
     )
     
-    return {"message": "✅ Your vote has been successfully recorded."}
\ No newline at end of file
+    return {"message": VOTE_RECORDED_MESSAGE}
\ No newline at end of file
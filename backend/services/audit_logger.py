@@ -1,11 +1,215 @@
-# backend/services/audit_logger.py (New File)
+# backend/services/audit_logger.py (Updated with a Batched Background Writer)
 
+import asyncio
 import datetime
-from database.connection import audit_log_collection
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import List, Literal, Optional
 
-async def log_activity(actor: str, action: str, details: str = ""):
+from database.engine import repositories
+from core.metrics import audit_write_seconds, record_audit_wait
+from core.config import (
+    AUDIT_QUEUE_SIZE,
+    AUDIT_BATCH_SIZE,
+    AUDIT_FLUSH_INTERVAL,
+    AUDIT_OVERFLOW_POLICY,
+    AUDIT_SPILL_PATH
+)
+
+logger = logging.getLogger(__name__)
+
+Priority = Literal["low", "normal"]
+_STOP = object()
+
+
+class AuditWriter:
+    """
+    Collects audit entries in a bounded in-memory queue and writes them with
+    insert_many from a background task, either when a batch is full or when the
+    flush interval has passed, so requests never wait on the audit write itself.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float, overflow_policy: str, spill_path: str):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.spill_path = spill_path
+        self.dropped = 0
+        self._max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Requests (queue overflow) and the writer (failed batches) spill from different threads.
+        self._spill_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        await self._replay_spill()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flushes everything still queued and stops the background task."""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def submit(self, entry: dict, priority: Priority = "normal"):
+        try:
+            self._queue.put_nowait(entry)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        # The queue is full: whatever happens next is time the request spends on auditing.
+        started = time.perf_counter()
+        if self.overflow_policy == "spill":
+            await asyncio.to_thread(self._spill, [entry])
+        elif self.overflow_policy == "drop_low_priority" and priority == "low":
+            self.dropped += 1
+        else:
+            await self._queue.put(entry)
+        record_audit_wait(time.perf_counter() - started)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            await self._write(batch)
+
+        # Drain anything that was queued behind the stop marker.
+        remaining = []
+        while not self._queue.empty():
+            entry = self._queue.get_nowait()
+            if entry is not _STOP:
+                remaining.append(entry)
+        for start in range(0, len(remaining), self.batch_size):
+            await self._write(remaining[start:start + self.batch_size])
+
+    async def _write(self, batch: List[dict]):
+        started = time.perf_counter()
+        try:
+            await repositories.audit_logs.insert_many(batch)
+            audit_write_seconds.observe(time.perf_counter() - started)
+        except Exception as e:
+            # Never lose audit entries because the database hiccuped; keep them on disk instead.
+            logger.error("Audit batch of %d entries could not be written (%s); spilling to %s.", len(batch), e, self.spill_path)
+            await asyncio.to_thread(self._spill, batch)
+
+    def _spill(self, entries: List[dict]):
+        lines = []
+        for entry in entries:
+            record = {k: v for k, v in entry.items() if k != "_id"}
+            record["timestamp"] = record["timestamp"].isoformat()
+            lines.append(json.dumps(record) + "\n")
+        data = "".join(lines).encode("utf-8")
+        # One O_APPEND write per call, so lines from other threads or workers never interleave.
+        with self._spill_lock:
+            fd = os.open(self.spill_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    async def _replay_spill(self):
+        """
+        Writes entries spilled by earlier runs into the database. Each file is first
+        renamed to a name of its own, so lines other workers append in the meantime
+        start a fresh spill file instead of being removed with this one. A file that
+        cannot be written is kept as "<spill path>.<id>.retry" for the next start.
+        """
+        for path in self._claim_spill_files():
+            entries = self._read_spill(path)
+            try:
+                if entries:
+                    await repositories.audit_logs.insert_many(entries)
+            except Exception as e:
+                retry_path = path[:-len(".replaying")] + ".retry"
+                logger.error(
+                    "Could not replay %d spilled audit entries (%s); keeping them in %s for the next start.",
+                    len(entries), e, retry_path
+                )
+                os.replace(path, retry_path)
+                continue
+            os.remove(path)
+
+    def _claim_spill_files(self) -> List[str]:
+        # A rename is atomic, so when several workers start together each file is claimed by exactly one.
+        # Files still named ".replaying" belong to a replay in progress (or one cut short by a crash,
+        # whose entries may already be stored) and are left alone.
+        candidates = [self.spill_path] + glob.glob(glob.escape(self.spill_path) + ".*.retry")
+        claimed = []
+        for path in candidates:
+            target = f"{self.spill_path}.{uuid.uuid4().hex}.replaying"
+            try:
+                os.replace(path, target)
+            except FileNotFoundError:
+                continue
+            claimed.append(target)
+        return claimed
+
+    def _read_spill(self, path: str) -> List[dict]:
+        entries = []
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    entry["timestamp"] = datetime.datetime.fromisoformat(entry["timestamp"])
+                except (ValueError, KeyError, TypeError) as e:
+                    # A line cut short by a crash must not keep the other entries out of the log.
+                    logger.error("Skipping unreadable line %d of %s (%s): %r", line_number, path, e, line[:500])
+                    continue
+                entries.append(entry)
+        return entries
+
+audit_writer = AuditWriter(
+    max_queue=AUDIT_QUEUE_SIZE,
+    batch_size=AUDIT_BATCH_SIZE,
+    flush_interval=AUDIT_FLUSH_INTERVAL,
+    overflow_policy=AUDIT_OVERFLOW_POLICY,
+    spill_path=AUDIT_SPILL_PATH
+)
+
+
+async def log_activity(actor: str, action: str, details: str = "", priority: Priority = "normal"):
     """
-    Logs an important activity to the audit_logs collection in the database.
+    Logs an important activity to the audit log in the database.
+    While the app is running the entry is handed to the background writer;
+    outside the app (scripts, startup) it is written directly.
     """
     log_entry = {
         "timestamp": datetime.datetime.utcnow(),
@@ -13,4 +217,7 @@ async def log_activity(actor: str, action: str, details: str = ""):
         "action": action,
         "details": details
     }
-    await audit_log_collection.insert_one(log_entry)
\ No newline at end of file
+    if audit_writer.running:
+        await audit_writer.submit(log_entry, priority)
+    else:
+        await repositories.audit_logs.insert_many([log_entry])
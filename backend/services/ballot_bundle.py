@@ -0,0 +1,80 @@
+# backend/services/ballot_bundle.py (New File)
+
+import base64
+import logging
+from typing import Dict, Optional, Tuple
+
+from models.models import BallotBundle, BallotCandidate, BallotPosition
+from core.config import BALLOT_INLINE_IMAGE_MAX_BYTES
+from core.http_cache import encode_json
+from services.settings_cache import SettingsSnapshot
+from services.candidate_index import CandidateIndex
+from services.storage import public_storage
+
+logger = logging.getLogger(__name__)
+
+_MIME_TYPES = {"webp": "image/webp", "jpg": "image/jpeg", "jpeg": "image/jpeg", "png": "image/png"}
+
+# Last encoded bundle per inline_images flag: (etag, body).
+_bundles: Dict[bool, Tuple[str, bytes]] = {}
+
+
+async def _thumbnail_data_uri(url: Optional[str]) -> Optional[str]:
+    """Returns the thumbnail as a data URI, or None if it is missing, not ours, or too large."""
+    if not url or not url.startswith("/static/"):
+        return None
+    mime_type = _MIME_TYPES.get(url.rsplit(".", 1)[-1].lower())
+    if mime_type is None:
+        return None
+    try:
+        data = await public_storage.read(url[len("/static/"):])
+    except (OSError, ValueError):
+        logger.warning("Thumbnail %s could not be read for the ballot bundle.", url)
+        return None
+    if len(data) > BALLOT_INLINE_IMAGE_MAX_BYTES:
+        return None
+    return f"data:{mime_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+async def get_ballot_bundle(
+    snapshot: SettingsSnapshot, candidate_index: CandidateIndex, inline_images: bool = False
+) -> Tuple[str, bytes]:
+    """
+    Returns (etag, encoded body) for the ballot built from the given settings
+    and candidates. The version combines the settings version and the candidate
+    ETag, so the bundle is only rebuilt (and thumbnails only re-read) when one
+    of them changes.
+    """
+    version = f"{snapshot.version}-{candidate_index.content_hash}"
+    etag = f'"ballot-{version}{"-inline" if inline_images else ""}"'
+    cached = _bundles.get(inline_images)
+    if cached and cached[0] == etag:
+        return cached
+
+    settings = snapshot.settings
+    positions = []
+    for position in settings.positions:
+        candidates = []
+        for cand in candidate_index.candidates:
+            if cand["position_id"] != position.id:
+                continue
+            thumbnail_url = cand.get("thumbnail_url") or cand.get("photo_url")
+            candidates.append(BallotCandidate(
+                name=cand["name"],
+                gender=cand["gender"],
+                thumbnail_url=thumbnail_url,
+                thumbnail_data_uri=await _thumbnail_data_uri(thumbnail_url) if inline_images else None,
+            ))
+        positions.append(BallotPosition(
+            id=position.id, title=position.title,
+            gender_requirement=position.gender_requirement, candidates=candidates
+        ))
+
+    bundle = BallotBundle(
+        version=version,
+        college_info=settings.college_info,
+        voting_status=settings.voting_status,
+        positions=positions,
+    )
+    _bundles[inline_images] = (etag, encode_json(bundle))
+    return _bundles[inline_images]
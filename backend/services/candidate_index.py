@@ -0,0 +1,77 @@
+# backend/services/candidate_index.py (New File)
+
+import asyncio
+import hashlib
+import time
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from models.models import Candidate, Position
+from database.engine import repositories
+from core.config import CANDIDATE_INDEX_TTL
+from core.http_cache import encode_json
+
+
+class CandidateIndex:
+    """
+    An in-memory copy of the candidate list, indexed as position_id -> {name: gender}
+    so that a whole ballot can be validated without any database reads.
+    The public candidate list is also encoded once, with a content-hash ETag.
+    """
+    __slots__ = ("candidates", "genders_by_position", "content_hash", "etag", "body")
+
+    def __init__(self, candidates: List[dict]):
+        # Sorted so that the ETag only changes when the candidate data does.
+        self.candidates = sorted(candidates, key=lambda c: (c["position_id"], c["name"]))
+        self.body = encode_json([Candidate(**c) for c in self.candidates])
+        self.content_hash = hashlib.sha256(self.body).hexdigest()[:16]
+        self.etag = f'"candidates-{self.content_hash}"'
+        self.genders_by_position: Dict[str, Dict[str, str]] = {}
+        for cand in candidates:
+            self.genders_by_position.setdefault(cand["position_id"], {})[cand["name"]] = cand["gender"]
+
+    def validate_ballot(self, selections: Dict[str, str], positions_by_id: Dict[str, Position]):
+        """Raises an HTTPException for the first invalid selection in the ballot."""
+        for position_id, candidate_name in selections.items():
+            position = positions_by_id.get(position_id)
+            if not position:
+                raise HTTPException(status_code=400, detail=f"Invalid position ID '{position_id}' in vote.")
+
+            gender = self.genders_by_position.get(position_id, {}).get(candidate_name)
+            if gender is None:
+                raise HTTPException(status_code=400, detail=f"Candidate '{candidate_name}' is not valid for position '{position.title}'.")
+            if position.gender_requirement and gender != position.gender_requirement:
+                raise HTTPException(status_code=400, detail=f"Candidate '{candidate_name}' does not meet the gender requirement for position '{position.title}'.")
+
+
+# --- In-Process Cache State ---
+_index: Optional[CandidateIndex] = None
+_built_at = 0.0
+_generation = 0
+_lock = asyncio.Lock()
+
+
+async def get_candidate_index() -> CandidateIndex:
+    """Returns the cached candidate index, rebuilding it from the database when stale."""
+    global _index, _built_at
+    if _index is not None and time.monotonic() - _built_at < CANDIDATE_INDEX_TTL:
+        return _index
+
+    async with _lock:
+        if _index is not None and time.monotonic() - _built_at < CANDIDATE_INDEX_TTL:
+            return _index
+        generation = _generation
+        candidates = await repositories.candidates.list_all()
+        index = CandidateIndex(candidates)
+        # Only keep the result if no admin change happened while we were reading.
+        if generation == _generation:
+            _index, _built_at = index, time.monotonic()
+        return index
+
+
+def invalidate_candidate_index():
+    """Marks the candidate index as stale after any change to the candidate list."""
+    global _index, _generation
+    _index = None
+    _generation += 1
@@ -1,45 +1,68 @@
 # backend/services/image_uploader.py (New File)
 
-import os
+import io
+from typing import AsyncIterator, Dict
+
 from fastapi import UploadFile, HTTPException
-import shutil
-from pathlib import Path
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from core.config import CANDIDATE_PHOTO_FORMAT, CANDIDATE_PHOTO_QUALITY, CANDIDATE_PHOTO_MAX_BYTES
+from services.storage import store_upload, public_storage, private_storage
 
-# Define the base directory where static files (like images) will be served from.
-# We create a 'static' folder inside the 'backend' directory.
-STATIC_DIR = Path("static")
-STATIC_DIR.mkdir(parents=True, exist_ok=True)
+# --- Candidate Photo Variants ---
+# Each upload is re-encoded into these bounding boxes (aspect ratio is kept).
+PHOTO_VARIANTS = {
+    "thumb": (160, 160),
+    "display": (480, 480),
+}
+_PIL_FORMATS = {"webp": ("WEBP", "webp"), "jpeg": ("JPEG", "jpg")}
 
-def save_upload_file(upload_file: UploadFile, destination_folder: str) -> str:
+def render_photo_variants(data: bytes, pil_format: str) -> Dict[str, bytes]:
     """
-    Saves an uploaded file to a specific destination folder within the static directory.
-    Returns the path of the saved file.
+    Decodes a photo, applies its EXIF orientation and returns one resized,
+    re-encoded copy per variant. EXIF and other metadata are dropped by the
+    re-encode. CPU-bound; call it from a threadpool.
     """
     try:
-        # Create the destination folder if it doesn't exist (e.g., 'static/candidate_photos')
-        destination_path = STATIC_DIR / destination_folder
-        destination_path.mkdir(parents=True, exist_ok=True)
-        
-        # Define the full path for the file
-        file_path = destination_path / upload_file.filename
-        
-        # Save the file to the path
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(upload_file.file, buffer)
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"There was an error uploading the file: {e}")
-    finally:
-        upload_file.file.close()
-        
-    # Return the relative path (e.g., 'static/candidate_photos/rohan.jpg')
-    return str(file_path)
-
-def get_file_url(file_path: str) -> str:
+        with Image.open(io.BytesIO(data)) as source:
+            image = ImageOps.exif_transpose(source).convert("RGB")
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise HTTPException(status_code=400, detail="The uploaded file is not a supported image.")
+
+    variants = {}
+    for variant, size in PHOTO_VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail(size, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        resized.save(buffer, format=pil_format, quality=CANDIDATE_PHOTO_QUALITY, optimize=True)
+        variants[variant] = buffer.getvalue()
+    return variants
+
+async def _single_chunk(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+async def store_candidate_photo(upload_file: UploadFile, destination_folder: str = "candidate_photos") -> Dict[str, str]:
     """
-    Converts a local file path to a URL that can be accessed from the browser.
-    Example: 'static/candidate_photos/rohan.jpg' becomes '/static/candidate_photos/rohan.jpg'
+    Streams the upload into private storage, then publishes its variants as
+    '<destination_folder>/<content hash>_<variant>.<ext>'. A replaced photo
+    therefore always gets a new URL, and re-uploading a photo that was already
+    processed skips decoding entirely. Returns {variant: url}.
     """
-    # The URL should be relative to the server root.
-    # FastAPI will serve files from the 'static' directory at the '/static' URL path.
-    return "/" + file_path.replace("\\", "/") # Ensure forward slashes for URLs
\ No newline at end of file
+    pil_format, extension = _PIL_FORMATS.get(CANDIDATE_PHOTO_FORMAT, _PIL_FORMATS["webp"])
+    stored = await store_upload(upload_file, destination_folder, CANDIDATE_PHOTO_MAX_BYTES)
+    keys = {variant: f"{destination_folder}/{stored.sha256[:32]}_{variant}.{extension}" for variant in PHOTO_VARIANTS}
+
+    missing = [key for key in keys.values() if not await public_storage.exists(key)]
+    if missing:
+        data = await private_storage.read(stored.key)
+        try:
+            rendered = await run_in_threadpool(render_photo_variants, data, pil_format)
+        except HTTPException:
+            if stored.created:
+                await private_storage.delete(stored.key)
+            raise
+        for variant, key in keys.items():
+            await public_storage.put(key, _single_chunk(rendered[variant]))
+
+    return {variant: public_storage.url(key) for variant, key in keys.items()}
@@ -0,0 +1,170 @@
+# backend/services/live_results.py (New File)
+
+import asyncio
+import json
+from contextlib import contextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from core.config import LIVE_RESULTS_MIN_INTERVAL, LIVE_RESULTS_KEEPALIVE
+
+SUBSCRIBER_QUEUE_SIZE = 100
+# How often a snapshot is re-read when ballots were being committed while it was read.
+SNAPSHOT_ATTEMPTS = 5
+_DISCONNECT = object()
+
+
+class LiveResultsHub:
+    """
+    Collects tally deltas from committed ballots and pushes them to every
+    dashboard subscriber, coalescing all ballots within one interval into a
+    single "delta" event. Deltas are per worker: each worker pushes the votes
+    it committed itself, so with several workers a subscriber sees only its
+    own worker's share until its next snapshot.
+
+    Every ballot recorded by this worker gets a version number. A subscriber is
+    registered before its snapshot is read and is only sent the ballots with a
+    higher version than the snapshot reflects, so none are missed or counted twice.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._version = 0
+        self._pending: List[Tuple[int, Dict[str, str]]] = []
+        self._commits_in_flight = 0
+        self._commits_started = 0
+        self._resync = False
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for queue in list(self._subscribers):
+            self._push(queue, _DISCONNECT)
+
+    @contextmanager
+    def committing(self):
+        """Wraps a ballot commit, so that a snapshot read can tell whether it overlapped one."""
+        self._commits_in_flight += 1
+        self._commits_started += 1
+        try:
+            yield
+        finally:
+            self._commits_in_flight -= 1
+
+    def record_ballot(self, selections: Dict[str, str]):
+        """Adds one committed ballot to the pending delta (no I/O, safe on the vote path)."""
+        self._version += 1
+        if not self._subscribers:
+            return
+        self._pending.append((self._version, selections))
+        self._notify()
+
+    def request_resync(self):
+        """Tells subscribers to reload full results (after a reset or counter rebuild)."""
+        if not self._subscribers:
+            return
+        self._resync = True
+        self._notify()
+
+    def _notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _push(self, queue: asyncio.Queue, message):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A subscriber this far behind has lost deltas; drop it so it reconnects
+            # and starts again from a fresh snapshot.
+            self._subscribers.discard(queue)
+            queue.get_nowait()
+            queue.put_nowait(_DISCONNECT)
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Each subscriber turns the ballots into a delta itself, leaving out those
+            # its snapshot already contains.
+            message = ("resync", {}) if self._resync else ("ballots", self._pending)
+            self._pending, self._resync = [], False
+            for queue in list(self._subscribers):
+                self._push(queue, message)
+            await asyncio.sleep(self.min_interval)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Registers a subscriber. Do this before reading its snapshot, so no ballot falls in between."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    async def read_snapshot(self, load: Callable[[], Awaitable[dict]]) -> Tuple[dict, int]:
+        """
+        Reads a snapshot with load() and returns it with the version it reflects:
+        it contains every ballot this worker recorded up to that version and none
+        after it. A read that overlapped a ballot commit is ambiguous and is retried;
+        if this worker never goes quiet, the last read is used and a ballot committed
+        during it may be off by one until the next snapshot.
+        """
+        for _ in range(SNAPSHOT_ATTEMPTS):
+            version, started = self._version, self._commits_started
+            quiet = self._commits_in_flight == 0
+            snapshot = await load()
+            if quiet and self._commits_started == started:
+                return snapshot, version
+        return snapshot, self._version
+
+    async def events(self, queue: asyncio.Queue, snapshot: dict, version: int) -> AsyncIterator[str]:
+        """Yields a Server-Sent Events stream: the snapshot, then deltas and keep-alives."""
+        try:
+            yield _sse("snapshot", snapshot)
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), LIVE_RESULTS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is _DISCONNECT:
+                    return
+                event, data = message
+                if event == "ballots":
+                    delta = _delta(selections for ballot_version, selections in data if ballot_version > version)
+                    if delta is not None:
+                        yield _sse("delta", delta)
+                else:
+                    yield _sse(event, data)
+        finally:
+            self.unsubscribe(queue)
+
+
+def _delta(ballots) -> Optional[dict]:
+    """Coalesces ballots into one delta event: votes cast and per-candidate increments."""
+    votes_cast, tallies = 0, {}
+    for selections in ballots:
+        votes_cast += 1
+        for position_id, candidate in selections.items():
+            position = tallies.setdefault(position_id, {})
+            position[candidate] = position.get(candidate, 0) + 1
+    return {"votes_cast": votes_cast, "tallies": tallies} if votes_cast else None
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+live_results_hub = LiveResultsHub(min_interval=LIVE_RESULTS_MIN_INTERVAL)
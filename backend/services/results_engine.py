@@ -0,0 +1,83 @@
+# backend/services/results_engine.py (New File)
+
+from typing import Dict, List, Optional, Tuple
+
+from models.models import Position
+from database.engine import repositories
+from database.repository import Counts
+from core.config import RESULTS_SOURCE
+from services.candidate_index import CandidateIndex, get_candidate_index
+from services.settings_cache import get_settings_snapshot
+from services.tally import read_tallies
+
+
+# --- Aggregation ---
+async def aggregate_votes(by_class: bool = False) -> Tuple[Counts, int, Optional[dict]]:
+    """
+    Counts every position's votes and the total number of ballots in a single
+    pass over the stored ballots. With by_class=True the same pass also returns
+    per-(stream, division) ballot and candidate counts.
+    """
+    return await repositories.votes.aggregate(by_class=by_class)
+
+
+async def _class_turnout(class_rows: dict) -> List[dict]:
+    """Joins the per-class ballot counts with the roster size of each class."""
+    classes: Dict[tuple, dict] = {}
+
+    def entry(stream, division) -> dict:
+        return classes.setdefault((stream, division), {
+            "stream": stream, "division": division, "total_students": 0, "votes_cast": 0, "vote_counts": {}
+        })
+
+    for (stream, division), students in (await repositories.students.class_sizes()).items():
+        entry(stream, division)["total_students"] = students
+    for (stream, division), ballots in class_rows["ballots"].items():
+        entry(stream, division)["votes_cast"] = ballots
+    for (stream, division), counts in class_rows["counts"].items():
+        entry(stream, division)["vote_counts"] = counts
+
+    for item in classes.values():
+        item["turnout"] = item["votes_cast"] / item["total_students"] if item["total_students"] else 0.0
+    return sorted(classes.values(), key=lambda item: (item["stream"] or "", item["division"] or ""))
+
+
+# --- Results Assembly ---
+def build_position_results(positions: List[Position], candidate_index: CandidateIndex, counts: Counts) -> dict:
+    """Turns raw counts into the per-position results (including winners) shown on the dashboard."""
+    results = {}
+    for pos in positions:
+        pos_counts = counts.get(pos.id, {})
+        vote_counts = {name: pos_counts.get(name, 0) for name in candidate_index.genders_by_position.get(pos.id, {})}
+        winner = "N/A"
+        if any(vote_counts.values()) and (max_votes := max(vote_counts.values())) > 0:
+            tied_winners = [name for name, count in vote_counts.items() if count == max_votes]
+            winner = " & ".join(tied_winners) + (" (TIE!)" if len(tied_winners) > 1 else "")
+        results[pos.id] = {"position_title": pos.title, "vote_counts": vote_counts, "winner": winner}
+    return results
+
+
+async def compute_results(breakdown: bool = False) -> dict:
+    """
+    Builds the full results payload. Counts come from the tally counters or, when
+    RESULTS_SOURCE is "aggregate" or a class breakdown is requested, from one
+    aggregation over the raw votes.
+    """
+    snapshot = await get_settings_snapshot()
+    candidate_index = await get_candidate_index()
+    total_students = await repositories.students.count()
+
+    class_rows = None
+    if breakdown or RESULTS_SOURCE == "aggregate":
+        counts, total_votes_cast, class_rows = await aggregate_votes(by_class=breakdown)
+    else:
+        counts = await read_tallies()
+        total_votes_cast = await repositories.votes.count()
+
+    response = {
+        "voter_turnout": {"total_students": total_students, "total_votes_cast": total_votes_cast},
+        "results": build_position_results(snapshot.settings.positions, candidate_index, counts),
+    }
+    if breakdown:
+        response["class_breakdown"] = await _class_turnout(class_rows)
+    return response
@@ -0,0 +1,94 @@
+# backend/services/results_export.py (New File)
+
+import csv
+import io
+from typing import AsyncIterator, Iterator, List
+
+import pandas as pd
+from fastapi import HTTPException
+
+from database.engine import repositories
+
+EXPORT_BATCH_SIZE = 1000
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def _csv_line(row: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()
+
+
+def results_as_csv(data: dict) -> Iterator[str]:
+    """Yields the human-readable results report line by line, in the same layout as before."""
+    turnout = data["voter_turnout"]
+    yield _csv_line(["Election Results Export"])
+    yield _csv_line([])
+    yield _csv_line(["Voter Turnout"])
+    yield _csv_line(["Total Students", turnout["total_students"]])
+    yield _csv_line(["Votes Cast", turnout["total_votes_cast"]])
+    yield _csv_line([])
+    for pos_data in data["results"].values():
+        yield _csv_line([f"Position: {pos_data['position_title']}"])
+        yield _csv_line(["Candidate", "Votes"])
+        for name, count in pos_data["vote_counts"].items():
+            yield _csv_line([name, count])
+        yield _csv_line(["Winner(s)", pos_data["winner"]])
+        yield _csv_line([])
+
+
+def _results_table(data: dict) -> pd.DataFrame:
+    """One row per (position, candidate), the shape used by the binary formats."""
+    rows = [
+        {
+            "position_id": pos_id,
+            "position_title": pos_data["position_title"],
+            "candidate": name,
+            "votes": count,
+            "winner": pos_data["winner"],
+        }
+        for pos_id, pos_data in data["results"].items()
+        for name, count in pos_data["vote_counts"].items()
+    ]
+    return pd.DataFrame(rows, columns=["position_id", "position_title", "candidate", "votes", "winner"])
+
+
+def results_as_xlsx(data: dict) -> bytes:
+    turnout = data["voter_turnout"]
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        pd.DataFrame([
+            {"metric": "Total Students", "value": turnout["total_students"]},
+            {"metric": "Votes Cast", "value": turnout["total_votes_cast"]},
+        ]).to_excel(writer, sheet_name="Turnout", index=False)
+        _results_table(data).to_excel(writer, sheet_name="Results", index=False)
+    return buffer.getvalue()
+
+
+def results_as_parquet(data: dict) -> bytes:
+    buffer = io.BytesIO()
+    try:
+        _results_table(data).to_parquet(buffer, index=False)
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Parquet export requires the 'pyarrow' package on the server.")
+    return buffer.getvalue()
+
+
+async def raw_ballots_as_csv(position_ids: List[str]) -> AsyncIterator[str]:
+    """Streams every stored ballot as CSV, one batch of documents at a time."""
+    yield _csv_line(["student_identifier"] + position_ids)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    async for batch in repositories.votes.iter_batches(EXPORT_BATCH_SIZE):
+        for vote in batch:
+            selections = vote.get("selections", {})
+            writer.writerow([vote.get("student_identifier")] + [selections.get(pos_id, "") for pos_id in position_ids])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
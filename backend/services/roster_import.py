@@ -0,0 +1,122 @@
+# backend/services/roster_import.py (New File)
+
+import io
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from database.engine import repositories
+from core.config import ROSTER_IMPORT_CHUNK_SIZE, ROSTER_IMPORT_MAX_ERRORS
+
+REQUIRED_COLUMNS = ["name", "roll_number", "stream", "division"]
+
+
+class RosterFileError(ValueError):
+    """The uploaded file cannot be used at all (unreadable, or required columns missing)."""
+
+
+def read_roster_file(source: Union[str, bytes], filename: str) -> pd.DataFrame:
+    """Reads a CSV or Excel roster from a path or raw bytes."""
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    try:
+        if filename.lower().endswith(".csv"):
+            df = pd.read_csv(source, dtype=str, keep_default_na=False, encoding="utf-8")
+        else:
+            df = pd.read_excel(source, dtype=str, keep_default_na=False)
+    except Exception as e:
+        raise RosterFileError(f"Error processing file: {e}")
+    df.columns = [str(col).strip().lower() for col in df.columns]
+    if not all(col in df.columns for col in REQUIRED_COLUMNS):
+        raise RosterFileError(f"File must contain columns: {', '.join(REQUIRED_COLUMNS)}")
+    return df
+
+
+def normalize_roster(df: pd.DataFrame, divisions_by_stream: Dict[str, FrozenSet[str]]) -> Tuple[List[dict], List[str], int]:
+    """
+    Cleans and validates the whole roster with column operations instead of a
+    per-row loop. Returns (valid student records, per-row error messages,
+    number of rows that repeat an earlier row of the same file).
+    """
+    # Spreadsheet row numbers: +1 for the header line, +1 because rows start at 1.
+    row_numbers = pd.Series(range(2, len(df) + 2), index=df.index)
+    name = df["name"].astype(str).str.strip()
+    stream = df["stream"].astype(str).str.strip()
+    division = df["division"].astype(str).str.strip()
+    roll_number = pd.to_numeric(df["roll_number"].astype(str).str.strip(), errors="coerce")
+
+    valid_streams = set(divisions_by_stream)
+    streams_with_divisions = {s for s, divisions in divisions_by_stream.items() if divisions}
+    valid_classes = [(s, d) for s, divisions in divisions_by_stream.items() for d in divisions]
+    division_ok = pd.Series(pd.MultiIndex.from_arrays([stream, division]).isin(valid_classes), index=df.index)
+
+    problems = [
+        (name == "", "name is empty"),
+        (roll_number.isna(), "roll_number is not a number"),
+        (roll_number.notna() & ((roll_number <= 0) | (roll_number % 1 != 0)), "roll_number must be a positive whole number"),
+        (~stream.isin(valid_streams), "stream is not one of the configured streams"),
+        (stream.isin(streams_with_divisions) & ~division_ok, "division is not valid for this stream"),
+    ]
+
+    invalid = pd.Series(False, index=df.index)
+    messages = pd.Series("", index=df.index)
+    for mask, message in problems:
+        messages = messages.mask(mask, messages + message + "; ")
+        invalid |= mask
+
+    errors = [
+        f"Row {row}: {message[:-2]}"
+        for row, message in zip(row_numbers[invalid], messages[invalid])
+    ]
+
+    valid = pd.DataFrame({
+        "name": name[~invalid],
+        # Indexed lowercase copy of the name used by the roster search.
+        "name_lower": name[~invalid].str.lower(),
+        "roll_number": roll_number[~invalid].astype("int64"),
+        "stream": stream[~invalid],
+        # Streams without divisions store no division, matching identify_student.
+        "division": division[~invalid].where(stream[~invalid].isin(streams_with_divisions), None),
+    })
+    repeated = valid.duplicated(subset=["stream", "roll_number"], keep="first")
+    valid = valid[~repeated]
+    records = valid.astype(object).where(valid.notna(), None).to_dict("records")
+    for record in records:
+        record["roll_number"] = int(record["roll_number"])
+    return records, errors, int(repeated.sum())
+
+
+def cap_errors(errors: List[str]) -> List[str]:
+    if len(errors) <= ROSTER_IMPORT_MAX_ERRORS:
+        return errors
+    return errors[:ROSTER_IMPORT_MAX_ERRORS] + [f"... and {len(errors) - ROSTER_IMPORT_MAX_ERRORS} more rows with errors."]
+
+
+def parse_roster(source: Union[str, bytes], filename: str, divisions_by_stream: Dict[str, FrozenSet[str]]) -> Tuple[List[dict], List[str], int]:
+    """Reads and normalizes a roster file in one call, so it can run in a worker process."""
+    return normalize_roster(read_roster_file(source, filename), divisions_by_stream)
+
+
+async def ingest_students(
+    records: List[dict],
+    on_chunk: Optional[Callable[[int, int, int], Awaitable[None]]] = None
+) -> Tuple[int, int]:
+    """
+    Inserts new students chunk by chunk. Each chunk costs one lookup of the
+    students that already exist and one bulk insert. After every chunk
+    on_chunk(rows_processed, students_added, duplicates_found) is awaited, if given.
+    Returns (students_added, duplicates_found).
+    """
+    added = duplicates = 0
+    for start in range(0, len(records), ROSTER_IMPORT_CHUNK_SIZE):
+        chunk = records[start:start + ROSTER_IMPORT_CHUNK_SIZE]
+        existing = await repositories.students.existing_keys(chunk)
+        new_students = [r for r in chunk if (r["stream"], r["roll_number"]) not in existing]
+        duplicates += len(chunk) - len(new_students)
+        if new_students:
+            inserted, rejected = await repositories.students.insert_many(new_students)
+            added += inserted
+            duplicates += rejected
+        if on_chunk:
+            await on_chunk(start + len(chunk), added, duplicates)
+    return added, duplicates
@@ -0,0 +1,74 @@
+# backend/services/settings_cache.py (New File)
+
+import asyncio
+import time
+from typing import Dict, FrozenSet, Optional
+
+from models.models import ElectionSettings, Position
+from database.engine import repositories
+from core.config import SETTINGS_VERSION_CHECK_INTERVAL
+from core.http_cache import encode_json
+from services.audit_logger import log_activity
+
+class SettingsSnapshot:
+    """
+    A read-only, pre-indexed view of the election settings at a given version.
+    Lookups by position ID and by stream name are plain dictionary reads.
+    """
+    __slots__ = ("version", "settings", "positions_by_id", "divisions_by_stream", "etag", "body")
+
+    def __init__(self, version: int, settings: ElectionSettings):
+        self.version = version
+        self.settings = settings
+        self.positions_by_id: Dict[str, Position] = {pos.id: pos for pos in settings.positions}
+        self.divisions_by_stream: Dict[str, FrozenSet[str]] = {
+            stream.stream_name: frozenset(stream.divisions) for stream in settings.academic_structure
+        }
+        # The stored version changes on every save, so it doubles as the HTTP validator.
+        self.etag = f'"settings-{version}"'
+        self.body = encode_json(settings)
+
+
+# --- In-Process Cache State ---
+_snapshot: Optional[SettingsSnapshot] = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+
+
+async def _load_snapshot() -> SettingsSnapshot:
+    """Reads the settings document (creating the defaults on first run) and compiles it."""
+    settings = await repositories.settings.get()
+    if not settings:
+        if await repositories.settings.create_default(ElectionSettings().dict()):
+            await log_activity("System", "Initialized Default Settings", "First run detected.")
+        settings = await repositories.settings.get()
+    return SettingsSnapshot(settings.get("version", 0), ElectionSettings(**settings))
+
+
+async def get_settings_snapshot() -> SettingsSnapshot:
+    """
+    Returns the compiled settings snapshot. The database is only consulted when the
+    snapshot has been invalidated, or (at most once per check interval) to compare
+    the stored version number, which is a tiny projected read.
+    """
+    global _snapshot, _checked_at
+    if _snapshot is not None and time.monotonic() - _checked_at < SETTINGS_VERSION_CHECK_INTERVAL:
+        return _snapshot
+
+    async with _lock:
+        # Another request may have refreshed the snapshot while we were waiting.
+        if _snapshot is not None and time.monotonic() - _checked_at < SETTINGS_VERSION_CHECK_INTERVAL:
+            return _snapshot
+        if _snapshot is not None:
+            if await repositories.settings.get_version() == _snapshot.version:
+                _checked_at = time.monotonic()
+                return _snapshot
+        _snapshot = await _load_snapshot()
+        _checked_at = time.monotonic()
+        return _snapshot
+
+
+def invalidate_settings_snapshot():
+    """Drops the cached snapshot so the next request recompiles it from the database."""
+    global _snapshot
+    _snapshot = None
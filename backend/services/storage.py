@@ -0,0 +1,205 @@
+# backend/services/storage.py (New File)
+
+import asyncio
+import hashlib
+import os
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import AsyncIterable, AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException, UploadFile
+
+from core.config import STORAGE_BACKEND, UPLOAD_STORAGE_DIR
+
+STREAM_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+def _check_key(key: str) -> str:
+    """Keys are relative POSIX paths; anything that could escape the storage root is refused."""
+    path = PurePosixPath(key)
+    if not key or path.is_absolute() or ".." in path.parts or "\\" in key:
+        raise ValueError(f"Invalid storage key: {key!r}")
+    return str(path)
+
+
+# --- Backend Interface ---
+class StorageBackend(ABC):
+    """Minimal object store used for uploaded files. Keys look like 'candidate_photos/abc.webp'."""
+
+    @abstractmethod
+    async def put(self, key: str, chunks: AsyncIterable[bytes]) -> None:
+        """Writes the object from an async stream of chunks. Readers never see a partial object."""
+
+    @abstractmethod
+    async def move(self, source_key: str, key: str) -> bool:
+        """
+        Renames source_key to key. If key already exists the source is discarded
+        instead and False is returned, so identical content is only stored once.
+        """
+
+    @abstractmethod
+    async def read(self, key: str) -> bytes:
+        """Returns the whole object."""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Reports whether the key is present."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Removes the key if it is present."""
+
+    @abstractmethod
+    def url(self, key: str) -> Optional[str]:
+        """Public URL for the key, or None if this storage is not served."""
+
+
+class LocalFileStorage(StorageBackend):
+    """Stores objects as files under `root`. All disk I/O runs in worker threads."""
+
+    def __init__(self, root: str, url_prefix: Optional[str] = None):
+        self.root = Path(root)
+        self.url_prefix = url_prefix
+
+    def _path(self, key: str) -> Path:
+        return self.root / _check_key(key)
+
+    async def put(self, key: str, chunks: AsyncIterable[bytes]) -> None:
+        path = self._path(key)
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{uuid.uuid4().hex}.part")
+        f = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            raise
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(os.replace, tmp_path, path)
+
+    async def move(self, source_key: str, key: str) -> bool:
+        source, target = self._path(source_key), self._path(key)
+
+        def _move() -> bool:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                source.unlink(missing_ok=True)
+                return False
+            os.replace(source, target)
+            return True
+
+        return await asyncio.to_thread(_move)
+
+    async def read(self, key: str) -> bytes:
+        return await asyncio.to_thread(self._path(key).read_bytes)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).is_file)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    def url(self, key: str) -> Optional[str]:
+        return f"{self.url_prefix}/{_check_key(key)}" if self.url_prefix else None
+
+
+class InMemoryStorage(StorageBackend):
+    """Keeps objects in a dict. Intended for tests and throwaway runs."""
+
+    def __init__(self, url_prefix: Optional[str] = None):
+        self.url_prefix = url_prefix
+        self.objects: Dict[str, bytes] = {}
+
+    async def put(self, key: str, chunks: AsyncIterable[bytes]) -> None:
+        key = _check_key(key)
+        data = bytearray()
+        async for chunk in chunks:
+            data += chunk
+        self.objects[key] = bytes(data)
+
+    async def move(self, source_key: str, key: str) -> bool:
+        data = self.objects.pop(_check_key(source_key))
+        if _check_key(key) in self.objects:
+            return False
+        self.objects[key] = data
+        return True
+
+    async def read(self, key: str) -> bytes:
+        try:
+            return self.objects[_check_key(key)]
+        except KeyError:
+            raise FileNotFoundError(key)
+
+    async def exists(self, key: str) -> bool:
+        return _check_key(key) in self.objects
+
+    async def delete(self, key: str) -> None:
+        self.objects.pop(_check_key(key), None)
+
+    def url(self, key: str) -> Optional[str]:
+        return f"{self.url_prefix}/{_check_key(key)}" if self.url_prefix else None
+
+
+def _make_storage(root: str, url_prefix: Optional[str] = None) -> StorageBackend:
+    if STORAGE_BACKEND == "memory":
+        return InMemoryStorage(url_prefix)
+    return LocalFileStorage(root, url_prefix)
+
+# Files the browser may fetch directly (served by the /static mount).
+public_storage = _make_storage("static", "/static")
+# Original uploads; never served.
+private_storage = _make_storage(UPLOAD_STORAGE_DIR)
+
+
+# --- Streaming Uploads ---
+@dataclass
+class StoredUpload:
+    key: str
+    sha256: str
+    size: int
+    # False when identical content was already stored under the same key.
+    created: bool
+
+
+async def store_upload(
+    upload_file: UploadFile,
+    prefix: str,
+    max_bytes: int,
+    storage: StorageBackend = private_storage,
+) -> StoredUpload:
+    """
+    Streams an upload into storage in chunks, hashing it on the way and
+    rejecting it with 413 once it exceeds max_bytes. The object is stored as
+    '<prefix>/<sha256>', so the client's filename is never used as a path and
+    identical uploads share one copy.
+    """
+    too_large = f"File exceeds the upload limit of {max_bytes:,} bytes."
+    if upload_file.size is not None and upload_file.size > max_bytes:
+        await upload_file.close()
+        raise HTTPException(status_code=413, detail=too_large)
+
+    hasher = hashlib.sha256()
+    size = 0
+
+    async def _chunks() -> AsyncIterator[bytes]:
+        nonlocal size
+        while chunk := await upload_file.read(STREAM_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=too_large)
+            await asyncio.to_thread(hasher.update, chunk)
+            yield chunk
+
+    staging_key = f"{prefix}/.incoming-{uuid.uuid4().hex}"
+    try:
+        await storage.put(staging_key, _chunks())
+    finally:
+        await upload_file.close()
+    digest = hasher.hexdigest()
+    key = f"{prefix}/{digest}"
+    created = await storage.move(staging_key, key)
+    return StoredUpload(key=key, sha256=digest, size=size, created=created)
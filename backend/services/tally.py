@@ -0,0 +1,27 @@
+# backend/services/tally.py (New File)
+#
+# Per-candidate result counters, bumped once per committed ballot so the admin
+# results never have to scan the votes. The storage lives in the vote repository,
+# which counts a ballot as part of storing it (VoteRepository.insert).
+
+from typing import Dict
+
+from database.engine import repositories
+
+
+async def read_tallies() -> Dict[str, Dict[str, int]]:
+    """Returns the stored counters as {position_id: {candidate: count}}."""
+    return await repositories.votes.read_tallies()
+
+
+async def rebuild_tallies() -> int:
+    """
+    Recomputes every counter from the raw ballots and replaces the stored
+    tallies. Intended for recovery while voting is closed. Returns the number of
+    counters written.
+    """
+    return await repositories.votes.rebuild_tallies()
+
+
+async def clear_tallies():
+    await repositories.votes.clear_tallies()
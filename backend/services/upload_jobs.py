@@ -0,0 +1,130 @@
+# backend/services/upload_jobs.py (New File)
+
+import asyncio
+import datetime
+import logging
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
+
+from fastapi import UploadFile
+
+from models.models import UploadJobStatus
+from database.engine import repositories
+from core.config import UPLOAD_SPOOL_DIR, ROSTER_PARSE_WORKERS
+from services.audit_logger import log_activity
+from services.roster_import import RosterFileError, parse_roster, ingest_students, cap_errors
+
+logger = logging.getLogger(__name__)
+
+SPOOL_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+# --- Worker Pool and Job Registry ---
+_executor: Optional[ProcessPoolExecutor] = None
+# Jobs that are still running in this worker; finished jobs are only kept in the database.
+_jobs: Dict[str, UploadJobStatus] = {}
+_tasks: Set[asyncio.Task] = set()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=ROSTER_PARSE_WORKERS)
+    return _executor
+
+
+def shutdown_parse_workers():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def parse_roster_off_loop(
+    source: Union[str, bytes], filename: str, divisions_by_stream: Dict[str, FrozenSet[str]]
+) -> Tuple[List[dict], List[str], int]:
+    """Runs parse_roster in the worker process pool so pandas never blocks the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), parse_roster, source, filename, divisions_by_stream)
+
+
+async def _spool_upload(upload_file: UploadFile) -> str:
+    """Copies the uploaded file to the spool directory in chunks, writing off the event loop."""
+    os.makedirs(UPLOAD_SPOOL_DIR, exist_ok=True)
+    suffix = os.path.splitext(upload_file.filename or "")[1].lower()
+    path = os.path.join(UPLOAD_SPOOL_DIR, f"{uuid.uuid4().hex}{suffix}")
+    f = await asyncio.to_thread(open, path, "wb")
+    try:
+        while chunk := await upload_file.read(SPOOL_CHUNK_SIZE):
+            await asyncio.to_thread(f.write, chunk)
+    finally:
+        await asyncio.to_thread(f.close)
+        await upload_file.close()
+    return path
+
+
+async def _save(job: UploadJobStatus):
+    await repositories.upload_jobs.save(job.dict())
+
+
+async def _run_job(job: UploadJobStatus, path: str, divisions_by_stream: Dict[str, FrozenSet[str]]):
+    try:
+        job.status = "parsing"
+        await _save(job)
+        try:
+            records, errors, duplicates_in_file = await parse_roster_off_loop(path, job.filename, divisions_by_stream)
+        except RosterFileError as e:
+            job.status = "failed"
+            job.errors = [str(e)]
+            return
+
+        job.status = "ingesting"
+        job.rows_parsed = len(records) + len(errors) + duplicates_in_file
+        job.duplicates_found = duplicates_in_file
+        job.errors = cap_errors(errors)
+        await _save(job)
+
+        async def report_progress(rows_processed: int, students_added: int, duplicates_found: int):
+            job.rows_processed = rows_processed
+            job.students_added = students_added
+            job.duplicates_found = duplicates_in_file + duplicates_found
+            await _save(job)
+
+        await ingest_students(records, on_chunk=report_progress)
+        job.status = "completed"
+        if job.students_added:
+            await log_activity("Admin", "Bulk Upload", f"Added {job.students_added} new students from {job.filename}.")
+    except Exception as e:
+        logger.exception("Bulk upload job %s failed.", job.job_id)
+        job.status = "failed"
+        job.errors.append(f"Unexpected error: {e}")
+    finally:
+        job.finished_at = datetime.datetime.utcnow()
+        await _save(job)
+        _jobs.pop(job.job_id, None)
+        await asyncio.to_thread(os.remove, path)
+
+
+async def start_upload_job(upload_file: UploadFile, divisions_by_stream: Dict[str, FrozenSet[str]]) -> UploadJobStatus:
+    """Spools the file to disk and starts processing it in the background. Returns the new job."""
+    path = await _spool_upload(upload_file)
+    job = UploadJobStatus(
+        job_id=uuid.uuid4().hex,
+        filename=upload_file.filename or "upload",
+        created_at=datetime.datetime.utcnow()
+    )
+    _jobs[job.job_id] = job
+    await _save(job)
+    task = asyncio.create_task(_run_job(job, path, divisions_by_stream))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+async def get_upload_job(job_id: str) -> Optional[UploadJobStatus]:
+    """Returns a job's status from memory while it runs here, otherwise from the database."""
+    if job_id in _jobs:
+        return _jobs[job_id]
+    doc = await repositories.upload_jobs.get(job_id)
+    return UploadJobStatus(**doc) if doc else None
@@ -0,0 +1,53 @@
+# backend/services/vote_recorder.py (New File)
+
+from fastapi import HTTPException
+
+from models.models import Vote
+from database.engine import repositories
+from database.repository import DuplicateRecordError, class_of_identifier
+from services.live_results import live_results_hub
+
+ALREADY_VOTED_DETAIL = "Your vote has already been submitted."
+
+
+async def has_voted(student_identifier: str) -> bool:
+    """Checks whether a ballot has already been recorded for this student."""
+    return await repositories.votes.has_voted(student_identifier)
+
+
+async def is_replay(vote: Vote) -> bool:
+    """True if this exact ballot (same student and idempotency key) is already stored."""
+    if not vote.idempotency_key:
+        return False
+    return await repositories.votes.has_ballot_with_key(vote.student_identifier, vote.idempotency_key)
+
+
+async def commit_vote(vote: Vote) -> bool:
+    """
+    Records a validated ballot and bumps the result counters as part of the same
+    commit. The vote store rejects a second ballot for the same student (in
+    MongoDB's atomic mode and in SQLite the insert itself is the duplicate check,
+    so two concurrent submits can never both succeed).
+    Returns False when the ballot is a retry of one that was already recorded with
+    the same idempotency key; if that first attempt failed before its ballot was
+    counted, the retry counts it.
+    """
+    try:
+        # Identifiers are issued by /api/student/identify; anything else would leave
+        # the ballot without a class in the per-class breakdown.
+        class_of_identifier(vote.student_identifier)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Marks the commit for live dashboards reading a snapshot at the same time.
+    with live_results_hub.committing():
+        try:
+            await repositories.votes.insert(vote.dict())
+        except DuplicateRecordError:
+            if await is_replay(vote):
+                counted = await repositories.votes.finish_tally(vote.student_identifier)
+                if counted is not None:
+                    live_results_hub.record_ballot(counted)
+                return False
+            raise HTTPException(status_code=403, detail=ALREADY_VOTED_DETAIL)
+        live_results_hub.record_ballot(vote.selections)
+    return True
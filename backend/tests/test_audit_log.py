@@ -0,0 +1,41 @@
+# backend/tests/test_audit_log.py (New File)
+
+import pytest
+
+from conftest import ENGINES, engine_env, run_app_script
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_since_returns_entries_written_with_older_timestamps(engine, tmp_path):
+    # Spilled entries are replayed at startup with their original timestamps, so an
+    # entry can be written after others that carry a later timestamp.
+    outcome = run_app_script(tmp_path, """
+        import asyncio, datetime, json
+        from fastapi.testclient import TestClient
+        import main
+        from database.engine import repositories
+
+        def entry(action, minutes_ago):
+            timestamp = datetime.datetime.utcnow() - datetime.timedelta(minutes=minutes_ago)
+            return {"timestamp": timestamp, "actor": "Test", "action": action, "details": ""}
+
+        def page(client, **params):
+            response = client.post("/api/admin/audit-logs/page", params=params, json={"request": {"password": "teacher123"}})
+            assert response.status_code == 200, response.text
+            return response.json()
+
+        with TestClient(main.app) as client:
+            client.portal.call(repositories.audit_logs.insert_many, [entry("Recent", 0)])
+            first = page(client, actor="Test")
+            client.portal.call(repositories.audit_logs.insert_many, [entry("Replayed", 60), entry("Newer", 0)])
+            polled = page(client, actor="Test", since=first["latest_cursor"])
+            again = page(client, actor="Test", since=polled["latest_cursor"])
+            bad = client.post("/api/admin/audit-logs/page", params={"since": "not-an-id"}, json={"request": {"password": "teacher123"}})
+        print(json.dumps({
+            "first": [log["action"] for log in first["logs"]],
+            "polled": [log["action"] for log in polled["logs"]],
+            "again": [log["action"] for log in again["logs"]],
+            "bad_cursor": bad.status_code,
+        }))
+    """, **engine_env(engine, tmp_path))
+    assert outcome == {"first": ["Recent"], "polled": ["Newer", "Replayed"], "again": [], "bad_cursor": 400}
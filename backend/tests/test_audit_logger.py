@@ -0,0 +1,77 @@
+# backend/tests/test_audit_logger.py (New File)
+
+from conftest import engine_env, run_app_script
+
+
+def test_concurrent_spills_and_replay(tmp_path):
+    # Spills from many threads must leave one whole JSON line per entry, and a
+    # corrupt line (e.g. cut short by a crash) must not stop the replay.
+    outcome = run_app_script(tmp_path, """
+        import asyncio, datetime, json, os
+        from concurrent.futures import ThreadPoolExecutor
+        from database.engine import init_database, close_database, repositories
+        from services.audit_logger import AuditWriter
+
+        writer = AuditWriter(max_queue=10, batch_size=10, flush_interval=0.1, overflow_policy="spill", spill_path="spill.jsonl")
+        details = "x" * 5000  # long lines are the ones buffered writes split
+
+        def spill(n):
+            entries = [{"timestamp": datetime.datetime.utcnow(), "actor": "Test", "action": f"Spill {n}", "details": details}
+                       for _ in range(5)]
+            writer._spill(entries)
+
+        with ThreadPoolExecutor(16) as pool:
+            list(pool.map(spill, range(200)))
+        with open("spill.jsonl", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        whole_lines = sum(1 for line in lines if json.loads(line)["details"] == details)
+        with open("spill.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "2026-01-01T00:00:00", "actor": "Te\\n')
+
+        async def replay():
+            await init_database()
+            await writer.start()
+            await writer.stop()
+            replayed = len(await repositories.audit_logs.page(5000, actor="Test"))
+            await close_database()
+            return replayed
+
+        replayed = asyncio.run(replay())
+        print(json.dumps({"lines": len(lines), "whole_lines": whole_lines, "replayed": replayed,
+                          "spill_removed": not os.path.exists("spill.jsonl")}))
+    """, **engine_env("sqlite", tmp_path))
+    assert outcome == {"lines": 1000, "whole_lines": 1000, "replayed": 1000, "spill_removed": True}
+
+
+def test_failed_replay_is_kept_for_the_next_start(tmp_path):
+    # A database error during replay must neither abort startup nor lose the entries.
+    outcome = run_app_script(tmp_path, """
+        import asyncio, datetime, glob, json, os
+        from database.engine import init_database, close_database, repositories
+        from services.audit_logger import AuditWriter
+
+        writer = AuditWriter(max_queue=10, batch_size=10, flush_interval=0.1, overflow_policy="spill", spill_path="spill.jsonl")
+        writer._spill([{"timestamp": datetime.datetime.utcnow(), "actor": "Test", "action": f"Spill {n}", "details": ""}
+                       for n in range(5)])
+
+        async def failing_insert_many(entries):
+            raise ConnectionError("database unavailable")
+
+        async def replay():
+            await init_database()
+            working_insert_many = repositories.audit_logs.insert_many
+            repositories.audit_logs.insert_many = failing_insert_many
+            await writer.start()
+            await writer.stop()
+            kept = sorted(os.path.basename(p).rsplit(".", 1)[-1] for p in glob.glob("spill.jsonl*"))
+            repositories.audit_logs.insert_many = working_insert_many
+            await writer.start()
+            await writer.stop()
+            replayed = len(await repositories.audit_logs.page(100, actor="Test"))
+            await close_database()
+            return kept, replayed
+
+        kept, replayed = asyncio.run(replay())
+        print(json.dumps({"kept": kept, "replayed": replayed, "left": glob.glob("spill.jsonl*")}))
+    """, **engine_env("sqlite", tmp_path))
+    assert outcome == {"kept": ["retry"], "replayed": 5, "left": []}
@@ -0,0 +1,37 @@
+# backend/tests/test_config.py (New File)
+
+from conftest import run_app_script
+
+
+def test_admin_password_from_env_file_is_honoured(tmp_path):
+    outcome = run_app_script(tmp_path, """
+        import json
+        from fastapi.testclient import TestClient
+        import main
+
+        with TestClient(main.app) as client:
+            statuses = {
+                password: client.post("/api/admin/results", json={"request": {"password": password}}).status_code
+                for password in ("s3cret", "teacher123")
+            }
+            profiled = client.get("/", headers={"X-Profile": "teacher123"}).headers.get("x-profile-id")
+        print(json.dumps({"statuses": statuses, "profiled_with_default": profiled is not None}))
+    """, env_file="ADMIN_PASSWORD=s3cret\nDATABASE_ENGINE=sqlite\nSQLITE_PATH=:memory:\n")
+    assert outcome["statuses"] == {"s3cret": 200, "teacher123": 401}
+    assert outcome["profiled_with_default"] is False
+
+
+def test_database_engine_from_env_file_is_honoured(tmp_path):
+    # With DATABASE_ENGINE=sqlite in .env the app must start without MONGO_URI.
+    outcome = run_app_script(tmp_path, """
+        import json
+        from fastapi.testclient import TestClient
+        import main
+        from core import config
+
+        with TestClient(main.app) as client:
+            status = client.get("/api/settings").status_code
+        print(json.dumps({"engine": config.DATABASE_ENGINE, "status": status}))
+    """, env_file=f"DATABASE_ENGINE=sqlite\nSQLITE_PATH={tmp_path / 'votes.sqlite3'}\n")
+    assert outcome == {"engine": "sqlite", "status": 200}
+    assert (tmp_path / "votes.sqlite3").exists()
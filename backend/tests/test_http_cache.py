@@ -0,0 +1,81 @@
+# backend/tests/test_http_cache.py (New File)
+#
+# Conditional GETs: validators on the cacheable endpoints and 304 answers.
+
+import pytest
+
+from conftest import ENGINES, engine_env, run_app_script
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_settings_and_candidates_answer_304_until_they_change(engine, tmp_path):
+    outcome = run_app_script(tmp_path, """
+        import json
+        from fastapi.testclient import TestClient
+        import main
+
+        AUTH = {"password": "teacher123"}
+
+        def revalidate(client, path, etag, if_none_match=None):
+            # [status, body length, whether the ETag differs from the one the client holds]
+            response = client.get(path, headers={"If-None-Match": if_none_match or etag})
+            return [response.status_code, len(response.content), response.headers["etag"] != etag]
+
+        with TestClient(main.app) as client:
+            client.post("/api/admin/clear-candidates", json={"request": AUTH}).raise_for_status()
+            outcome = {}
+            for path in ("/api/settings", "/api/candidates"):
+                first = client.get(path)
+                etag = first.headers["etag"]
+                outcome[path] = {
+                    "first": [first.status_code, first.headers["cache-control"]],
+                    "same": revalidate(client, path, etag),
+                    "weak_in_list": revalidate(client, path, etag, f'"other", W/{etag}'),
+                    "other": revalidate(client, path, etag, '"other"'),
+                }
+
+            settings = client.get("/api/settings").json()
+            settings["voting_status"] = "OPEN"
+            old_settings = client.get("/api/settings").headers["etag"]
+            client.post("/api/admin/settings", json={"settings": settings, "request": AUTH}).raise_for_status()
+            old_candidates = client.get("/api/candidates").headers["etag"]
+            candidate = {"name": "Rohan", "position_id": "cr_boy", "gender": "boy"}
+            client.post("/api/admin/candidate", json={"candidate": candidate, "request": AUTH}).raise_for_status()
+            outcome["/api/settings"]["changed"] = revalidate(client, "/api/settings", old_settings)
+            outcome["/api/candidates"]["changed"] = revalidate(client, "/api/candidates", old_candidates)
+        print(json.dumps(outcome))
+    """, **engine_env(engine, tmp_path))
+    for path in ("/api/settings", "/api/candidates"):
+        result = outcome[path]
+        assert result["first"] == [200, "no-cache"], path
+        assert result["same"] == [304, 0, False], path
+        assert result["weak_in_list"] == [304, 0, False], path
+        assert result["other"][0] == 200, path
+        changed_status, changed_length, new_etag = result["changed"]
+        assert changed_status == 200 and changed_length > 0 and new_etag, path
+
+
+def test_static_files_cache_hashed_photos_and_revalidate_the_rest(tmp_path):
+    # main.py mounts ./static relative to the working directory, i.e. tmp_path.
+    static = tmp_path / "static"
+    static.mkdir()
+    (static / "0123456789abcdef_thumb.webp").write_bytes(b"hashed photo")
+    (static / "college_logo.png").write_bytes(b"plain file")
+    outcome = run_app_script(tmp_path, """
+        import json
+        from fastapi.testclient import TestClient
+        import main
+
+        outcome = {}
+        with TestClient(main.app) as client:
+            for name in ("0123456789abcdef_thumb.webp", "college_logo.png"):
+                first = client.get(f"/static/{name}")
+                again = client.get(f"/static/{name}", headers={"If-None-Match": first.headers["etag"]})
+                outcome[name] = [first.status_code, first.content.decode(), first.headers["cache-control"],
+                                 again.status_code, len(again.content), again.headers.get("cache-control")]
+        print(json.dumps(outcome))
+    """, STATIC_IMMUTABLE_MAX_AGE="31536000", **engine_env("sqlite", tmp_path))
+    assert outcome["0123456789abcdef_thumb.webp"] == [
+        200, "hashed photo", "public, max-age=31536000, immutable", 304, 0, "public, max-age=31536000, immutable"
+    ]
+    assert outcome["college_logo.png"] == [200, "plain file", "no-cache", 304, 0, "no-cache"]
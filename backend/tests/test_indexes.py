@@ -0,0 +1,22 @@
+# backend/tests/test_indexes.py (New File)
+#
+# Explains every hot query shape against a real MongoDB server (skipped when none
+# is reachable) and fails if any of them plans a collection scan.
+
+from conftest import engine_env, requires_mongo, run_app_script
+
+
+@requires_mongo
+def test_hot_queries_use_indexes(tmp_path):
+    outcome = run_app_script(tmp_path, """
+        import asyncio, json
+        from database.indexes import ensure_indexes, backfill_search_fields, find_collection_scans
+
+        async def main():
+            await ensure_indexes()
+            await backfill_search_fields()
+            return [{"query": label, "plan": stages} for label, stages in await find_collection_scans()]
+
+        print(json.dumps({"collection_scans": asyncio.run(main())}))
+    """, **engine_env("mongo", tmp_path))
+    assert outcome["collection_scans"] == []
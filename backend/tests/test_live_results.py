@@ -0,0 +1,44 @@
+# backend/tests/test_live_results.py (New File)
+
+import asyncio
+import json
+
+from services.live_results import LiveResultsHub
+
+
+def _event(chunk: str):
+    lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+
+def test_snapshot_and_deltas_count_every_ballot_once():
+    async def scenario():
+        hub = LiveResultsHub(min_interval=0)
+        await hub.start()
+        stored = []  # stands in for the vote store
+
+        async def commit(selections):
+            with hub.committing():
+                await asyncio.sleep(0.01)  # the database write
+                stored.append(selections)
+                hub.record_ballot(selections)
+
+        async def load_results():
+            await asyncio.sleep(0.02)
+            return {"votes_cast": len(stored)}
+
+        await commit({"head_boy": "Rohan"})
+        queue = hub.subscribe()
+        # A ballot committed while the snapshot is read must end up in exactly one of them.
+        _, (snapshot, version) = await asyncio.gather(commit({"head_boy": "Amit"}), hub.read_snapshot(load_results))
+        events = hub.events(queue, snapshot, version)
+        first = _event(await events.__anext__())
+        await commit({"head_boy": "Rohan"})
+        second = _event(await asyncio.wait_for(events.__anext__(), 5))
+        await events.aclose()
+        await hub.stop()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == ("snapshot", {"votes_cast": 2})
+    assert second == ("delta", {"votes_cast": 1, "tallies": {"head_boy": {"Rohan": 1}}})
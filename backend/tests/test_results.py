@@ -0,0 +1,157 @@
+# backend/tests/test_results.py (New File)
+#
+# The admin results through the HTTP API, against each storage engine.
+
+import pytest
+
+from conftest import ENGINES, engine_env, run_app_script
+
+# Prepended to every script: an open election with two candidates for the boys'
+# seat and one for the girls', and helpers for the admin and voting endpoints.
+SETUP = """
+    import json
+    from fastapi.testclient import TestClient
+    import main
+    from database.engine import repositories
+
+    AUTH = {"password": "teacher123"}
+
+    def admin(client, path, params=None, **body):
+        response = client.post(path, params=params, json={"request": AUTH, **body})
+        assert response.status_code == 200, response.text
+        return response
+
+    def set_voting(client, status):
+        settings = client.get("/api/settings").json()
+        settings["voting_status"] = status
+        admin(client, "/api/admin/settings", settings=settings)
+
+    def prepare(client):
+        admin(client, "/api/admin/reset-election")
+        admin(client, "/api/admin/clear-candidates")
+        for name, position_id, gender in [("Rohan", "cr_boy", "boy"), ("Amit", "cr_boy", "boy"), ("Priya", "cr_girl", "girl")]:
+            admin(client, "/api/admin/candidate", candidate={"name": name, "position_id": position_id, "gender": gender})
+        set_voting(client, "OPEN")
+
+    def vote(client, identifier, **selections):
+        response = client.post("/api/vote", json={"selections": selections, "student_identifier": identifier})
+        assert response.status_code == 200, response.text
+
+    def cast_ballots(client):
+        vote(client, "Science-A-1", cr_boy="Rohan", cr_girl="Priya")
+        vote(client, "Science-A-2", cr_boy="Rohan")
+        vote(client, "Commerce-B-7", cr_boy="Amit", cr_girl="Priya")
+        vote(client, "Arts-NA-3", cr_boy="Rohan")
+
+    def summary(results):
+        return {pos_id: [pos["vote_counts"], pos["winner"]] for pos_id, pos in results["results"].items()} | {
+            "votes_cast": results["voter_turnout"]["total_votes_cast"]}
+"""
+
+EXPECTED = {
+    "cr_boy": [{"Rohan": 3, "Amit": 1}, "Rohan"],
+    "cr_girl": [{"Priya": 2}, "Priya"],
+    "votes_cast": 4,
+}
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_tallies_follow_votes_and_rebuild_from_ballots(engine, tmp_path):
+    outcome = run_app_script(tmp_path, SETUP + """
+    with TestClient(main.app) as client:
+        prepare(client)
+        cast_ballots(client)
+        counted = summary(admin(client, "/api/admin/results").json())
+
+        # Lose the counters, as after a manual data edit; the ballots are still there.
+        client.portal.call(repositories.votes.clear_tallies)
+        cleared = summary(admin(client, "/api/admin/results").json())
+        while_open = client.post("/api/admin/results/rebuild-tallies", json={"request": AUTH}).status_code
+        set_voting(client, "CLOSED")
+        rebuilt = admin(client, "/api/admin/results/rebuild-tallies").json()["counters"]
+        recovered = summary(admin(client, "/api/admin/results").json())
+    print(json.dumps({"counted": counted, "cleared": cleared, "while_open": while_open,
+                      "rebuilt": rebuilt, "recovered": recovered}))
+    """, **engine_env(engine, tmp_path))
+    assert outcome["counted"] == EXPECTED
+    assert outcome["cleared"]["cr_boy"] == [{"Rohan": 0, "Amit": 0}, "N/A"]
+    assert outcome["while_open"] == 409
+    assert outcome["rebuilt"] == 3
+    assert outcome["recovered"] == EXPECTED
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_aggregation_counts_ballots_and_class_turnout(engine, tmp_path):
+    outcome = run_app_script(tmp_path, SETUP + """
+    students = [("Science", "A", 1), ("Science", "A", 2), ("Science", "A", 4), ("Science", "A", 5),
+                ("Commerce", "B", 7), ("Arts", None, 3)]
+
+    with TestClient(main.app) as client:
+        prepare(client)
+        admin(client, "/api/admin/clear-students")
+        client.portal.call(repositories.students.insert_many, [
+            {"name": f"Student {roll}", "name_lower": f"student {roll}", "roll_number": roll, "stream": stream, "division": division}
+            for stream, division, roll in students
+        ])
+        cast_ballots(client)
+        # The aggregation reads the ballots themselves, so the counters must not matter.
+        client.portal.call(repositories.votes.clear_tallies)
+        aggregated = summary(admin(client, "/api/admin/results").json())
+        breakdown = admin(client, "/api/admin/results", params={"breakdown": "true"}).json()["class_breakdown"]
+    print(json.dumps({"aggregated": aggregated, "breakdown": breakdown}))
+    """, RESULTS_SOURCE="aggregate", **engine_env(engine, tmp_path))
+    assert outcome["aggregated"] == EXPECTED
+    assert outcome["breakdown"] == [
+        {"stream": "Arts", "division": None, "total_students": 1, "votes_cast": 1, "turnout": 1.0,
+         "vote_counts": {"cr_boy": {"Rohan": 1}}},
+        {"stream": "Commerce", "division": "B", "total_students": 1, "votes_cast": 1, "turnout": 1.0,
+         "vote_counts": {"cr_boy": {"Amit": 1}, "cr_girl": {"Priya": 1}}},
+        {"stream": "Science", "division": "A", "total_students": 4, "votes_cast": 2, "turnout": 0.5,
+         "vote_counts": {"cr_boy": {"Rohan": 2}, "cr_girl": {"Priya": 1}}},
+    ]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_exports_stream_results_ballots_and_roster(engine, tmp_path):
+    outcome = run_app_script(tmp_path, SETUP + """
+    import csv, io
+    import pandas as pd
+
+    with TestClient(main.app) as client:
+        prepare(client)
+        admin(client, "/api/admin/clear-students")
+        client.portal.call(repositories.students.insert_many, [
+            {"name": f"Student {roll}", "name_lower": f"student {roll}", "roll_number": roll, "stream": stream, "division": division}
+            for stream, division, roll in [("Science", "A", 1), ("Science", "B", 2), ("Arts", None, 3)]
+        ])
+        cast_ballots(client)
+        results_csv = admin(client, "/api/admin/results/export", params={"format": "csv"})
+        results_xlsx = admin(client, "/api/admin/results/export", params={"format": "xlsx"})
+        ballots_csv = admin(client, "/api/admin/votes/export")
+        roster = admin(client, "/api/admin/students/stream")
+        science = admin(client, "/api/admin/students/stream", params={"stream": "Science"})
+
+    table = pd.read_excel(io.BytesIO(results_xlsx.content), sheet_name="Results")
+    print(json.dumps({
+        "csv_type": results_csv.headers["content-type"],
+        "csv_disposition": results_csv.headers["content-disposition"],
+        "csv_rows": list(csv.reader(io.StringIO(results_csv.text))),
+        "xlsx_votes": dict(zip(table["candidate"], table["votes"].astype(int))),
+        "ballots": sorted(csv.reader(io.StringIO(ballots_csv.text))),
+        "roster_type": roster.headers["content-type"],
+        "roster": sorted(json.loads(line)["roll_number"] for line in roster.text.splitlines()),
+        "science": sorted(json.loads(line)["roll_number"] for line in science.text.splitlines()),
+    }))
+    """, **engine_env(engine, tmp_path))
+    assert outcome["csv_type"].startswith("text/csv")
+    assert outcome["csv_disposition"] == 'attachment; filename="election_results.csv"'
+    assert outcome["csv_rows"][:5] == [["Election Results Export"], [], ["Voter Turnout"], ["Total Students", "3"], ["Votes Cast", "4"]]
+    assert ["Rohan", "3"] in outcome["csv_rows"] and ["Winner(s)", "Priya"] in outcome["csv_rows"]
+    assert outcome["xlsx_votes"] == {"Rohan": 3, "Amit": 1, "Priya": 2}
+    assert outcome["ballots"] == [
+        ["Arts-NA-3", "Rohan", ""], ["Commerce-B-7", "Amit", "Priya"], ["Science-A-1", "Rohan", "Priya"],
+        ["Science-A-2", "Rohan", ""], ["student_identifier", "cr_boy", "cr_girl"],
+    ]
+    assert outcome["roster_type"] == "application/x-ndjson"
+    assert outcome["roster"] == [1, 2, 3]
+    assert outcome["science"] == [1, 2]
@@ -0,0 +1,144 @@
+# backend/tests/test_vote_commit.py (New File)
+#
+# commit_vote against each storage engine. The MongoDB cases need a reachable
+# server (MONGO_URI, or mongod on localhost) and are skipped otherwise.
+
+import pytest
+
+from conftest import ENGINES, VOTE_ENGINES, engine_env, run_app_script
+from database.repository import class_of_identifier
+
+# Prepended to every script: a fresh database with no ballots or counters.
+SETUP = """
+    import asyncio, json
+    from fastapi import HTTPException
+    from database.engine import init_database, close_database, repositories
+    from models.models import Vote
+    from services.vote_recorder import commit_vote
+
+    async def reset():
+        await init_database()
+        await repositories.votes.delete_all()
+        await repositories.votes.clear_tallies()
+"""
+
+
+def test_class_of_identifier():
+    assert class_of_identifier("Computer-Science-A-12") == ("Computer-Science", "A")
+    assert class_of_identifier("Arts-NA-3") == ("Arts", None)
+    for malformed in ("foo", "Arts-3", "Arts-A-x", "-A-3"):
+        with pytest.raises(ValueError):
+            class_of_identifier(malformed)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_malformed_identifier_is_rejected(engine, tmp_path):
+    outcome = run_app_script(tmp_path, SETUP + """
+    async def main():
+        await reset()
+        try:
+            await commit_vote(Vote(selections={"head_boy": "Rohan"}, student_identifier="foo"))
+            status = 200
+        except HTTPException as e:
+            status = e.status_code
+        result = {"status": status, "ballots": await repositories.votes.count()}
+        await close_database()
+        return result
+
+    print(json.dumps(asyncio.run(main())))
+    """, **engine_env(engine, tmp_path))
+    assert outcome == {"status": 400, "ballots": 0}
+
+
+def test_sqlite_ballot_and_counters_commit_together(tmp_path):
+    # A failing counter update must take the ballot down with it, so the retry
+    # stores and counts the ballot instead of being acknowledged as a replay.
+    outcome = run_app_script(tmp_path, SETUP + """
+    from database.engine import sqlite_database
+    from database.sqlite_engine import SCHEMA
+
+    async def main():
+        await reset()
+        vote = Vote(selections={"head_boy": "Rohan"}, student_identifier="Science-A-1", idempotency_key="k1")
+        await sqlite_database.run(lambda conn: conn.execute("DROP TABLE tallies"))
+        try:
+            await commit_vote(vote)
+            failed = False
+        except Exception:
+            failed = True
+        ballots_after_failure = await repositories.votes.count()
+        await sqlite_database.run(lambda conn: conn.executescript(SCHEMA))
+        stored = await commit_vote(vote)
+        result = {
+            "failed": failed, "ballots_after_failure": ballots_after_failure, "stored_on_retry": stored,
+            "ballots": await repositories.votes.count(), "tallies": await repositories.votes.read_tallies(),
+        }
+        await close_database()
+        return result
+
+    print(json.dumps(asyncio.run(main())))
+    """, **engine_env("sqlite", tmp_path))
+    assert outcome == {
+        "failed": True, "ballots_after_failure": 0, "stored_on_retry": True,
+        "ballots": 1, "tallies": {"head_boy": {"Rohan": 1}},
+    }
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_replay_counts_a_ballot_left_uncounted(engine, tmp_path):
+    # Simulates a commit that stored the ballot but failed before counting it: only
+    # MongoDB can end up in that state; on SQLite there is nothing left to count.
+    outcome = run_app_script(tmp_path, SETUP + """
+    from core.config import DATABASE_ENGINE
+
+    async def main():
+        await reset()
+        vote = Vote(selections={"head_boy": "Rohan"}, student_identifier="Science-A-1", idempotency_key="k1")
+        if DATABASE_ENGINE == "mongo":
+            from database.connection import vote_collection
+            await vote_collection.insert_one({"_id": vote.student_identifier, **vote.dict(), "tally_pending": True})
+        else:
+            await commit_vote(vote)
+        replays = await asyncio.gather(*(commit_vote(vote) for _ in range(20)))
+        result = {
+            "replays_stored": any(replays), "ballots": await repositories.votes.count(),
+            "counted_once": await repositories.votes.read_tallies() == {"head_boy": {"Rohan": 1}},
+        }
+        await close_database()
+        return result
+
+    print(json.dumps(asyncio.run(main())))
+    """, **engine_env(engine, tmp_path))
+    assert outcome == {"replays_stored": False, "ballots": 1, "counted_once": True}
+
+
+@pytest.mark.parametrize("engine", VOTE_ENGINES)
+def test_concurrent_submits_store_one_ballot(engine, tmp_path):
+    # Hundreds of parallel submits for the same student: exactly one is stored and
+    # counted; every other one is rejected as a second vote.
+    outcome = run_app_script(tmp_path, SETUP + """
+    SUBMITS = 300
+
+    async def submit(n):
+        vote = Vote(selections={"head_boy": "Rohan", "head_girl": "Asha"}, student_identifier="Science-A-7", idempotency_key=f"k{n}")
+        try:
+            return "stored" if await commit_vote(vote) else "replay"
+        except HTTPException as e:
+            return e.status_code
+
+    async def main():
+        await reset()
+        outcomes = await asyncio.gather(*(submit(n) for n in range(SUBMITS)))
+        result = {
+            "stored": outcomes.count("stored"), "rejected": outcomes.count(403),
+            "ballots": await repositories.votes.count(), "tallies": await repositories.votes.read_tallies(),
+        }
+        await close_database()
+        return result
+
+    print(json.dumps(asyncio.run(main())))
+    """, **engine_env(engine, tmp_path))
+    assert outcome == {
+        "stored": 1, "rejected": 299, "ballots": 1,
+        "tallies": {"head_boy": {"Rohan": 1}, "head_girl": {"Asha": 1}},
+    }
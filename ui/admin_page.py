@@ -51,9 +51,6 @@ def render():
     ])
 
     # --- Render Each Tab Module ---
-    with tab1:
-        _1_results_stats_tab.render(password)
-
     with tab2:
         _2_election_settings_tab.render(settings, password)
 
@@ -65,4 +62,9 @@ def render():
         _4_student_roster_tab.render(settings, password)
 
     with tab5:
-        _5_audit_log_tab.render(password)
\ No newline at end of file
+        _5_audit_log_tab.render(password)
+
+    # The results tab is rendered last because its live mode keeps the script
+    # running while it listens for updates; every other tab is drawn by then.
+    with tab1:
+        _1_results_stats_tab.render(password)
\ No newline at end of file
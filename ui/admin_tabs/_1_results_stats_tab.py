@@ -2,12 +2,101 @@
 
 import streamlit as st
 import pandas as pd
-from ui.api import get_results, export_results_as_csv
+from ui.api import get_results, export_results, export_raw_ballots, stream_live_results
+import time
+
+# format -> (label, mime type)
+EXPORT_FORMATS = {
+    "csv": ("CSV", "text/csv"),
+    "xlsx": ("Excel (XLSX)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet"),
+}
+
+LIVE_WINDOW_SECONDS = 60
+
+
+def _apply_delta(data: dict, delta: dict):
+    """Adds a pushed vote delta to the locally held results and recomputes the winners."""
+    data["voter_turnout"]["total_votes_cast"] += delta.get("votes_cast", 0)
+    results_data = data.get("results", {})
+    for pos_id, increments in delta.get("tallies", {}).items():
+        if pos_id not in results_data:
+            continue
+        vote_counts = results_data[pos_id]["vote_counts"]
+        for name, count in increments.items():
+            vote_counts[name] = vote_counts.get(name, 0) + count
+        max_votes = max(vote_counts.values(), default=0)
+        if max_votes > 0:
+            tied_winners = [name for name, count in vote_counts.items() if count == max_votes]
+            results_data[pos_id]["winner"] = " & ".join(tied_winners) + (" (TIE!)" if len(tied_winners) > 1 else "")
+
+
+def _render_dashboard(data: dict):
+    # --- Live Voter Turnout ---
+    st.markdown("#### Voter Turnout")
+    turnout_data = data.get("voter_turnout", {})
+    total_students = turnout_data.get("total_students", 0)
+    votes_cast = turnout_data.get("total_votes_cast", 0)
+    
+    if total_students > 0:
+        turnout_percentage = (votes_cast / total_students)
+        st.progress(min(turnout_percentage, 1.0), text=f"{turnout_percentage:.1%} Voted")
+    else:
+        turnout_percentage = 0
+        st.progress(0, text="No students registered")
+        
+    stat_col1, stat_col2, stat_col3 = st.columns(3)
+    stat_col1.metric("Total Registered Students", f"{total_students} 🧑‍🎓")
+    stat_col2.metric("Total Votes Cast", f"{votes_cast} 🗳️")
+    stat_col3.metric("Turnout", f"{turnout_percentage:.1%}")
+    
+    # --- Per-Class Turnout ---
+    class_breakdown = data.get("class_breakdown")
+    if class_breakdown:
+        st.markdown("#### Turnout by Class")
+        class_df = pd.DataFrame(class_breakdown)[["stream", "division", "total_students", "votes_cast", "turnout"]]
+        class_df["division"] = class_df["division"].fillna("-")
+        class_df.rename(columns={
+            "stream": "Stream",
+            "division": "Division",
+            "total_students": "Students",
+            "votes_cast": "Votes Cast",
+            "turnout": "Turnout"
+        }, inplace=True)
+        st.dataframe(
+            class_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"Turnout": st.column_config.ProgressColumn("Turnout", min_value=0.0, max_value=1.0, format="%.2f")}
+        )
+
+    st.divider()
+
+    # --- Dynamic Results Display ---
+    st.markdown("#### Live Results")
+    results_data = data.get("results", {})
+    
+    if not results_data:
+        st.info("No positions have been configured for the election yet.")
+    else:
+        for pos_id, pos_data in results_data.items():
+            with st.container(border=True):
+                st.subheader(pos_data.get("position_title", "Unnamed Position"))
+                st.metric("Winner(s)", pos_data.get("winner", "N/A"))
+                
+                vote_counts = pos_data.get("vote_counts", {})
+                if vote_counts:
+                    df = pd.DataFrame.from_dict(vote_counts, orient='index', columns=['Votes'])
+                    st.bar_chart(df)
+                else:
+                    st.write("No votes cast for this position yet.")
+
 
 def render(password: str):
     """
     Renders the Live Results & Stats tab for the admin dashboard.
-    This version is corrected to avoid caching errors and uses the new API structure.
+    In live mode the dashboard subscribes to the server's results stream and
+    redraws as votes arrive, instead of re-requesting the full results.
     """
     st.subheader("Live Election Dashboard")
     
@@ -15,69 +104,89 @@ def render(password: str):
     if st.button("🔄 Refresh Dashboard"):
         st.rerun()
 
-    # Fetch data directly
-    results_response = get_results(password)
+    toggle_col1, toggle_col2 = st.columns(2)
+    live_mode = toggle_col2.toggle("Live updates", value=False, help="Pushes new votes to this screen as they are cast.")
+    show_breakdown = toggle_col1.toggle(
+        "Show turnout by class", value=False, disabled=live_mode,
+        help="Adds a per-stream/division turnout table. Not available with live updates."
+    )
 
-    if results_response: # API call was successful
-        data = results_response
-        
-        # --- Live Voter Turnout ---
-        st.markdown("#### Voter Turnout")
-        turnout_data = data.get("voter_turnout", {})
-        total_students = turnout_data.get("total_students", 0)
-        votes_cast = turnout_data.get("total_votes_cast", 0)
-        
-        if total_students > 0:
-            turnout_percentage = (votes_cast / total_students)
-            st.progress(turnout_percentage, text=f"{turnout_percentage:.1%} Voted")
-        else:
-            turnout_percentage = 0
-            st.progress(0, text="No students registered")
-            
-        stat_col1, stat_col2, stat_col3 = st.columns(3)
-        stat_col1.metric("Total Registered Students", f"{total_students} 🧑‍🎓")
-        stat_col2.metric("Total Votes Cast", f"{votes_cast} 🗳️")
-        stat_col3.metric("Turnout", f"{turnout_percentage:.1%}")
-        
-        st.divider()
+    if live_mode:
+        # The stream opens with a full snapshot, so there is nothing to fetch up front.
+        data = None
+    else:
+        data = get_results(password, breakdown=show_breakdown)
+        if not data:
+            # This message shows if the API connection itself failed
+            st.warning("Could not fetch results from the server. Refresh the dashboard or check the backend.")
+            return
 
-        # --- Dynamic Results Display ---
-        st.markdown("#### Live Results")
-        results_data = data.get("results", {})
-        
-        if not results_data:
-            st.info("No positions have been configured for the election yet.")
+    # The dashboard is drawn into a placeholder so live updates can redraw it
+    # after the export section below has been rendered.
+    dashboard = st.empty()
+    with dashboard.container():
+        if data:
+            _render_dashboard(data)
         else:
-            for pos_id, pos_data in results_data.items():
-                with st.container(border=True):
-                    st.subheader(pos_data.get("position_title", "Unnamed Position"))
-                    st.metric("Winner(s)", pos_data.get("winner", "N/A"))
-                    
-                    vote_counts = pos_data.get("vote_counts", {})
-                    if vote_counts:
-                        df = pd.DataFrame.from_dict(vote_counts, orient='index', columns=['Votes'])
-                        st.bar_chart(df)
-                    else:
-                        st.write("No votes cast for this position yet.")
-        
-        st.divider()
+            st.info("Connecting to the live results stream...")
 
-        # --- Export Results ---
-        st.markdown("#### Export Results")
-        st.write("Download the complete election results as a CSV file for official records.")
-        
-        if st.button("📥 Export Results to CSV"):
-            with st.spinner("Generating CSV file..."):
-                export_response = export_results_as_csv(password)
+    st.divider()
+
+    # --- Export Results ---
+    st.markdown("#### Export Results")
+    st.write("Download the complete election results for official records.")
+
+    export_col1, export_col2 = st.columns(2)
+    with export_col1:
+        file_format = st.selectbox("Export Format", list(EXPORT_FORMATS.keys()), format_func=lambda f: EXPORT_FORMATS[f][0])
+        if st.button("📥 Export Results"):
+            with st.spinner("Generating export file..."):
+                export_response = export_results(password, file_format)
                 if export_response and export_response.status_code == 200:
                     st.download_button(
-                        label="Click here to Download CSV",
+                        label=f"Click here to Download {EXPORT_FORMATS[file_format][0]}",
                         data=export_response.content,
-                        file_name="election_results.csv",
-                        mime="text/csv",
+                        file_name=f"election_results.{file_format}",
+                        mime=EXPORT_FORMATS[file_format][1],
                     )
                 else:
                     st.toast("❌ Failed to generate the export file.", icon="🔥")
-    else:
-        # This message shows if the API connection itself failed
-        st.warning("Could not fetch results from the server. Refresh the dashboard or check the backend.")
\ No newline at end of file
+    with export_col2:
+        st.write("Raw ballots (one row per student) for auditing.")
+        if st.button("🧾 Export Raw Ballots"):
+            with st.spinner("Exporting all ballots..."):
+                ballots_response = export_raw_ballots(password)
+                if ballots_response and ballots_response.status_code == 200:
+                    st.download_button(
+                        label="Click here to Download Raw Ballots CSV",
+                        data=ballots_response.content,
+                        file_name="raw_ballots.csv",
+                        mime="text/csv",
+                    )
+                else:
+                    st.toast("❌ Failed to export the ballots.", icon="🔥")
+
+    # --- Live Updates ---
+    # Listen for a bounded window, then rerun so the page reconnects with a fresh snapshot.
+    # Keep-alives arrive even when no one is voting, so the deadline is always reached.
+    if live_mode:
+        deadline = time.monotonic() + LIVE_WINDOW_SECONDS
+        connected = False
+        for event, payload in stream_live_results(password):
+            connected = True
+            if event == "snapshot":
+                data = payload
+            elif event == "delta" and data:
+                _apply_delta(data, payload)
+            elif event == "resync":
+                # Results were reset or rebuilt; reconnect for a new snapshot.
+                break
+            if data and event != "keep-alive":
+                with dashboard.container():
+                    _render_dashboard(data)
+            if time.monotonic() > deadline:
+                break
+        if connected:
+            st.rerun()
+        with dashboard.container():
+            st.warning("Could not connect to the live results stream. Turn off live updates to load the results.")
@@ -1,7 +1,7 @@
 # ui/admin_tabs/_2_election_settings_tab.py (Fully Updated and Corrected)
 
 import streamlit as st
-from ui.api import update_election_settings, reset_election, clear_candidate_list, clear_student_roster
+from ui.api import update_election_settings, reset_election, clear_candidate_list, clear_student_roster, rebuild_result_tallies
 from typing import Dict, Any
 
 def render(settings: Dict[str, Any], password: str):
@@ -115,6 +115,14 @@ def render(settings: Dict[str, Any], password: str):
                     st.toast("✅ Success! All votes have been cleared.")
                     st.rerun()
 
+        # Action 1b: Rebuild Result Counters
+        st.markdown("---")
+        st.write("**Rebuild Result Counters** (Recounts results from the stored ballots; voting must be closed)")
+        if st.button("Rebuild Result Counters"):
+            with st.spinner("Recounting all ballots..."):
+                if rebuild_result_tallies(password):
+                    st.toast("✅ Success! Result counters rebuilt from the stored ballots.")
+
         # Action 2: Clear Candidate List
         st.markdown("---")
         st.write("**Clear Candidate List** (Deletes ALL candidates)")
@@ -84,8 +84,9 @@ def render(settings: Dict[str, Any], password: str):
                             c_col1, c_col2, c_col3 = st.columns([0.2, 0.6, 0.2])
                             
                             with c_col1:
-                                if cand.get("photo_url"):
-                                    st.image(f"{st.session_state.api_url}{cand['photo_url']}", width=60)
+                                thumb = cand.get("thumbnail_url") or cand.get("photo_url")
+                                if thumb:
+                                    st.image(f"{st.session_state.api_url}{thumb}", width=60)
                                 else:
                                     st.image("assets/default_logo.png", width=60)
                             
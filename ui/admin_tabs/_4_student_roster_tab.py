@@ -3,8 +3,13 @@
 import streamlit as st
 import pandas as pd
 # FIXED: Removed the unnecessary import of get_stream_config
-from ui.api import get_all_students, bulk_upload_students
+from ui.api import get_students_page, search_students, start_bulk_upload_job, get_bulk_upload_job
 from typing import Dict, Any
+import time
+
+JOB_POLL_INTERVAL_SECONDS = 1
+ROSTER_PAGE_SIZE = 200
+SEARCH_RESULT_LIMIT = 50
 
 def render(settings: Dict[str, Any], password: str):
     """
@@ -46,15 +51,32 @@ def render(settings: Dict[str, Any], password: str):
         
         if uploaded_file is not None:
             if st.button("Upload and Process File"):
-                with st.spinner("Processing file... This may take a moment."):
-                    response = bulk_upload_students(uploaded_file, password)
-                    if response:
-                        data = response
-                        st.toast(f"✅ File processed! Added: {data['students_added']}, Duplicates skipped: {data['duplicates_found']}.")
-                        if data['errors']:
-                            st.warning("Some rows had errors:")
-                            st.json(data['errors'])
-                        st.rerun()
+                with st.spinner("Uploading file..."):
+                    job = start_bulk_upload_job(uploaded_file, password)
+                if job:
+                    # The server processes the file in the background; we only poll its progress.
+                    progress_bar = st.progress(0.0, text="Waiting for the server to start processing...")
+                    while job and job["status"] not in ("completed", "failed"):
+                        time.sleep(JOB_POLL_INTERVAL_SECONDS)
+                        job = get_bulk_upload_job(job["job_id"], password) or job
+                        if job["status"] == "ingesting" and job["rows_parsed"]:
+                            fraction = min(job["rows_processed"] / job["rows_parsed"], 1.0)
+                            progress_bar.progress(fraction, text=f"Imported {job['rows_processed']} of {job['rows_parsed']} rows...")
+                        elif job["status"] == "parsing":
+                            progress_bar.progress(0.0, text="Reading the file...")
+                    progress_bar.empty()
+
+                    if job["status"] == "completed":
+                        st.toast(f"✅ File processed! Added: {job['students_added']}, Duplicates skipped: {job['duplicates_found']}.")
+                        # Forget the loaded roster pages so the list below picks up the new students.
+                        st.session_state.pop("roster_filters", None)
+                    else:
+                        st.error("The file could not be processed.")
+                    if job['errors']:
+                        st.warning("Some rows had errors:")
+                        st.json(job['errors'])
+                else:
+                    st.error("Could not upload the file to the server.")
     
     st.divider()
 
@@ -68,19 +90,58 @@ def render(settings: Dict[str, Any], password: str):
 
     # --- Display Roster ---
     st.markdown("#### Full Student Roster")
-    search_term = st.text_input("Search Students by Name or Roll No:", placeholder="Type to filter...")
-    
-    with st.spinner("Loading student list..."):
-        students_list = get_all_students(password)
-        if students_list:
-            df = pd.DataFrame(students_list)
-            
-            if search_term:
-                df = df[
-                    df["name"].str.contains(search_term, case=False, na=False) |
-                    df["roll_number"].astype(str).str.contains(search_term, na=False)
-                ]
-            
-            st.dataframe(df, use_container_width=True, height=500)
+    filter_col1, filter_col2 = st.columns(2)
+    stream_options = ["All Streams"] + [s["stream_name"] for s in academic_structure]
+    selected_stream = filter_col1.selectbox("Filter by Stream", stream_options)
+    stream_filter = None if selected_stream == "All Streams" else selected_stream
+    division_options = ["All Divisions"] + next((s["divisions"] for s in academic_structure if s["stream_name"] == stream_filter), [])
+    selected_division = filter_col2.selectbox("Filter by Division", division_options, disabled=len(division_options) == 1)
+    division_filter = None if selected_division == "All Divisions" else selected_division
+    search_term = st.text_input("Search Students by Name or Roll No:", placeholder="Type a name or roll number...").strip()
+
+    # --- Server-Side Search ---
+    # Searching only asks the server for the best matches instead of scanning the loaded roster.
+    if search_term:
+        with st.spinner("Searching..."):
+            matches = search_students(password, search_term, limit=SEARCH_RESULT_LIMIT, stream=stream_filter, division=division_filter)
+        if matches is None:
+            st.error("Failed to search the student roster.")
+        elif matches:
+            st.dataframe(pd.DataFrame(matches), use_container_width=True, height=500)
+            st.caption(f"Showing the top {len(matches)} matches.")
         else:
-            st.info("No students have been added to the roster yet. Use the Bulk Upload feature above to add them.")
\ No newline at end of file
+            st.info("No students match your search.")
+        return
+
+    # The roster is loaded page by page; loaded rows are kept until the filters change.
+    roster_filters = (stream_filter, division_filter)
+    if st.session_state.get("roster_filters") != roster_filters:
+        st.session_state.roster_filters = roster_filters
+        st.session_state.roster_rows = []
+        st.session_state.roster_cursor = None
+        st.session_state.roster_loaded = False
+
+    def load_next_page():
+        page = get_students_page(password, limit=ROSTER_PAGE_SIZE, cursor=st.session_state.roster_cursor,
+                                 stream=stream_filter, division=division_filter)
+        if page is None:
+            st.error("Failed to load the student roster from the server.")
+            return
+        st.session_state.roster_rows += page["students"]
+        st.session_state.roster_cursor = page["next_cursor"]
+        st.session_state.roster_loaded = True
+
+    if not st.session_state.roster_loaded:
+        with st.spinner("Loading student list..."):
+            load_next_page()
+
+    students_list = st.session_state.roster_rows
+    if students_list:
+        st.dataframe(pd.DataFrame(students_list), use_container_width=True, height=500)
+        st.caption(f"Showing {len(students_list)} students loaded so far.")
+        if st.session_state.roster_cursor and st.button(f"Load {ROSTER_PAGE_SIZE} more"):
+            with st.spinner("Loading more students..."):
+                load_next_page()
+            st.rerun()
+    elif st.session_state.roster_loaded:
+        st.info("No students have been added to the roster yet. Use the Bulk Upload feature above to add them.")
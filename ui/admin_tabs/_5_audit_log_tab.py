@@ -1,50 +1,126 @@
 # ui/admin_tabs/_5_audit_log_tab.py (New File)
 
+import datetime
+import time
 import streamlit as st
 import pandas as pd
-from ui.api import get_audit_logs
+from ui.api import get_audit_logs_page
+
+PAGE_SIZE = 100
+# Refreshes only fetch entries written since the last one; with several MongoDB workers
+# an entry written in the same instant can slip past that, so the log is reloaded from
+# the top when it has not been for this long.
+FULL_RELOAD_SECONDS = 300
+
+def _reset_log_state(filters):
+    st.session_state.audit_logs = []
+    st.session_state.audit_filters = filters
+    st.session_state.audit_next_cursor = None
+    st.session_state.audit_latest_cursor = None
+    st.session_state.audit_loaded = False
+    st.session_state.audit_loaded_at = None
+
+def _load_first_page(password, filters):
+    """Loads the newest page of the log, replacing whatever is on screen."""
+    page = get_audit_logs_page(password, limit=PAGE_SIZE, **filters)
+    if page is None:
+        return False
+    st.session_state.audit_logs = page["logs"]
+    st.session_state.audit_next_cursor = page["next_cursor"]
+    st.session_state.audit_latest_cursor = page["latest_cursor"]
+    st.session_state.audit_loaded = True
+    st.session_state.audit_loaded_at = time.monotonic()
+    return True
+
+def _fetch_new_logs(password, filters):
+    """
+    Prepends entries logged since the newest one already on screen. Pages follow
+    the write order and are newest-first only within themselves, so the new
+    entries are sorted newest-first as a whole before they are prepended.
+    """
+    new_logs = []
+    fetched = True
+    while True:
+        page = get_audit_logs_page(password, limit=PAGE_SIZE, since=st.session_state.audit_latest_cursor, **filters)
+        if page is None:
+            fetched = False
+            break
+        new_logs.extend(page["logs"])
+        st.session_state.audit_latest_cursor = page["latest_cursor"]
+        if not page["has_more"]:
+            break
+    new_logs.sort(key=lambda log: log["timestamp"], reverse=True)
+    st.session_state.audit_logs = new_logs + st.session_state.audit_logs
+    return fetched
 
 def render(password: str):
     """
-    Renders the Audit Log tab, displaying all logged activities.
+    Renders the Audit Log tab. The first page is loaded once; after that each
+    refresh only fetches entries newer than the ones already shown.
     """
     st.subheader("System Activity Log")
-    st.info("This log shows the last 200 important actions taken by administrators and the system.")
+    st.info("Shows the most recent actions taken by administrators and the system. Use 'Load older' to page further back.")
+
+    col1, col2, col3 = st.columns(3)
+    actor = col1.text_input("Actor", placeholder="e.g. Admin").strip() or None
+    action = col2.text_input("Action", placeholder="e.g. Vote Cast").strip() or None
+    date_range = col3.date_input("Date range", value=(), help="Leave empty to include all dates.")
+
+    filters = {"actor": actor, "action": action, "start": None, "end": None}
+    if len(date_range) == 2:
+        filters["start"] = datetime.datetime.combine(date_range[0], datetime.time.min).isoformat()
+        filters["end"] = datetime.datetime.combine(date_range[1] + datetime.timedelta(days=1), datetime.time.min).isoformat()
+
+    loaded_at = st.session_state.get("audit_loaded_at")
+    if st.session_state.get("audit_filters") != filters or (loaded_at and time.monotonic() - loaded_at > FULL_RELOAD_SECONDS):
+        _reset_log_state(filters)
 
     if st.button("🔄 Refresh Logs"):
-        # We don't need to do anything here, Streamlit's rerun will re-fetch the data.
+        # Nothing to do here: the rerun below fetches only the new entries.
         pass
 
-    # Fetch the logs from the backend
     with st.spinner("Loading activity logs..."):
-        logs_data = get_audit_logs(password)
-
-        if logs_data is not None:
-            if not logs_data:
-                st.info("No activity has been logged yet.")
-            else:
-                # Convert the list of log dictionaries to a Pandas DataFrame for better display
-                df = pd.DataFrame(logs_data)
-                
-                # Convert timestamp string to a more readable format.
-                # This assumes the backend sends UTC timestamps.
-                df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Rename columns for a cleaner look
-                df.rename(columns={
-                    'timestamp': 'Timestamp (UTC)',
-                    'actor': 'Actor',
-                    'action': 'Action',
-                    'details': 'Details'
-                }, inplace=True)
-
-                # Display the DataFrame as a table
-                st.dataframe(
-                    df,
-                    use_container_width=True,
-                    hide_index=True,
-                    column_order=("Timestamp (UTC)", "Actor", "Action", "Details")
-                )
+        if not st.session_state.audit_loaded or not st.session_state.audit_latest_cursor:
+            # Without a cursor (nothing was logged at the last load) the first page is simply loaded again.
+            if not _load_first_page(password, filters):
+                st.error("Failed to load audit logs from the server.")
+                return
+        elif not _fetch_new_logs(password, filters):
+            st.error("Failed to fetch new activity from the server.")
+
+    logs_data = st.session_state.audit_logs
+    if not logs_data:
+        st.info("No activity has been logged yet.")
+        return
+
+    # Convert the list of log dictionaries to a Pandas DataFrame for better display
+    df = pd.DataFrame(logs_data)
+
+    # Convert timestamp string to a more readable format.
+    # This assumes the backend sends UTC timestamps.
+    df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+
+    # Rename columns for a cleaner look
+    df.rename(columns={
+        'timestamp': 'Timestamp (UTC)',
+        'actor': 'Actor',
+        'action': 'Action',
+        'details': 'Details'
+    }, inplace=True)
+
+    st.caption(f"Showing {len(df)} entries.")
+    st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        column_order=("Timestamp (UTC)", "Actor", "Action", "Details")
+    )
+
+    if st.session_state.audit_next_cursor and st.button("Load older"):
+        page = get_audit_logs_page(password, limit=PAGE_SIZE, before=st.session_state.audit_next_cursor, **filters)
+        if page is None:
+            st.error("Failed to load older entries.")
         else:
-            # This message shows if the API call itself failed
-            st.error("Failed to load audit logs from the server.")
\ No newline at end of file
+            st.session_state.audit_logs = st.session_state.audit_logs + page["logs"]
+            st.session_state.audit_next_cursor = page["next_cursor"]
+            st.rerun()
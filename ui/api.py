@@ -2,35 +2,104 @@
 
 import streamlit as st
 import requests
+import json
+import copy
+import logging
+import os
+import time
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
 
 # Ensure your live backend URL is correct
 API_URL = "https://tarique123.pythonanywhere.com"
 
-def handle_request(method, url, json_payload=None, **kwargs):
+# --- Connection Tuning ---
+# Timeouts are (connect, read) in seconds. Kiosk calls fail fast so a voter is
+# never left waiting; admin calls that move files or build reports get longer.
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3.05"))
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, float(os.getenv("API_READ_TIMEOUT", "10")))
+LONG_TIMEOUT = (CONNECT_TIMEOUT, float(os.getenv("API_LONG_READ_TIMEOUT", "120")))
+# Idempotent GETs are retried this many times with exponential backoff.
+# Other methods are never retried after the request has been sent.
+GET_RETRIES = int(os.getenv("API_GET_RETRIES", "3"))
+POOL_SIZE = int(os.getenv("API_POOL_SIZE", "20"))
+
+@st.cache_resource
+def get_session():
+    """
+    One keep-alive session shared by every Streamlit user of this process, so
+    repeated calls reuse pooled TCP/TLS connections instead of reconnecting.
+    """
+    retry = Retry(
+        total=GET_RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def handle_request(method, url, json_payload=None, timeout=DEFAULT_TIMEOUT, **kwargs):
     """
     A robust, centralized function to handle all API requests.
     FIXED: This version removes all Streamlit UI calls (like st.toast) to make it cache-safe.
     It now returns the response object on success and None on failure.
     The UI files are now responsible for showing error messages to the user.
+    Every call goes through the shared pooled session and its latency is logged.
     """
+    started = time.perf_counter()
+    status = "error"
     try:
-        response = requests.request(method, url, json=json_payload, timeout=30, **kwargs)
+        response = get_session().request(method, url, json=json_payload, timeout=timeout, **kwargs)
+        status = response.status_code
         response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
         return response
     except requests.exceptions.RequestException as e:
-        # We print the error here for the developer to see in the logs, but don't show it in the UI.
-        print(f"API Request Failed: {e}")
+        # We log the error here for the developer to see, but don't show it in the UI.
+        logger.warning("API Request Failed: %s", e)
         return None
+    finally:
+        logger.info("%s %s -> %s in %.1f ms", method.upper(), urlsplit(url).path, status,
+                    (time.perf_counter() - started) * 1000)
 
 # --- Public API Functions ---
 
+# Last body and ETag per URL. A 304 answer reuses the stored body, so an
+# unchanged response costs neither a download nor JSON parsing.
+_etag_cache = {}
+
+def get_with_etag(url, **kwargs):
+    cached = _etag_cache.get(url)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    response = handle_request("get", url, headers=headers, **kwargs)
+    if response is None:
+        return None
+    if response.status_code == 304 and cached:
+        data = cached[1]
+    else:
+        data = response.json()
+        if response.headers.get("ETag"):
+            _etag_cache[url] = (response.headers["ETag"], data)
+    # Callers may modify what they get back, so never hand out the cached object itself.
+    return copy.deepcopy(data)
+
 def get_election_settings():
-    response = handle_request("get", f"{API_URL}/api/settings")
-    return response.json() if response else None
+    return get_with_etag(f"{API_URL}/api/settings")
 
 def get_candidates():
-    response = handle_request("get", f"{API_URL}/api/candidates")
-    return response.json() if response else []
+    candidates = get_with_etag(f"{API_URL}/api/candidates")
+    return candidates if candidates is not None else []
+
+def get_ballot(inline_images=True):
+    """The whole voting screen (positions, candidates, thumbnails, status) in one request."""
+    return get_with_etag(f"{API_URL}/api/ballot?inline_images={'true' if inline_images else 'false'}")
 
 def identify_student(payload):
     response = handle_request("post", f"{API_URL}/api/student/identify", json_payload=payload)
@@ -41,6 +110,22 @@ def submit_vote(selections, student_identifier):
     response = handle_request("post", f"{API_URL}/api/vote", json_payload=payload)
     return response.json() if response else None
 
+def deliver_vote(session, selections, student_identifier, idempotency_key):
+    """
+    Used by the kiosk outbox flusher, which runs outside any Streamlit script and so
+    passes in the shared session. Returns the response whatever its status code,
+    or None if the backend could not be reached.
+    """
+    payload = {"selections": selections, "student_identifier": student_identifier, "idempotency_key": idempotency_key}
+    started = time.perf_counter()
+    try:
+        response = session.post(f"{API_URL}/api/vote", json=payload, timeout=DEFAULT_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        logger.warning("Outbox delivery failed: %s", e)
+        return None
+    logger.info("POST /api/vote (outbox) -> %s in %.1f ms", response.status_code, (time.perf_counter() - started) * 1000)
+    return response
+
 # --- Admin API Functions ---
 
 def update_election_settings(settings_data, password):
@@ -54,7 +139,8 @@ def add_candidate(candidate_data, password):
 def upload_candidate_photo(name, position_id, file, password):
     data = {"password": password}
     files = {"file": (file.name, file, file.type)}
-    return handle_request("post", f"{API_URL}/api/admin/candidate/photo?name={name}&position_id={position_id}", data=data, files=files)
+    return handle_request("post", f"{API_URL}/api/admin/candidate/photo?name={name}&position_id={position_id}", data=data, files=files,
+                          timeout=LONG_TIMEOUT)
 
 def delete_candidate(candidate_data, password):
     payload = {"candidate": candidate_data, "request": {"password": password}}
@@ -63,32 +149,109 @@ def delete_candidate(candidate_data, password):
 def bulk_upload_students(file, password):
     data = {"password": password}
     files = {"file": (file.name, file, file.type)}
-    response = handle_request("post", f"{API_URL}/api/admin/student/bulk-upload", data=data, files=files)
+    response = handle_request("post", f"{API_URL}/api/admin/student/bulk-upload", data=data, files=files, timeout=LONG_TIMEOUT)
+    return response.json() if response else None
+
+def start_bulk_upload_job(file, password):
+    data = {"password": password}
+    files = {"file": (file.name, file, file.type)}
+    response = handle_request("post", f"{API_URL}/api/admin/student/bulk-upload/jobs", data=data, files=files, timeout=LONG_TIMEOUT)
+    return response.json() if response else None
+
+def get_bulk_upload_job(job_id, password):
+    payload = {"password": password}
+    response = handle_request("post", f"{API_URL}/api/admin/student/bulk-upload/jobs/{job_id}", json_payload=payload)
     return response.json() if response else None
 
 def get_all_students(password):
     payload = {"password": password}
-    response = handle_request("post", f"{API_URL}/api/admin/students", json_payload=payload)
+    response = handle_request("post", f"{API_URL}/api/admin/students", json_payload=payload, timeout=LONG_TIMEOUT)
     return response.json() if response else []
 
-def get_results(password):
+def get_students_page(password, limit=200, cursor=None, stream=None, division=None):
+    payload = {"password": password}
+    params = {"limit": limit, "cursor": cursor, "stream": stream, "division": division}
+    response = handle_request("post", f"{API_URL}/api/admin/students/page", json_payload=payload,
+                              params={k: v for k, v in params.items() if v is not None})
+    return response.json() if response else None
+
+def search_students(password, term, limit=50, stream=None, division=None):
+    payload = {"password": password}
+    params = {"q": term, "limit": limit, "stream": stream, "division": division}
+    response = handle_request("post", f"{API_URL}/api/admin/students/search", json_payload=payload,
+                              params={k: v for k, v in params.items() if v is not None})
+    return response.json() if response else None
+
+def stream_students(password, stream=None, division=None):
+    """Yields students one by one from the NDJSON roster stream, without loading the whole body."""
+    payload = {"password": password}
+    params = {"stream": stream, "division": division}
+    response = handle_request("post", f"{API_URL}/api/admin/students/stream", json_payload=payload,
+                              params={k: v for k, v in params.items() if v is not None}, stream=True, timeout=LONG_TIMEOUT)
+    if not response:
+        return
+    with response:
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line)
+
+def get_results(password, breakdown=False):
     payload = {"password": password}
-    response = handle_request("post", f"{API_URL}/api/admin/results", json_payload=payload)
+    params = {"breakdown": "true"} if breakdown else None
+    response = handle_request("post", f"{API_URL}/api/admin/results", json_payload=payload, params=params)
     return response.json() if response else None
 
-def export_results_as_csv(password):
+def stream_live_results(password, read_timeout=30):
+    """
+    Subscribes to the live results stream and yields (event, data) pairs as
+    Server-Sent Events arrive, plus ("keep-alive", None) for each keep-alive the
+    server sends while nothing changes. Yields nothing if the connection fails.
+    """
+    payload = {"password": password}
+    try:
+        response = get_session().post(f"{API_URL}/api/admin/results/live", json=payload, stream=True,
+                                      timeout=(CONNECT_TIMEOUT, read_timeout))
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.warning("API Request Failed: %s", e)
+        return
+    with response:
+        event = None
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith(":"):
+                    yield "keep-alive", None
+                elif line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: ") and event:
+                    yield event, json.loads(line[len("data: "):])
+                    event = None
+        except requests.exceptions.RequestException as e:
+            logger.info("Live results stream ended: %s", e)
+
+def rebuild_result_tallies(password):
+    payload = {"password": password}
+    response = handle_request("post", f"{API_URL}/api/admin/results/rebuild-tallies", json_payload=payload, timeout=LONG_TIMEOUT)
+    return response.json() if response else None
+
+def export_results(password, file_format="csv"):
     payload = {"password": password}
     # For file downloads, we return the entire response object
-    return handle_request("post", f"{API_URL}/api/admin/results/export", json_payload=payload)
+    return handle_request("post", f"{API_URL}/api/admin/results/export", json_payload=payload, params={"format": file_format},
+                          timeout=LONG_TIMEOUT)
+
+def export_raw_ballots(password):
+    payload = {"password": password}
+    return handle_request("post", f"{API_URL}/api/admin/votes/export", json_payload=payload, timeout=LONG_TIMEOUT)
 
 def reset_election(password):
     payload = {"password": password}
-    response = handle_request("post", f"{API_URL}/api/admin/reset-election", json_payload=payload)
+    response = handle_request("post", f"{API_URL}/api/admin/reset-election", json_payload=payload, timeout=LONG_TIMEOUT)
     return response.json() if response else None
 
 def clear_student_roster(password):
     payload = {"password": password}
-    response = handle_request("post", f"{API_URL}/api/admin/clear-students", json_payload=payload)
+    response = handle_request("post", f"{API_URL}/api/admin/clear-students", json_payload=payload, timeout=LONG_TIMEOUT)
     return response.json() if response else None
 
 def clear_candidate_list(password):
@@ -100,3 +263,10 @@ def get_audit_logs(password):
     payload = {"password": password}
     response = handle_request("post", f"{API_URL}/api/admin/audit-logs", json_payload=payload)
     return response.json() if response else []
+
+def get_audit_logs_page(password, limit=100, before=None, since=None, actor=None, action=None, start=None, end=None):
+    payload = {"password": password}
+    params = {"limit": limit, "before": before, "since": since, "actor": actor, "action": action, "start": start, "end": end}
+    response = handle_request("post", f"{API_URL}/api/admin/audit-logs/page", json_payload=payload,
+                              params={k: v for k, v in params.items() if v is not None})
+    return response.json() if response else None
@@ -3,6 +3,7 @@
 import streamlit as st
 # FIXED: Removed all API imports except for identify_student, as settings are now passed in.
 from ui.api import identify_student
+from ui.outbox import get_outbox
 from PIL import Image
 
 def render(settings):
@@ -73,7 +74,11 @@ def render(settings):
                 else:
                     with st.spinner("Verifying your details..."):
                         response = identify_student(payload)
-                        if response:
+                        outbox = get_outbox()
+                        if response and outbox is not None and outbox.has_pending(response.get('student_identifier')):
+                            # The server has not seen this ballot yet, so it cannot refuse the login itself.
+                            st.warning("A vote for this student is already waiting to be sent from this kiosk.")
+                        elif response:
                             data = response
                             st.success(f"Welcome, {data.get('student_name', 'Student')}! Proceeding to vote...")
                             st.session_state.student_identifier = data.get('student_identifier')
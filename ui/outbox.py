@@ -0,0 +1,201 @@
+# ui/outbox.py (New File)
+#
+# Optional kiosk mode (KIOSK_OUTBOX=true): confirmed ballots are written to a
+# local SQLite outbox and the screen is freed for the next student at once.
+# A background thread delivers them to /api/vote, in order, retrying until the
+# backend answers. Each ballot carries an idempotency key, so a retry of a
+# ballot the server already stored is acknowledged rather than rejected.
+
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import streamlit as st
+from ui.api import deliver_vote, get_session
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_ENABLED = os.getenv("KIOSK_OUTBOX", "false").lower() == "true"
+OUTBOX_PATH = os.getenv("KIOSK_OUTBOX_PATH", "kiosk_outbox.sqlite3")
+# Delay between delivery attempts while the backend is failing, doubling up to the cap.
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 60.0
+# 4xx answers that are worth retrying; every other 4xx means the ballot will never be accepted.
+RETRYABLE_CLIENT_ERRORS = {408, 425, 429}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    student_identifier TEXT NOT NULL,
+    selections TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    delivered_at TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_status_id ON outbox (status, id);
+"""
+
+
+class VoteOutbox:
+    def __init__(self, path: str, session):
+        self.path = path
+        self.session = session
+        self._wake = threading.Event()
+        self.last_flush_at = None
+        self.last_flush_ok = None
+        self.last_error = None
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        self._thread = threading.Thread(target=self._run, name="kiosk-outbox-flusher", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per operation keeps this safe to use from any thread.
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def enqueue(self, selections: dict, student_identifier: str) -> str:
+        """Durably stores a confirmed ballot and returns its idempotency key."""
+        key = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO outbox (idempotency_key, student_identifier, selections, created_at) VALUES (?, ?, ?, ?)",
+                (key, student_identifier, json.dumps(selections), datetime.datetime.utcnow().isoformat()),
+            )
+        self._wake.set()
+        return key
+
+    def has_pending(self, student_identifier: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM outbox WHERE student_identifier = ? AND status = 'pending' LIMIT 1", (student_identifier,)
+            ).fetchone()
+        return row is not None
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        return {
+            "pending": counts.get("pending", 0),
+            "delivered": counts.get("delivered", 0),
+            "rejected": counts.get("rejected", 0),
+            "last_flush_at": self.last_flush_at,
+            "last_flush_ok": self.last_flush_ok,
+            "last_error": self.last_error,
+            "flusher_alive": self._thread.is_alive(),
+        }
+
+    def _next_pending(self):
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT id, idempotency_key, student_identifier, selections, attempts FROM outbox "
+                "WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+
+    def _finish(self, row_id: int, status: str, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = ?, delivered_at = ? WHERE id = ?",
+                (status, error, datetime.datetime.utcnow().isoformat() if status == "delivered" else None, row_id),
+            )
+
+    def _record_failure(self, row_id: int, error: str):
+        with self._connect() as conn:
+            conn.execute("UPDATE outbox SET attempts = attempts + 1, last_error = ? WHERE id = ?", (error, row_id))
+
+    def _run(self):
+        failures = 0
+        while True:
+            try:
+                retry_in = self._flush_next()
+                failures = 0
+            except Exception as e:
+                # A broken outbox file must not silently stop deliveries: report it and keep trying.
+                logger.exception("Kiosk outbox flusher failed")
+                self.last_flush_at = datetime.datetime.now()
+                self.last_flush_ok, self.last_error = False, f"Outbox error: {e}"
+                retry_in = min(RETRY_BASE_SECONDS * 2 ** failures, RETRY_MAX_SECONDS)
+                failures += 1
+            if retry_in:
+                time.sleep(retry_in)
+
+    def _flush_next(self):
+        """Delivers the oldest pending ballot. Returns how long to wait before the next attempt."""
+        row = self._next_pending()
+        if row is None:
+            self._wake.wait(5)
+            self._wake.clear()
+            return None
+
+        row_id, key, student_identifier, selections, attempts = row
+        try:
+            selections = json.loads(selections)
+        except ValueError as e:
+            # Unreadable rows can never be sent; set them aside so the queue keeps moving.
+            self._finish(row_id, "rejected", f"unreadable outbox row: {e}")
+            self.last_flush_at = datetime.datetime.now()
+            self.last_flush_ok, self.last_error = False, f"Unreadable queued ballot for {student_identifier}"
+            return None
+        response = deliver_vote(self.session, selections, student_identifier, key)
+        self.last_flush_at = datetime.datetime.now()
+
+        if response is not None and response.ok:
+            self._finish(row_id, "delivered")
+            self.last_flush_ok, self.last_error = True, None
+            return None
+
+        if response is not None and 400 <= response.status_code < 500 and response.status_code not in RETRYABLE_CLIENT_ERRORS:
+            # The backend will never accept this ballot (e.g. a different ballot is already
+            # recorded for the student). Keep it for the operator and move on.
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            self._finish(row_id, "rejected", f"{response.status_code}: {detail}")
+            self.last_flush_ok, self.last_error = False, f"Rejected ballot for {student_identifier}: {detail}"
+            return None
+
+        # Backend unreachable or failing: retry the same ballot so delivery stays in order.
+        error = "backend unreachable" if response is None else f"HTTP {response.status_code}"
+        self._record_failure(row_id, error)
+        self.last_flush_ok, self.last_error = False, error
+        return min(RETRY_BASE_SECONDS * 2 ** attempts, RETRY_MAX_SECONDS)
+
+
+@st.cache_resource
+def get_outbox():
+    """The process-wide outbox; its flusher thread starts on first use. None when kiosk mode is off."""
+    if not OUTBOX_ENABLED:
+        return None
+    return VoteOutbox(OUTBOX_PATH, get_session())
+
+
+def render_outbox_status():
+    """Sidebar panel with the kiosk queue depth and the outcome of the last delivery."""
+    outbox = get_outbox()
+    if outbox is None:
+        return
+    stats = outbox.stats()
+    with st.sidebar:
+        st.subheader("Kiosk Outbox")
+        st.metric("Ballots waiting to send", stats["pending"])
+        if not stats["flusher_alive"]:
+            st.error("The background sender has stopped; queued ballots are not being sent. Please restart the kiosk.")
+        if stats["last_flush_at"] is None:
+            st.caption("No deliveries yet.")
+        elif stats["last_flush_ok"]:
+            st.caption(f"✅ Last delivery at {stats['last_flush_at']:%H:%M:%S}")
+        else:
+            st.caption(f"⚠️ Last attempt at {stats['last_flush_at']:%H:%M:%S} failed: {stats['last_error']}")
+        if stats["rejected"]:
+            st.error(f"{stats['rejected']} ballot(s) were rejected by the server. Please inform the administrator.")
@@ -1,7 +1,8 @@
 # ui/student_page.py (Fully Updated and Corrected for Final API Structure)
 
 import streamlit as st
-from ui.api import get_candidates, submit_vote
+from ui.api import get_ballot, submit_vote
+from ui.outbox import get_outbox
 import time
 
 def render(settings):
@@ -35,19 +36,23 @@ def render(settings):
     # --- Main Page Content ---
     st.title("Step 2: Cast Your Vote")
 
-    if settings.get("voting_status") == "CLOSED":
+    # One request returns the positions, their candidates with inlined thumbnails,
+    # and the current voting status; unchanged ballots come back as a 304.
+    ballot = get_ballot()
+    if ballot is None:
+        st.error("Could not load the ballot. Please try again.")
+        return
+
+    if ballot.get("voting_status") == "CLOSED":
         st.warning("The voting session is currently closed by the administrator.")
         return
 
     st.success("The voting session is OPEN! Please make your selections below.")
-    
-    # Fetch all candidates
-    all_candidates = get_candidates()
-    if not all_candidates:
+
+    positions = ballot.get("positions", [])
+    if not any(pos["candidates"] for pos in positions):
         st.error("No candidates have been registered for this election yet.")
         return
-        
-    positions = settings.get("positions", [])
     
     with st.form("vote_form"):
         selections = {} # This dictionary will hold the vote: {'position_id': 'candidate_name'}
@@ -59,15 +64,18 @@ def render(settings):
             
             st.subheader(pos_title)
             
-            # Filter candidates for the current position
-            candidates_for_pos = [c for c in all_candidates if c.get("position_id") == pos_id]
+            candidates_for_pos = pos["candidates"]
             
             if not candidates_for_pos:
                 st.warning(f"No candidates are running for the position of {pos_title}.")
                 continue
 
             candidate_names = ["-- Select a Candidate --"] + [c["name"] for c in candidates_for_pos]
-            candidate_photos = {c["name"]: c.get("photo_url") for c in candidates_for_pos}
+            # Inlined thumbnails need no extra request; otherwise fall back to the URL.
+            candidate_photos = {
+                c["name"]: c.get("thumbnail_data_uri") or (f"{st.session_state.api_url}{c['thumbnail_url']}" if c.get("thumbnail_url") else None)
+                for c in candidates_for_pos
+            }
             
             selected_candidate = st.radio(
                 f"Select your candidate for {pos_title}",
@@ -79,7 +87,7 @@ def render(settings):
             if selected_candidate and selected_candidate != "-- Select a Candidate --":
                 photo_url = candidate_photos.get(selected_candidate)
                 if photo_url:
-                    st.image(f"{st.session_state.api_url}{photo_url}", width=100, caption=selected_candidate)
+                    st.image(photo_url, width=100, caption=selected_candidate)
 
             selections[pos_id] = selected_candidate
         
@@ -94,7 +102,18 @@ def render(settings):
                     st.warning(f"You must select a candidate for {pos_title}.")
                     all_selections_valid = False
             
-            if all_selections_valid:
+            outbox = get_outbox()
+            if all_selections_valid and outbox is not None:
+                # Kiosk mode: store the ballot locally and free the screen right away;
+                # the outbox delivers it to the server in the background.
+                outbox.enqueue(selections, student_identifier)
+                st.balloons()
+                st.success("✅ Your vote has been recorded on this kiosk and will be sent to the server.")
+                st.info("This screen will reset for the next student in 2 seconds.")
+                time.sleep(2)
+                st.session_state.page = "login"
+                st.rerun()
+            elif all_selections_valid:
                 with st.spinner("Submitting your vote..."):
                     
                     # --- THIS IS THE FIXED LOGIC ---